@@ -0,0 +1,188 @@
+"""Almacén columnar y tipado (Parquet) de los datasets limpios.
+
+El ETL escribe cada tabla limpia como ``<nombre>_limpio.parquet`` junto al
+CSV, con ``Provincia``/``Partido``/``Localidad``/``Tecnologia`` como
+categóricas, las columnas de período como enteros chicos y estadísticas por
+grupo de filas. ``leer`` permite proyectar columnas y filtrar por predicado
+sin cargar la tabla entera; si el Parquet no existe recurre al CSV. Las
+categóricas usan el diccionario compartido de ``vocabulario`` cuando el ETL
+ya llevó las columnas a él (también al recurrir al CSV).
+
+El modo incremental (ver ``incremental``) deja ``<nombre>_limpio.parquet``
+como una carpeta con un Parquet por trimestre (``2024-T2.parquet``): al
+incorporar un trimestre solo se escribe su archivo, sin reescribir la
+historia. ``leer`` la abre como un dataset de pyarrow, con los trimestres en
+orden y los esquemas unificados; ``estado`` da su versión en disco.
+"""
+import operator
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import vocabulario
+
+COLUMNAS_CATEGORICAS = set(vocabulario.DIMENSIONES)
+COLUMNAS_PERIODO = {
+    "Año": "int16", "año": "int16", "anio": "int16",
+    "Trimestre": "int8", "trimestre": "int8",
+}
+FILAS_POR_GRUPO = 64_000
+OPERADORES = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+    "in": lambda serie, valores: serie.isin(valores),
+}
+
+
+def ruta_parquet(archivo_csv, carpeta="."):
+    return Path(carpeta) / Path(archivo_csv).with_suffix(".parquet").name
+
+
+def orden_particion(nombre):
+    """Clave de orden de una partición ``"<Año>-T<Trimestre>"`` (las que no lo son, al final)."""
+    anio, _, trimestre = nombre.partition("-T")
+    try:
+        return (0, float(anio), float(trimestre))
+    except ValueError:
+        return (1, nombre)
+
+
+def particiones(ruta):
+    """Archivos de un Parquet particionado (una carpeta), en orden de trimestre."""
+    return sorted(Path(ruta).glob("*.parquet"), key=lambda parte: orden_particion(parte.stem))
+
+
+def estado(ruta):
+    """``(mtime en ns, tamaño)`` de un archivo; de una carpeta de particiones, el último cambio y la suma de sus partes."""
+    ruta = Path(ruta)
+    if not ruta.is_dir():
+        datos = ruta.stat()
+        return datos.st_mtime_ns, datos.st_size
+    # La carpeta cambia al agregar o borrar partes; una parte reescrita cambia su propio mtime
+    estados = [ruta.stat()] + [parte.stat() for parte in ruta.iterdir()]
+    return max(e.st_mtime_ns for e in estados), sum(e.st_size for e in estados[1:])
+
+
+def dataset(ruta):
+    """Dataset de pyarrow de un Parquet, sea un archivo o una carpeta de particiones."""
+    ruta = Path(ruta)
+    if not ruta.is_dir():
+        return ds.dataset(ruta, format="parquet")
+    partes = particiones(ruta)
+    # Una columna toda nula en un trimestre queda con tipo null: se unifica como hacía la concatenación
+    esquema = pa.unify_schemas([pq.read_schema(parte) for parte in partes], promote_options="permissive")
+    return ds.dataset(partes, schema=esquema, format="parquet")
+
+
+def _reemplazar(ruta):
+    """Borra una versión particionada de ``ruta`` antes de escribirla como un solo archivo."""
+    if Path(ruta).is_dir():
+        shutil.rmtree(ruta)
+
+
+def tipar(df):
+    """Convierte nombres a categóricas y los períodos a enteros compactos."""
+    df = df.copy()
+    for columna in df.columns:
+        if columna in COLUMNAS_CATEGORICAS:
+            df[columna] = df[columna].astype("category")
+        elif columna in COLUMNAS_PERIODO:
+            valores = pd.to_numeric(df[columna], errors="coerce")
+            tipo = COLUMNAS_PERIODO[columna]
+            # Si hay nulos se usa el entero anulable equivalente (Int16, Int8)
+            df[columna] = valores.astype(tipo if valores.notna().all() else tipo.capitalize())
+        elif df[columna].dtype == object:
+            # Columnas con tipos mezclados (p. ej. 'link Indec' con 'Desconocido')
+            serie = df[columna]
+            df[columna] = serie.where(serie.isna(), serie.astype(str))
+    return df
+
+
+def escribir(df, ruta, estadisticas=True, filas_por_grupo=FILAS_POR_GRUPO):
+    """Escribe ``df`` tipado como Parquet y devuelve la ruta."""
+    tabla = pa.Table.from_pandas(tipar(df), preserve_index=False)
+    _reemplazar(ruta)
+    pq.write_table(
+        tabla, ruta,
+        row_group_size=filas_por_grupo,
+        write_statistics=estadisticas,
+        compression="zstd",
+    )
+    return Path(ruta)
+
+
+class Escritor:
+    """Escribe un Parquet de a trozos, tipado como ``escribir``.
+
+    El esquema es el del primer trozo; los siguientes se convierten a él.
+    """
+
+    def __init__(self, ruta, estadisticas=True, filas_por_grupo=FILAS_POR_GRUPO):
+        self.ruta = Path(ruta)
+        self.estadisticas = estadisticas
+        self.filas_por_grupo = filas_por_grupo
+        self._escritor = None
+
+    def escribir(self, df):
+        if self._escritor is None:
+            tabla = pa.Table.from_pandas(tipar(df), preserve_index=False)
+            _reemplazar(self.ruta)
+            self._escritor = pq.ParquetWriter(
+                self.ruta, tabla.schema, write_statistics=self.estadisticas, compression="zstd",
+            )
+        else:
+            tabla = pa.Table.from_pandas(tipar(df), schema=self._escritor.schema, preserve_index=False)
+        self._escritor.write_table(tabla, row_group_size=self.filas_por_grupo)
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+        return self.ruta
+
+
+def _filtrar(df, filtros):
+    for columna, operador, valor in filtros:
+        if operador not in OPERADORES:
+            raise ValueError(f"Operador no soportado: {operador!r}")
+        df = df[OPERADORES[operador](df[columna], valor)]
+    return df.reset_index(drop=True)
+
+
+def columnas(archivo, carpeta="."):
+    """Nombres de las columnas de un dataset limpio, sin leer sus filas."""
+    ruta = ruta_parquet(archivo, carpeta)
+    if ruta.is_dir():
+        return dataset(ruta).schema.names
+    if ruta.exists():
+        return pq.read_schema(ruta).names
+    return pd.read_csv(Path(carpeta) / archivo, nrows=0).columns.tolist()
+
+
+def leer(archivo, columnas=None, filtros=None, carpeta="."):
+    """Lee un dataset limpio con proyección de columnas y filtros.
+
+    ``archivo`` es el nombre del CSV limpio (``"Penetracion_hogares_limpio.csv"``).
+    ``filtros`` usa la forma de pyarrow: ``[("Año", "==", 2024), ...]``; en
+    Parquet se aplican al leer y descartan grupos de filas por estadísticas.
+    """
+    ruta = ruta_parquet(archivo, carpeta)
+    if ruta.is_dir():
+        filtro = pq.filters_to_expression(filtros) if filtros else None
+        return dataset(ruta).to_table(columns=columnas, filter=filtro).to_pandas()
+    if ruta.exists():
+        return pd.read_parquet(ruta, columns=columnas, filters=filtros or None)
+
+    usecols = None
+    if columnas is not None:
+        usecols = list(dict.fromkeys(list(columnas) + [c for c, _, _ in filtros or []]))
+    df = pd.read_csv(Path(carpeta) / archivo, usecols=usecols)
+    if (Path(carpeta) / vocabulario.ARCHIVO).exists():
+        df = vocabulario.Vocabulario.cargar(carpeta).aplicar(df)
+    if filtros:
+        df = _filtrar(df, filtros)
+    return df[columnas] if columnas is not None else df
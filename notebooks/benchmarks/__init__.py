@@ -0,0 +1,6 @@
+"""Benchmarks del ETL y del dashboard.
+
+Se ejecutan desde la carpeta ``notebooks/``, por ejemplo::
+
+    python -m benchmarks.bench_etl
+"""
@@ -0,0 +1,72 @@
+"""Tamaño en disco y tiempo de carga: CSV limpios frente al almacén Parquet.
+
+Para cada dataset se mide la carga completa (``pd.read_csv`` frente a
+``pd.read_parquet``) y, para los datasets por provincia y trimestre, una
+lectura proyectada y filtrada a un trimestre con ``almacen.leer``.
+
+    python -m benchmarks.bench_almacen --escala 10
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import almacen
+import etl
+from benchmarks.sintetico import generar_hojas
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    hojas = generar_hojas(args.escala)
+    print(f"{'dataset':<42}{'CSV KB':>9}{'PQ KB':>8}{'CSV ms':>9}{'PQ ms':>8}{'CSV filtro':>12}{'PQ filtro':>11}")
+    totales = [0.0] * 6
+    with tempfile.TemporaryDirectory() as tmp:
+        carpeta_csv, carpeta_parquet = Path(tmp) / "csv", Path(tmp) / "parquet"
+        carpeta_csv.mkdir()
+        carpeta_parquet.mkdir()
+        for hoja in etl.HOJAS:
+            df = hoja.limpiar(hojas[hoja.nombre].copy())
+            csv = carpeta_csv / hoja.archivo
+            df.to_csv(csv, index=False)
+            parquet = almacen.escribir(df, almacen.ruta_parquet(hoja.archivo, carpeta_parquet))
+
+            fila = [
+                csv.stat().st_size / 1024,
+                parquet.stat().st_size / 1024,
+                medir(lambda: pd.read_csv(csv), args.repeticiones),
+                medir(lambda: pd.read_parquet(parquet), args.repeticiones),
+            ]
+            if {"Año", "Trimestre", "Provincia"}.issubset(df.columns):
+                columnas = ["Provincia", df.columns[-1]]
+                filtros = [("Año", "==", 2024), ("Trimestre", "==", 2)]
+                # Sin Parquet, almacen.leer recurre al CSV y filtra en memoria
+                en_csv = lambda: almacen.leer(hoja.archivo, columnas, filtros, carpeta=carpeta_csv)
+                en_parquet = lambda: almacen.leer(hoja.archivo, columnas, filtros, carpeta=carpeta_parquet)
+                fila += [medir(en_csv, args.repeticiones), medir(en_parquet, args.repeticiones)]
+            else:
+                fila += [0.0, 0.0]
+            totales = [t + v for t, v in zip(totales, fila)]
+            filtro = f"{fila[4]:>12.1f}{fila[5]:>11.1f}" if fila[4] else f"{'-':>12}{'-':>11}"
+            print(f"{Path(hoja.archivo).stem:<42}{fila[0]:>9.0f}{fila[1]:>8.0f}{fila[2]:>9.1f}{fila[3]:>8.1f}{filtro}")
+    print(f"{'TOTAL':<42}{totales[0]:>9.0f}{totales[1]:>8.0f}{totales[2]:>9.1f}{totales[3]:>8.1f}"
+          f"{totales[4]:>12.1f}{totales[5]:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Arranque del dashboard: primera pantalla de un proceso nuevo y primera apertura de cada sección.
+
+Cada medición corre en un proceso nuevo (como un worker recién levantado) con
+los datasets limpios del libro sintético en la carpeta actual. El proceso
+importa Streamlit (lo que ya hizo el servidor), ejecuta ``dashboard.py`` en
+modo *bare* (sin servidor: los widgets devuelven su valor por defecto, así
+que se muestra ``Inicio``) y después abre una sección con
+``secciones.mostrar``. Informa la mediana de ``--repeticiones`` procesos:
+
+- ``inicio_ms``: ejecución completa del script hasta la primera pantalla.
+- ``seccion_ms``: primera apertura de la sección (importaciones, carga de
+  datos y figuras), con el proceso ya en ``Inicio``.
+- ``importaciones_ms``: lo que cuesta importar los módulos que el dashboard
+  importaba antes al principio del script (pandas, Plotly y las capas de
+  datos y figuras), que hoy se difiere hasta abrir una sección con datos.
+
+Verifica que ``Inicio`` no importe pandas, NumPy, Plotly Express ni PyArrow
+y que quede dentro de ``--presupuesto-ms``.
+
+    python -m benchmarks.bench_arranque --escala 1 --presupuesto-ms 100
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Sin importar otros benchmarks: los procesos hijos no deben cargar pandas antes de medir
+NOTEBOOKS = Path(__file__).resolve().parents[1]
+DASHBOARD = NOTEBOOKS / "dashboard.py"
+PESADOS = ["pandas", "numpy", "plotly.express", "pyarrow"]
+# Lo que importaba dashboard.py en su primera línea antes de separar las secciones
+IMPORTACIONES = ["plotly.express", "plotly.graph_objects", "cubo", "cuantiles", "datos", "figuras", "kpis",
+                 "pronostico", "tensor", "traza"]
+
+
+def hijo(seccion):
+    """Corre en el proceso nuevo: mide y escribe un JSON en la salida estándar."""
+    import streamlit  # noqa: F401  (el servidor ya lo importó antes de la primera sesión)
+
+    # Modo bare: Streamlit avisa en cada llamada que no hay sesión
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    medicion = {}
+    if seccion == "importaciones":
+        inicio = time.perf_counter()
+        for modulo in IMPORTACIONES:
+            importlib.import_module(modulo)
+        medicion["importaciones_ms"] = (time.perf_counter() - inicio) * 1000
+    else:
+        inicio = time.perf_counter()
+        runpy.run_path(str(DASHBOARD), run_name="__main__")
+        medicion["inicio_ms"] = (time.perf_counter() - inicio) * 1000
+        medicion["pesados"] = [modulo for modulo in PESADOS if modulo in sys.modules]
+        if seccion != "Inicio":
+            import secciones
+
+            inicio = time.perf_counter()
+            secciones.mostrar(seccion)
+            medicion["seccion_ms"] = (time.perf_counter() - inicio) * 1000
+    print(json.dumps(medicion))
+
+
+def medir(seccion, carpeta, repeticiones):
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(NOTEBOOKS),
+                                                                        os.environ.get("PYTHONPATH")])))
+    mediciones = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_arranque", "--hijo", seccion],
+            cwd=carpeta, env=entorno, capture_output=True, text=True, check=True,
+        )
+        mediciones.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+    resultado = {clave: statistics.median(m[clave] for m in mediciones)
+                 for clave in mediciones[0] if clave.endswith("_ms")}
+    if "pesados" in mediciones[0]:
+        resultado["pesados"] = sorted({p for m in mediciones for p in m["pesados"]})
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto-ms", type=float, default=100.0,
+                        help="tiempo máximo de la primera pantalla (Inicio) en un proceso nuevo")
+    parser.add_argument("--hijo", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.hijo:
+        return hijo(args.hijo)
+
+    import secciones
+    from benchmarks.bench_dashboard import escribir_limpios
+
+    with tempfile.TemporaryDirectory() as tmp:
+        escribir_limpios(tmp, args.escala)
+        importaciones = medir("importaciones", tmp, args.repeticiones)["importaciones_ms"]
+        print(f"Importaciones que el dashboard hacía antes de la primera pantalla: {importaciones:.0f} ms")
+        print(f"{'sección':<36}{'inicio ms':>11}{'sección ms':>12}  importados en Inicio")
+        for seccion in secciones.MODULOS:
+            resultado = medir(seccion, tmp, args.repeticiones)
+            print(f"{seccion:<36}{resultado['inicio_ms']:>11.1f}{resultado.get('seccion_ms', 0):>12.1f}  "
+                  f"{', '.join(resultado['pesados']) or '-'}")
+            assert not resultado["pesados"], f"Inicio importó {resultado['pesados']}"
+            assert resultado["inicio_ms"] <= args.presupuesto_ms, (
+                f"Inicio tardó {resultado['inicio_ms']:.1f} ms (presupuesto {args.presupuesto_ms:.0f} ms)")
+    print(f"Inicio sin pandas ni Plotly y dentro del presupuesto de {args.presupuesto_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
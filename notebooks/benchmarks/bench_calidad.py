@@ -0,0 +1,127 @@
+"""Costo de las reglas de calidad frente a la limpieza, y detección de violaciones.
+
+Para cada escala limpia todas las hojas del libro sintético en memoria y las
+escribe a CSV (el ETL sin la lectura del libro, que es lo que más tarda) y
+mide aparte la evaluación de todas las reglas de ``etl.HOJAS`` con
+``calidad``. Verifica que:
+
+- el libro sintético no viole ninguna regla;
+- cada tipo de regla detecte exactamente las filas alteradas a propósito
+  (un total que no cierra, un valor negativo, un período repetido y una
+  provincia inexistente);
+- el ETL se corte con ``ErrorCalidad`` sin escribir la hoja alterada.
+
+    python -m benchmarks.bench_calidad --escalas 1 10 100
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import calidad
+import etl
+from benchmarks.sintetico import escribir_libro, generar_hojas
+
+
+def limpiar_y_escribir(crudas, destino):
+    limpias = {}
+    for hoja in etl.HOJAS:
+        limpias[hoja.nombre] = df = hoja.limpiar(crudas[hoja.nombre].copy())
+        df.to_csv(Path(destino) / hoja.archivo, index=False)
+    return limpias
+
+
+def evaluar_todas(limpias):
+    return calidad.evaluar_hojas((hoja, limpias[hoja.nombre]) for hoja in etl.HOJAS)
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def alterar(limpias):
+    """Copias de algunas hojas limpias con violaciones conocidas: ``{hoja: (df, regla, filas)}``."""
+    por_nombre = {hoja.nombre: hoja for hoja in etl.HOJAS}
+    casos = {}
+
+    df = limpias["Accesos Por Tecnología"].copy()
+    df.loc[df.index[:3], "Total"] += 5
+    casos["Accesos Por Tecnología"] = (df, calidad.Suma("Total", tuple(etl.COLUMNAS_TECNOLOGIA)), 3)
+
+    df = limpias["Dial-BAf"].copy()
+    df.loc[df.index[:2], "Dial up"] = -1
+    df.loc[df.index[:2], "Total"] = df.loc[df.index[:2], "Banda ancha fija"] - 1
+    casos["Dial-BAf"] = (df, calidad.Rango(("Banda ancha fija", "Dial up", "Total"), 0), 2)
+
+    df = limpias["Penetración-poblacion"].copy()
+    repetida = df.iloc[[0]].assign(**{"Accesos por cada 100 hab": 1.0})
+    df = pd.concat([df, repetida], ignore_index=True)
+    casos["Penetración-poblacion"] = (df, etl.POR_PROVINCIA, 2)
+
+    df = limpias["Acc_vel_loc_sinrangos"].copy()
+    df.loc[df.index[-4:], "Provincia"] = "Atlántida"
+    casos["Acc_vel_loc_sinrangos"] = (df, etl.PROVINCIA, 4)
+    return {por_nombre[nombre]: caso for nombre, caso in casos.items()}
+
+
+def verificar_deteccion(limpias):
+    for hoja, (df, regla, filas) in alterar(limpias).items():
+        reporte = calidad.evaluar(hoja, df)
+        assert reporte["regla"].tolist() == [str(regla)], f"{hoja.nombre}: {reporte['regla'].tolist()}"
+        assert reporte["filas"].tolist() == [filas], f"{hoja.nombre}: {reporte['filas'].tolist()} != {filas}"
+        try:
+            calidad.revisar(hoja, df)
+        except calidad.ErrorCalidad as error:
+            assert len(error.reporte) == 1
+        else:
+            raise AssertionError(f"{hoja.nombre}: la violación no frenó la revisión")
+
+
+def verificar_corte(tmp):
+    """El ETL sobre un libro con un total que no cierra se corta antes de escribir esa hoja."""
+    hojas = generar_hojas(1)
+    hojas["Totales Accesos Por Tecnología"].loc[0, "Total"] += 1_000
+    libro = escribir_libro(hojas, tmp / "alterado.xlsx")
+    destino = tmp / "alterado"
+    try:
+        etl.ejecutar(libro, destino, procesos=1)
+    except calidad.ErrorCalidad as error:
+        assert error.reporte["hoja"].tolist() == ["Totales Accesos Por Tecnología"]
+    else:
+        raise AssertionError("El ETL no se cortó con un total que no cierra")
+    assert not (destino / "Totales_Accesos_Por_Tecnologia_limpio.csv").exists()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'escala':<8}{'filas':>10}{'reglas':>8}{'limpieza+CSV s':>16}{'calidad s':>11}{'proporción':>12}")
+    for escala in args.escalas:
+        crudas = generar_hojas(escala)
+        with tempfile.TemporaryDirectory() as tmp:
+            t_etl, limpias = medir(lambda: limpiar_y_escribir(crudas, tmp), 1)
+        t_calidad, reporte = medir(lambda: evaluar_todas(limpias), args.repeticiones)
+        assert reporte.empty, f"El libro sintético viola reglas:\n{reporte.to_string(index=False)}"
+        filas = sum(len(df) for df in limpias.values())
+        reglas = sum(len(hoja.reglas) for hoja in etl.HOJAS)
+        print(f"{str(escala) + 'x':<8}{filas:>10}{reglas:>8}{t_etl:>16.2f}{t_calidad:>11.3f}"
+              f"{t_calidad / t_etl:>11.1%}")
+        if escala == args.escalas[0]:
+            verificar_deteccion(limpias)
+    with tempfile.TemporaryDirectory() as tmp:
+        verificar_corte(Path(tmp))
+    print("Violaciones detectadas por tipo de regla y ETL cortado antes de escribir la hoja alterada")
+
+
+if __name__ == "__main__":
+    main()
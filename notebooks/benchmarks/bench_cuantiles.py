@@ -0,0 +1,111 @@
+"""Percentiles de ``Velocidad``: bocetos de cuantiles frente a ordenar las filas.
+
+Sobre ``Velocidad_sin_Rangos`` del libro sintético compara, para la mediana y
+el percentil 99 por provincia × trimestre, por provincia y nacional, el
+``quantile`` exacto de pandas (que ordena las filas de cada grupo) con los
+bocetos de ``cuantiles``, y verifica que:
+
+- el error relativo de cada percentil no supere ``alfa`` (el del boceto);
+- combinar bocetos armados por trozos de la hoja o por trimestre dé los
+  mismos conteos que armarlos sobre la hoja entera;
+- el filtro de anómalos con el umbral de los bocetos descarte a lo sumo lo
+  mismo que el percentil 99 exacto de cada provincia, más las filas que
+  comparten balde con él.
+
+    python -m benchmarks.bench_cuantiles --escala 10
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import cuantiles
+from benchmarks.sintetico import generar_hojas
+
+QS = [0.5, 0.99]
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+
+def exactos(df, por):
+    """Percentiles de ``QS`` con ``quantile`` de pandas, en el formato de ``Bocetos.cuantiles``."""
+    velocidad = df.dropna(subset=[cuantiles.COLUMNA])
+    if not por:
+        return pd.DataFrame([velocidad[cuantiles.COLUMNA].quantile(QS).to_numpy()],
+                            columns=[f"p{q * 100:g}" for q in QS])
+    tabla = velocidad.groupby(por)[cuantiles.COLUMNA].quantile(QS).unstack()
+    tabla.columns = [f"p{q * 100:g}" for q in tabla.columns]
+    return tabla.reset_index()
+
+
+def iguales(a, b):
+    """Mismos grupos y mismos conteos por balde (aunque difiera el rango de baldes guardado)."""
+    pd.testing.assert_frame_equal(a.claves, b.claves)
+    inicio = min(a.inicio, b.inicio)
+    ancho = max(a.inicio + a.conteos.shape[1], b.inicio + b.conteos.shape[1]) - inicio
+    np.testing.assert_array_equal(a._extender(inicio, ancho), b._extender(inicio, ancho))
+    np.testing.assert_array_equal(a.ceros, b.ceros)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--filas", type=int, default=50_000, help="filas por trozo al combinar")
+    args = parser.parse_args(argv)
+
+    df = generar_hojas(args.escala)[cuantiles.HOJA]
+    t_construir = medir(lambda: cuantiles.Bocetos.construir(df), args.repeticiones)
+    bocetos = cuantiles.Bocetos.construir(df)
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = bocetos.guardar(Path(tmp) / cuantiles.ARCHIVO)
+        t_cargar = medir(lambda: cuantiles.Bocetos.cargar(ruta), args.repeticiones)
+        tamanio = ruta.stat().st_size
+    print(f"Filas: {len(df)}  grupos: {len(bocetos.claves)}  baldes: {bocetos.conteos.shape[1]}  "
+          f"archivo: {tamanio / 1024:.0f} KB (alfa = {bocetos.alfa})")
+    print(f"Construcción de los bocetos: {t_construir:.1f} ms  carga: {t_cargar:.1f} ms")
+
+    niveles = [("provincia × trimestre", cuantiles.CLAVE), ("provincia", ["Provincia"]), ("nacional", [])]
+    print(f"{'nivel':<24}{'exacto ms':>11}{'bocetos ms':>12}{'speedup':>9}{'error p50':>11}{'error p99':>11}")
+    for nombre, por in niveles:
+        esperado = exactos(df, por)
+        obtenido = bocetos.agrupar(por).cuantiles(QS)
+        pd.testing.assert_frame_equal(obtenido[por], esperado[por], check_dtype=False)
+        errores = [(obtenido[c] / esperado[c] - 1).abs().max() for c in ("p50", "p99")]
+        assert max(errores) <= bocetos.alfa + 1e-9, f"{nombre}: error relativo {max(errores):.4f}"
+        t_exacto = medir(lambda: exactos(df, por), args.repeticiones)
+        t_bocetos = medir(lambda: bocetos.agrupar(por).cuantiles(QS), args.repeticiones)
+        print(f"{nombre:<24}{t_exacto:>11.2f}{t_bocetos:>12.2f}{t_exacto / t_bocetos:>8.1f}x"
+              f"{errores[0]:>11.4f}{errores[1]:>11.4f}")
+
+    # Combinar por trozos y por trimestre da los mismos conteos que la hoja entera
+    por_trozos = [cuantiles.Bocetos.construir(df.iloc[i:i + args.filas]) for i in range(0, len(df), args.filas)]
+    iguales(cuantiles.combinar(por_trozos), bocetos)
+    por_trimestre = [cuantiles.Bocetos.construir(parte) for _, parte in df.groupby(["Año", "Trimestre"])]
+    iguales(cuantiles.combinar(por_trimestre), bocetos)
+    print(f"Combinación idéntica: {len(por_trozos)} trozos y {len(por_trimestre)} trimestres")
+
+    # Filtro de anómalos: umbral de los bocetos frente al percentil 99 exacto de cada provincia
+    velocidad = df.dropna(subset=[cuantiles.COLUMNA])
+    p99 = velocidad.groupby("Provincia")["Velocidad"].transform("quantile", 0.99)
+    exacto = velocidad["Velocidad"] <= p99
+    aproximado = velocidad["Velocidad"] <= velocidad["Provincia"].map(bocetos.umbral(0.99, ["Provincia"]))
+    assert (aproximado | ~exacto).all(), "El umbral de los bocetos descartó filas bajo el percentil 99"
+    # Las filas de más que conserva comparten balde con el percentil: no lo superan en más de gamma
+    gamma = (1 + bocetos.alfa) / (1 - bocetos.alfa)
+    assert (velocidad["Velocidad"] <= p99 * gamma)[aproximado].all(), "El umbral conservó filas de otro balde"
+    print(f"Filtro p99 por provincia: descarta {(~exacto).sum()} filas exacto, {(~aproximado).sum()} con bocetos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Consultas de drill-down: cubo preagregado frente a groupby sobre la tabla.
+
+Para cada nivel (país, provincia, partido y localidad) se compara la
+agregación ad hoc de ``eda.ipynb`` (filtrar, ``groupby`` y unificar nombres
+de tecnología) sobre ``Accesos_tecnologia_localidad`` ya cargada en memoria
+con la misma consulta respondida por el cubo, y se verifica que coincidan.
+
+    python -m benchmarks.bench_cubo --escala 10
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import almacen
+import cubo
+import etl
+import vocabulario
+from benchmarks.sintetico import generar_hojas
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+
+def agrupar(df, nivel):
+    """Agregación de ``eda.ipynb``: groupby, unstack y unión de variantes de nombre."""
+    tabla = df.groupby([nivel, "Tecnologia"])["Accesos"].sum().unstack(fill_value=0)
+    tabla.columns = tabla.columns.str.strip().str.lower()
+    return tabla.T.groupby(lambda col: col.replace(" ", "").replace("ó", "o")).sum().T
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    hoja = etl.seleccionar_hojas(["Accesos_tecnologia_localidad"])[0]
+    df = hoja.limpiar(generar_hojas(args.escala)[hoja.nombre].copy())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(tmp) / hoja.archivo
+        df.to_csv(csv, index=False)
+        parquet = almacen.escribir(df, almacen.ruta_parquet(hoja.archivo, tmp))
+        t_construir = medir(lambda: cubo.materializar(tmp), 3)
+        ruta = Path(tmp) / cubo.ARCHIVO
+        t_cargar = medir(lambda: cubo.Cubo.cargar(ruta), 3)
+        print(f"Filas: {len(df)}  CSV: {csv.stat().st_size / 1024:.0f} KB  "
+              f"Parquet: {parquet.stat().st_size / 1024:.0f} KB  cubo: {ruta.stat().st_size / 1024:.0f} KB")
+        print(f"Construcción del cubo: {t_construir:.1f} ms  carga: {t_cargar:.1f} ms")
+        c = cubo.Cubo.cargar(ruta)
+
+    provincia = df["Provincia"].value_counts().index[0]
+    partido = df.loc[df["Provincia"] == provincia, "Partido"].iloc[0]
+    localidad = df.loc[(df["Provincia"] == provincia) & (df["Partido"] == partido), "Localidad"].iloc[0]
+    en_provincia = lambda: df[df["Provincia"] == provincia]
+    en_partido = lambda: df[(df["Provincia"] == provincia) & (df["Partido"] == partido)]
+    consultas = [
+        ("país → provincias", lambda: agrupar(df, "Provincia"), lambda: c.consultar()),
+        ("provincia → partidos", lambda: agrupar(en_provincia(), "Partido"), lambda: c.consultar(provincia)),
+        ("partido → localidades", lambda: agrupar(en_partido(), "Localidad"), lambda: c.consultar(provincia, partido)),
+        ("total de una localidad",
+         lambda: agrupar(en_partido(), "Localidad").loc[localidad],
+         lambda: c.total(provincia, partido, localidad)),
+    ]
+
+    print(f"{'consulta':<26}{'groupby ms':>12}{'cubo ms':>10}{'speedup':>9}")
+    for nombre, con_groupby, con_cubo in consultas:
+        esperado, obtenido = con_groupby(), con_cubo()
+        # El cubo muestra la etiqueta de cada tecnología; eda.ipynb, la clave unificada
+        claves = vocabulario.claves(c.tecnologias)
+        if esperado.ndim == 2:
+            esperado = esperado.reindex(index=obtenido.index, columns=claves, fill_value=0)
+        else:
+            esperado = esperado.reindex(claves, fill_value=0)
+        np.testing.assert_allclose(obtenido.to_numpy(), esperado.to_numpy(dtype=float))
+        t_groupby = medir(con_groupby, args.repeticiones)
+        t_cubo = medir(con_cubo, args.repeticiones)
+        print(f"{nombre:<26}{t_groupby:>12.2f}{t_cubo:>10.3f}{t_groupby / t_cubo:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
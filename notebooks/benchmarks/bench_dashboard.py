@@ -0,0 +1,221 @@
+"""Prueba de carga del dashboard: latencia, memoria y caché por sección.
+
+Genera los datasets limpios a partir del libro sintético a cada escala
+(1×, 10× y 100× por defecto), corre ``dashboard.py`` sin navegador con
+``streamlit.testing.v1.AppTest`` y, para cada sección, mide:
+
+- ``frio_ms``: primer render con las cachés de datos y figuras vacías.
+- ``tibio_ms``: mediana y p95 de los renders siguientes de una sesión nueva.
+- ``pico_memoria_mb``: pico de memoria residente (RSS) del proceso durante
+  el render en frío e ``incremento_memoria_mb`` respecto de antes del render,
+  muestreados en una corrida aparte para no afectar los tiempos.
+- Aciertos de la caché de datos (``datos``) y de figuras (``figuras``).
+
+Cada render abre una sesión nueva, como un usuario que entra al dashboard.
+``AppTest`` comparte un único runtime por proceso, así que las sesiones se
+corren de a una: las latencias son por sesión, sin contención entre usuarios.
+
+Los resultados se guardan en JSON (``--salida``) para comparar versiones;
+con ``--comparar`` se imprime la relación contra un resultado anterior.
+
+    python -m benchmarks.bench_dashboard --escalas 1 10 --salida resultados_dashboard.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import almacen
+import cubo
+import cuantiles
+import datos
+import distribucion
+import etl
+import figuras
+import kpis
+import pronostico
+import tensor
+import vocabulario
+from benchmarks.sintetico import generar_hojas
+
+DASHBOARD = Path(__file__).resolve().parents[1] / "dashboard.py"
+
+
+def escribir_limpios(carpeta, escala):
+    """Datasets limpios, vocabulario, bocetos y distribución de velocidad, KPIs, pronósticos, cubo y tensor del ETL."""
+    hojas = generar_hojas(escala)
+    vocab = vocabulario.Vocabulario()
+    filas = 0
+    for hoja in etl.HOJAS:
+        df = vocab.aplicar(hoja.limpiar(hojas[hoja.nombre].copy()))
+        df.to_csv(Path(carpeta) / hoja.archivo, index=False)
+        almacen.escribir(df, almacen.ruta_parquet(hoja.archivo, carpeta))
+        filas += len(df)
+    vocab.guardar(carpeta)
+    cuantiles.escribir(carpeta, hojas[cuantiles.HOJA])
+    distribucion.materializar(carpeta)
+    kpis.materializar(carpeta)
+    pronostico.materializar(carpeta)
+    cubo.materializar(carpeta)
+    tensor.materializar(carpeta)
+    return filas
+
+
+def renderizar(seccion):
+    """Abre una sesión nueva, va a ``seccion`` y devuelve los ms del render."""
+    app = AppTest.from_file(str(DASHBOARD), default_timeout=600)
+    app.run()
+    inicio = time.perf_counter()
+    app.sidebar.radio[0].set_value(seccion).run()
+    transcurrido = (time.perf_counter() - inicio) * 1000
+    if app.exception:
+        raise RuntimeError(f"{seccion}: {app.exception[0].value}")
+    return transcurrido
+
+
+def rss_mb():
+    """Memoria residente actual del proceso (en Linux; si no, el pico histórico)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def pico_rss(funcion, intervalo=0.005):
+    """Corre ``funcion`` muestreando la RSS; devuelve ``(inicial, pico)`` en MB."""
+    inicial = rss_mb()
+    muestras = [inicial]
+    terminado = threading.Event()
+
+    def muestrear():
+        while not terminado.wait(intervalo):
+            muestras.append(rss_mb())
+
+    hilo = threading.Thread(target=muestrear, daemon=True)
+    hilo.start()
+    try:
+        funcion()
+    finally:
+        terminado.set()
+        hilo.join()
+    return inicial, max(muestras + [rss_mb()])
+
+
+def vaciar_caches():
+    datos.invalidar()
+    figuras.limpiar()
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, round(p / 100 * (len(valores) - 1)))]
+
+
+def medir_seccion(seccion, repeticiones):
+    # Memoria: render en frío aparte, muestreando la RSS
+    vaciar_caches()
+    inicial, pico = pico_rss(lambda: renderizar(seccion))
+
+    vaciar_caches()
+    datos_antes, figuras_antes = datos.estadisticas(), figuras.estadisticas().get(seccion, {})
+    frio = renderizar(seccion)
+    tibios = [renderizar(seccion) for _ in range(repeticiones)]
+    datos_despues, figuras_despues = datos.estadisticas(), figuras.estadisticas().get(seccion, {})
+
+    aciertos_datos = datos_despues["aciertos"] - datos_antes["aciertos"]
+    cargas = datos_despues["cargas"] - datos_antes["cargas"]
+    figuras_total = figuras_despues.get("figuras", 0) - figuras_antes.get("figuras", 0)
+    aciertos_figuras = figuras_despues.get("aciertos", 0) - figuras_antes.get("aciertos", 0)
+    return {
+        "frio_ms": frio,
+        "tibio_ms": {"mediana": statistics.median(tibios), "p95": percentil(tibios, 95)},
+        "pico_memoria_mb": pico,
+        "incremento_memoria_mb": pico - inicial,
+        "cache_datos": {
+            "aciertos": aciertos_datos,
+            "cargas": cargas,
+            "tasa_aciertos": aciertos_datos / max(aciertos_datos + cargas, 1),
+        },
+        "cache_figuras": {
+            "aciertos": aciertos_figuras,
+            "figuras": figuras_total,
+            "tasa_aciertos": aciertos_figuras / max(figuras_total, 1),
+        },
+    }
+
+
+def comparar(actual, anterior):
+    print(f"\n{'escala':<8}{'sección':<36}{'frío':>10}{'tibio':>10}{'memoria':>10}  (actual / anterior)")
+    for escala, secciones in actual["escalas"].items():
+        previas = anterior["escalas"].get(escala, {}).get("secciones", {})
+        for seccion, r in secciones["secciones"].items():
+            p = previas.get(seccion)
+            if p is None:
+                continue
+            print(f"{escala + 'x':<8}{seccion:<36}{r['frio_ms'] / p['frio_ms']:>10.2f}"
+                  f"{r['tibio_ms']['mediana'] / p['tibio_ms']['mediana']:>10.2f}"
+                  f"{r['pico_memoria_mb'] / p['pico_memoria_mb']:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeticiones", type=int, default=10, help="renders tibios por sección")
+    parser.add_argument("--salida", default="resultados_dashboard.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    resultado = {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "plataforma": platform.platform(),
+        },
+        "parametros": {"repeticiones": args.repeticiones},
+        "escalas": {},
+    }
+    salida = Path(args.salida).resolve()
+    origen = os.getcwd()
+    # Las métricas salen en el JSON; el log por render de figuras solo haría ruido
+    logging.disable(logging.INFO)
+    print(f"{'escala':<8}{'sección':<36}{'frío ms':>9}{'tibio ms':>10}{'p95 tibio':>11}{'Δ MB':>7}"
+          f"{'datos %':>9}{'figuras %':>11}")
+    for escala in args.escalas:
+        with tempfile.TemporaryDirectory() as tmp:
+            inicio = time.perf_counter()
+            filas = escribir_limpios(tmp, escala)
+            preparacion = time.perf_counter() - inicio
+            # El dashboard lee los datasets de la carpeta actual
+            os.chdir(tmp)
+            try:
+                secciones = {s: medir_seccion(s, args.repeticiones) for s in datos.SECCIONES}
+            finally:
+                os.chdir(origen)
+                vaciar_caches()
+        resultado["escalas"][str(escala)] = {"filas": filas, "preparacion_s": preparacion, "secciones": secciones}
+        for seccion, r in secciones.items():
+            print(f"{str(escala) + 'x':<8}{seccion:<36}{r['frio_ms']:>9.0f}{r['tibio_ms']['mediana']:>10.0f}"
+                  f"{r['tibio_ms']['p95']:>11.0f}{r['incremento_memoria_mb']:>7.1f}"
+                  f"{r['cache_datos']['tasa_aciertos'] * 100:>9.0f}{r['cache_figuras']['tasa_aciertos'] * 100:>11.0f}")
+
+    salida.write_text(json.dumps(resultado, indent=1, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados en {salida}")
+    if args.comparar:
+        comparar(resultado, json.loads(Path(args.comparar).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Latencia de arranque en frío y por sección de la capa de datos del dashboard.
+
+Compara ``datos.obtener`` (un DataFrame compartido por proceso) con el
+esquema anterior de un loader ``st.cache_data`` por sección, que parsea en
+frío la primera vez que se abre cada sección y en cada acierto devuelve una
+copia deserializada (pickle) del DataFrame.
+
+    python -m benchmarks.bench_datos --escala 10
+"""
+import argparse
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import almacen
+import datos
+from benchmarks.bench_dashboard import escribir_limpios
+
+
+def cargar(archivo, carpeta):
+    if archivo in datos.CARGADORES:
+        return datos.CARGADORES[archivo](Path(carpeta) / archivo)
+    return almacen.leer(archivo, carpeta=carpeta)
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--visitas", type=int, default=20, help="visitas repetidas por sección")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        escribir_limpios(tmp, args.escala)
+
+        # Esquema anterior: cada sección parsea sus archivos y cada acierto copia vía pickle
+        cache_data = {}
+
+        def visitar_cache_data(seccion):
+            for archivo in datos.SECCIONES[seccion]:
+                clave = (seccion, archivo)
+                if clave not in cache_data:
+                    cache_data[clave] = pickle.dumps(cargar(archivo, tmp))
+                pickle.loads(cache_data[clave])
+
+        def visitar_compartido(seccion):
+            for archivo in datos.SECCIONES[seccion]:
+                datos.obtener(archivo, tmp)
+
+        t_precarga = cronometrar(lambda: datos.precargar(carpeta=tmp))
+        print(f"Arranque en frío (precarga de todos los datasets): {t_precarga:.1f} ms")
+        print(f"{'sección':<36}{'frío antes':>12}{'tibio antes':>13}{'tibio ahora':>13}")
+        for seccion in datos.SECCIONES:
+            frio = cronometrar(lambda: visitar_cache_data(seccion))
+            tibio = sum(cronometrar(lambda: visitar_cache_data(seccion)) for _ in range(args.visitas)) / args.visitas
+            ahora = sum(cronometrar(lambda: visitar_compartido(seccion)) for _ in range(args.visitas)) / args.visitas
+            print(f"{seccion:<36}{frio:>12.2f}{tibio:>13.3f}{ahora:>13.3f}")
+    print(f"Estadísticas de la capa de datos: {datos.estadisticas()}")
+
+
+if __name__ == "__main__":
+    main()
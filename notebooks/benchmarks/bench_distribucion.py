@@ -0,0 +1,162 @@
+"""Distribución de velocidades por acceso: tabla precalculada frente a ordenar las filas.
+
+Escribe los datasets limpios del libro sintético (con los bocetos por
+accesos y ``velocidad_distribucion.csv``) y compara, por provincia ×
+trimestre y nacional, los accesos, la media y los percentiles ponderados
+por ``Accesos`` calculados ordenando las filas de cada grupo de
+``Velocidad_sin_Rangos`` con los de ``distribucion``. Verifica que:
+
+- los accesos de cada grupo sean los de ``velocidad_sin_rangos_limpio``
+  (el recorte del histograma descarta las mismas filas que la limpieza);
+- el error relativo de la media y de cada percentil no supere ``alfa``;
+- el porcentaje de accesos desde cada umbral quede entre el exacto y el que
+  suma el balde del umbral entero;
+- el promedio nacional de ``mbps`` sea el de las provincias ponderado por
+  sus accesos en ``Accesos por rangos``.
+
+Informa además cuánto se apartan las cifras que usaban el dashboard y el IVR
+(promedio de las filas y promedio simple de las provincias) de las
+ponderadas.
+
+    python -m benchmarks.bench_distribucion --escala 10
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import cuantiles
+import distribucion
+import vocabulario
+from benchmarks.bench_dashboard import escribir_limpios
+from benchmarks.sintetico import generar_hojas
+
+CLAVE = ["Año", "Trimestre", "Provincia"]
+ESTADISTICOS = ["media"] + [f"p{q * 100:g}" for q in distribucion.PERCENTILES]
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+
+def filtradas(df):
+    """Filas de la hoja cruda que conserva la limpieza (hasta el p99 de los bocetos de cada provincia)."""
+    df = df.dropna(subset=[cuantiles.COLUMNA])
+    df = df.assign(Provincia=vocabulario.canonizar("provincia", df["Provincia"]))
+    p99 = cuantiles.Bocetos.construir(df).umbral(0.99, ["Provincia"])
+    return df[df[cuantiles.COLUMNA] <= df["Provincia"].map(p99)]
+
+
+def exactos(df, por, gamma):
+    """Accesos, media, percentiles y porcentajes desde cada umbral, ordenando las filas de cada grupo.
+
+    Como ``Bocetos.cuantiles``, el percentil ``q`` interpola entre los
+    accesos vecinos a la posición ``q * (accesos - 1)``. De cada umbral se
+    dan dos porcentajes: desde el umbral y desde el borde inferior de su balde.
+    """
+    filas = []
+    for clave, grupo in df.groupby(por, sort=True):
+        valores = grupo[cuantiles.COLUMNA].to_numpy(dtype=float)
+        pesos = grupo[cuantiles.PESOS].to_numpy(dtype=float)
+        orden = np.argsort(valores, kind="stable")
+        valores, pesos = valores[orden], pesos[orden]
+        acumulado = np.cumsum(pesos)
+        total = acumulado[-1]
+        fila = dict(zip(por, clave), accesos=total, media=np.average(valores, weights=pesos))
+        for q in distribucion.PERCENTILES:
+            posicion = q * (total - 1)
+            bajo = np.floor(posicion)
+            a, b = valores[np.searchsorted(acumulado, [bajo, min(bajo + 1, total - 1)], side="right")]
+            fila[f"p{q * 100:g}"] = a + (posicion - bajo) * (b - a)
+        for umbral in distribucion.UMBRALES:
+            borde = gamma ** (np.ceil(np.log(umbral) / np.log(gamma)) - 1)
+            fila[f"desde_{umbral}"] = pesos[valores >= umbral].sum() / total * 100
+            fila[f"balde_{umbral}"] = pesos[valores > borde].sum() / total * 100
+        filas.append(fila)
+    return pd.DataFrame(filas)
+
+
+def error_relativo(obtenido, esperado):
+    obtenido, esperado = np.asarray(obtenido, dtype=float), np.asarray(esperado, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(esperado > 0, np.abs(obtenido / esperado - 1), np.abs(obtenido - esperado))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    hojas = generar_hojas(args.escala)
+    df = filtradas(hojas[cuantiles.HOJA])
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        escribir_limpios(tmp, args.escala)
+        t_calcular = medir(lambda: distribucion.calcular(tmp), args.repeticiones)
+        tabla = distribucion.calcular(tmp)
+        por_acceso = distribucion.bocetos_por_acceso(tmp)
+        limpio = pd.read_csv(tmp / "velocidad_sin_rangos_limpio.csv")
+        rangos = pd.read_csv(tmp / "accesos_por_rangos_limpio.csv")
+        velocidad = pd.read_csv(tmp / "Velocidad_por_provincia_limpio.csv")
+    gamma = (1 + por_acceso.alfa) / (1 - por_acceso.alfa)
+    print(f"Filas: {len(df)}  grupos: {len(por_acceso.claves)}  accesos: {df[cuantiles.PESOS].sum():.0f}  "
+          f"(alfa = {por_acceso.alfa})")
+    print(f"Tabla completa desde los bocetos y los datasets limpios: {t_calcular:.1f} ms")
+
+    provincias = tabla[tabla["Provincia"] != distribucion.TOTAL_NACIONAL].dropna(subset=["accesos"])
+    limpio = limpio.rename(columns={"anio": "Año", "trimestre": "Trimestre", "provincia": "Provincia"})
+    accesos = provincias.merge(limpio, on=CLAVE, how="outer", validate="one_to_one")
+    np.testing.assert_array_equal(accesos["accesos"], accesos["total_accesos"])
+
+    niveles = [
+        ("provincia × trimestre", CLAVE, lambda: distribucion.estadisticos(por_acceso), provincias),
+        ("nacional", ["Año", "Trimestre"],
+         lambda: distribucion.estadisticos(por_acceso.agrupar(["Año", "Trimestre"])), distribucion.nacional(tabla)),
+    ]
+    print(f"{'nivel':<24}{'exacto ms':>11}{'tabla ms':>10}{'speedup':>9}"
+          + "".join(f"{'error ' + e:>12}" for e in ESTADISTICOS))
+    for nombre, por, motor, obtenido in niveles:
+        esperado = exactos(df, por, gamma)
+        obtenido = esperado[por].merge(obtenido, on=por, how="left", validate="one_to_one")
+        np.testing.assert_allclose(obtenido["accesos"], esperado["accesos"])
+        errores = [np.nanmax(error_relativo(obtenido[e], esperado[e])) for e in ESTADISTICOS]
+        assert max(errores) <= por_acceso.alfa + 1e-9, f"{nombre}: error relativo {max(errores):.4f}"
+        for umbral in distribucion.UMBRALES:
+            columna = f"desde_{umbral}"
+            assert (obtenido[columna] >= esperado[columna] - 1e-9).all(), f"{nombre}: {columna} bajo el exacto"
+            assert (obtenido[columna] <= esperado[f"balde_{umbral}"] + 1e-9).all(), f"{nombre}: {columna}"
+        t_exacto = medir(lambda: exactos(df, por, gamma), args.repeticiones)
+        t_motor = medir(motor, args.repeticiones)
+        print(f"{nombre:<24}{t_exacto:>11.1f}{t_motor:>10.1f}{t_exacto / t_motor:>8.1f}x"
+              + "".join(f"{e:>12.4f}" for e in errores))
+
+    # Porcentajes de Accesos por rangos y promedio nacional ponderado de la velocidad media
+    nacional = distribucion.nacional(tabla).set_index(["Año", "Trimestre"])
+    conocidos = (rangos["Total"] - rangos["OTROS"].fillna(0)).groupby([rangos["Año"], rangos["Trimestre"]]).sum()
+    desde_30 = rangos.groupby(["Año", "Trimestre"])["+_30_Mbps"].sum() / conocidos * 100
+    np.testing.assert_allclose(nacional.loc[desde_30.index, "rangos_desde_30"], desde_30)
+    velocidad = velocidad.merge(rangos[CLAVE + ["Total"]], on=CLAVE)
+    ponderado = velocidad.groupby(["Año", "Trimestre"]).apply(
+        lambda g: np.average(g["Mbps (Media de bajada)"], weights=g["Total"]), include_groups=False)
+    np.testing.assert_allclose(nacional.loc[ponderado.index, "mbps"], ponderado)
+    simple = velocidad.groupby(["Año", "Trimestre"])["Mbps (Media de bajada)"].mean()
+    print(f"Promedio nacional de Mbps: el simple de las provincias se aparta del ponderado por accesos "
+          f"{error_relativo(simple, ponderado).mean() * 100:.1f}% en promedio (máx. "
+          f"{error_relativo(simple, ponderado).max() * 100:.1f}%)")
+    por_filas = df.groupby(["Año", "Trimestre"])[cuantiles.COLUMNA].mean()
+    print(f"Velocidad declarada nacional: el promedio de las filas se aparta de la media por acceso "
+          f"{error_relativo(por_filas, nacional.loc[por_filas.index, 'media']).mean() * 100:.1f}% en promedio")
+    print("Accesos iguales a la hoja limpia; media y percentiles dentro de alfa; umbrales dentro de su balde")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compara el ETL de una sola lectura con el enfoque hoja por hoja del notebook.
+
+El enfoque del notebook llama a ``pd.read_excel(ruta, sheet_name=...)`` una
+vez por hoja, lo que vuelve a abrir y parsear el libro completo en cada
+llamada. ``etl.ejecutar`` abre el libro una sola vez; se mide en un solo
+proceso y con el grafo de etapas repartido en un pool de ``--procesos``
+procesos (por defecto, uno por núcleo), y se verifica que las tres salidas
+sean idénticas.
+
+    python -m benchmarks.bench_etl --escala 1 --repeticiones 3 --procesos 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import etl
+import vocabulario
+from benchmarks.sintetico import escribir_libro, generar_hojas
+
+
+def etl_por_hoja(libro, destino):
+    """Réplica del notebook: una lectura completa del libro por cada hoja.
+
+    Los nombres se llevan al mismo vocabulario que el ETL para poder comparar
+    las salidas byte a byte.
+    """
+    vocab = vocabulario.Vocabulario()
+    for hoja in etl.HOJAS:
+        df = pd.read_excel(libro, sheet_name=hoja.nombre, engine="openpyxl")
+        vocab.aplicar(hoja.limpiar(df)).to_csv(Path(destino) / hoja.archivo, index=False)
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        libro = Path(tmp) / "Internet.xlsx"
+        escribir_libro(generar_hojas(args.escala), libro)
+        salida_notebook = Path(tmp) / "notebook"
+        salida_etl = Path(tmp) / "etl"
+        salida_pool = Path(tmp) / "pool"
+        salida_notebook.mkdir()
+
+        t_notebook = medir(lambda: etl_por_hoja(libro, salida_notebook), args.repeticiones)
+        t_etl = medir(lambda: etl.ejecutar(libro, salida_etl, procesos=1), args.repeticiones)
+        t_pool = medir(lambda: etl.ejecutar(libro, salida_pool, procesos=args.procesos), args.repeticiones)
+
+        # Los tres caminos tienen que producir exactamente los mismos CSV
+        for hoja in etl.HOJAS:
+            a = (salida_notebook / hoja.archivo).read_bytes()
+            for salida in (salida_etl, salida_pool):
+                assert a == (salida / hoja.archivo).read_bytes(), f"Salidas distintas para {hoja.nombre!r}"
+        assert (salida_etl / "vocabulario.json").read_bytes() == (salida_pool / "vocabulario.json").read_bytes()
+
+        tamanio = libro.stat().st_size / 1e6
+    print(f"Libro sintético: escala {args.escala}, {tamanio:.1f} MB, {len(etl.HOJAS)} hojas")
+    print(f"{'enfoque':<22}{'tiempo (s)':>12}")
+    print(f"{'hoja por hoja':<22}{t_notebook:>12.2f}")
+    print(f"{'una sola lectura':<22}{t_etl:>12.2f}")
+    print(f"{f'pool de {args.procesos} procesos':<22}{t_pool:>12.2f}")
+    print(f"Aceleración: {t_notebook / t_etl:.1f}x una sola lectura, "
+          f"{t_etl / t_pool:.1f}x el pool frente a un proceso ({os.cpu_count()} núcleos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Tiempo de refresco incremental frente al ETL completo según el largo de la historia.
+
+Para cada largo de historia se construye el almacén particionado con todos
+los trimestres menos el último y luego se mide cuánto cuesta incorporar ese
+trimestre nuevo, comparado con volver a limpiar todas las hojas. Las dos
+corridas escriben lo mismo: CSV y Parquet, bocetos y umbrales de
+``Velocidad_sin_Rangos`` y reglas de calidad de cada hoja. Se mide el
+procesamiento a partir de las hojas ya leídas, sin el parseo del libro ni
+las etapas derivadas (distribución, KPIs, cubo...): el modo incremental solo
+corre las de las hojas cambiadas, pero sobre toda la historia (ver
+``etl.etapas_derivadas``). En el refresco, lo único que recorre toda
+la historia es el hash de las hojas leídas, que detecta los trimestres
+revisados; limpiar y escribir depende solo del trimestre nuevo.
+
+    python -m benchmarks.bench_incremental
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import calidad
+import cuantiles
+import etl
+import incremental
+from benchmarks.sintetico import generar_hojas, periodos
+
+
+def sin_ultimo_trimestre(hojas, ultimo):
+    resultado = {}
+    for nombre, df in hojas.items():
+        if {"Año", "Trimestre"}.issubset(df.columns):
+            df = df[(df["Año"] != ultimo[0]) | (df["Trimestre"] != ultimo[1])]
+        resultado[nombre] = df
+    return resultado
+
+
+def refrescar(hojas, destino, manifiesto):
+    for hoja in etl.HOJAS:
+        _, manifiesto[hoja.nombre] = incremental.actualizar_hoja(
+            hoja, hojas[hoja.nombre], destino, manifiesto.get(hoja.nombre, {})
+        )
+
+
+def completo(hojas, destino):
+    for hoja in etl.HOJAS:
+        crudo = hojas[hoja.nombre].copy()
+        if hoja.nombre == cuantiles.HOJA:
+            limpio = hoja.limpiar(crudo, cuantiles.escribir(destino, crudo))
+        else:
+            limpio = hoja.limpiar(crudo)
+        calidad.revisar(hoja, limpio)
+        etl.escribir_hoja(hoja, destino, etl.FORMATOS, limpio)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--desde", type=int, nargs="+", default=[2014, 2004, 1984])
+    args = parser.parse_args(argv)
+
+    print(f"{'trimestres':>10}{'completo (s)':>15}{'incremental (s)':>18}")
+    for desde in args.desde:
+        periodos_ = periodos(desde=desde)
+        hojas = generar_hojas(periodos_=periodos_)
+        antes = sin_ultimo_trimestre(hojas, periodos_[-1])
+        with tempfile.TemporaryDirectory() as tmp:
+            manifiesto = {}
+            refrescar(antes, tmp, manifiesto)
+
+            inicio = time.perf_counter()
+            refrescar(hojas, tmp, manifiesto)
+            t_incremental = time.perf_counter() - inicio
+
+            (Path(tmp) / "completo").mkdir()
+            inicio = time.perf_counter()
+            completo(hojas, Path(tmp) / "completo")
+            t_completo = time.perf_counter() - inicio
+        print(f"{len(periodos_):>10}{t_completo:>15.3f}{t_incremental:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
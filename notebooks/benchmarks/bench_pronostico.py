@@ -0,0 +1,92 @@
+"""Pronósticos en lote frente a un ajuste por serie y por trimestre de origen.
+
+Arma la grilla (serie, trimestre) de la penetración en hogares y la
+velocidad media de cada provincia del libro sintético, repetida ``escala``
+veces con ruido, y pronostica el trimestre siguiente a cada origen con
+``pronostico.ajustar`` (todas las ventanas a la vez) y con un bucle de
+``np.linalg.lstsq`` por serie y origen. Verifica que ambos den los mismos
+pronósticos e informa la cobertura de los intervalos sobre los trimestres
+que sí tienen valor siguiente.
+
+    python -m benchmarks.bench_pronostico --escalas 1 10 100
+"""
+import argparse
+import time
+
+import numpy as np
+
+import pronostico
+from benchmarks.sintetico import generar_hojas
+
+HOJAS = {"Penetracion-hogares": "Accesos por cada 100 hogares", "Velocidad % por prov": "Mbps (Media de bajada)"}
+
+
+def grilla(escala, semilla=0):
+    """Series (provincia × indicador, repetidas ``escala`` veces) y el período del primer trimestre."""
+    hojas = generar_hojas(1)
+    series = []
+    for nombre, columna in HOJAS.items():
+        df = hojas[nombre]
+        periodo = df["Año"] * 4 + df["Trimestre"] - 1
+        tabla = df.assign(periodo=periodo).pivot(index="Provincia", columns="periodo", values=columna)
+        series.append(tabla.to_numpy(dtype=float))
+    base = np.concatenate(series)
+    rng = np.random.default_rng(semilla)
+    repetidas = np.concatenate([base * rng.uniform(0.9, 1.1, base.shape) for _ in range(escala)])
+    # Algunos trimestres faltantes, como en las hojas originales
+    repetidas[rng.random(repetidas.shape) < 0.02] = np.nan
+    return repetidas, int(tabla.columns.min())
+
+
+def por_serie(datos, inicio, ventana=pronostico.VENTANA, minimo=pronostico.MINIMO):
+    """El mismo modelo ajustado con un ``lstsq`` por serie y por origen."""
+    resultado = np.full(datos.shape, np.nan)
+    posiciones = np.arange(ventana)
+    for s in range(datos.shape[0]):
+        for p in range(datos.shape[1]):
+            desde = p - ventana + 1
+            absolutos = inicio + desde + posiciones
+            valores = np.concatenate([np.full(max(-desde, 0), np.nan), datos[s, max(desde, 0):p + 1]])
+            presentes = ~np.isnan(valores)
+            x = pronostico._diseno(absolutos[presentes], posiciones[presentes])
+            if presentes.sum() < minimo or not presentes[-1] or presentes.sum() <= np.linalg.matrix_rank(x):
+                continue
+            coeficientes = np.linalg.lstsq(x, valores[presentes], rcond=None)[0]
+            resultado[s, p] = pronostico._diseno(np.array(inicio + p + 1), np.array(ventana)) @ coeficientes
+    return resultado
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000, resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'escala':<8}{'series':>8}{'ajustes':>9}{'bucle ms':>11}{'lote ms':>10}{'speedup':>9}{'cobertura':>11}")
+    for escala in args.escalas:
+        datos, inicio = grilla(escala)
+        t_lote, ajuste = medir(lambda: pronostico.ajustar(datos, inicio), args.repeticiones)
+        t_bucle, esperado = medir(lambda: por_serie(datos, inicio), 1)
+        np.testing.assert_allclose(ajuste["pronostico"], esperado, rtol=1e-6, atol=1e-6)
+
+        siguiente = np.full(datos.shape, np.nan)
+        siguiente[:, :-1] = datos[:, 1:]
+        evaluables = ~np.isnan(siguiente) & ~np.isnan(ajuste["pronostico"])
+        dentro = (siguiente >= ajuste["inferior"]) & (siguiente <= ajuste["superior"])
+        ajustes = int((~np.isnan(ajuste["pronostico"])).sum())
+        print(f"{str(escala) + 'x':<8}{datos.shape[0]:>8}{ajustes:>9}{t_bucle:>11.1f}{t_lote:>10.1f}"
+              f"{t_bucle / t_lote:>8.1f}x{dentro[evaluables].mean():>11.1%}")
+    print(f"Pronósticos idénticos en lote y por serie (intervalos de nivel {pronostico.NIVEL:.0%})")
+
+
+if __name__ == "__main__":
+    main()
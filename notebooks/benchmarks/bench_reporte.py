@@ -0,0 +1,79 @@
+"""Render del reporte estático del EDA: en serie, en paralelo y solo lo que cambió.
+
+Escribe los datasets limpios del libro sintético y, a cada escala, genera el
+reporte completo (``--todo``) con un proceso y con ``--procesos`` procesos.
+Verifica que:
+
+- los PNG sean idénticos byte a byte con uno y con varios procesos;
+- una segunda corrida sin cambios no renderice ninguna figura, tampoco si
+  los datasets se reescriben con el mismo contenido (como hace el ETL);
+- al cambiar un dataset se rendericen exactamente las figuras que lo usan.
+
+    python -m benchmarks.bench_reporte --escalas 1 10 --procesos 4
+"""
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import reporte
+from benchmarks.bench_dashboard import escribir_limpios
+
+MODIFICADO = "Velocidad_por_provincia_limpio.csv"
+
+
+def generar(*args, **kwargs):
+    inicio = time.perf_counter()
+    estados = reporte.generar(*args, **kwargs)
+    return estados, time.perf_counter() - inicio
+
+
+def renderizadas(estados):
+    return {nombre for nombre, estado in estados.items() if estado == "renderizada"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--procesos", type=int, default=max(os.cpu_count() or 1, 2))
+    args = parser.parse_args(argv)
+
+    print(f"{len(reporte.FIGURAS)} figuras; {os.cpu_count()} núcleo(s)")
+    print(f"{'escala':<8}{'1 proceso s':>13}{f'{args.procesos} procesos s':>14}{'speedup':>9}"
+          f"{'sin cambios s':>15}{'un dataset s':>14}")
+    for escala in args.escalas:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            escribir_limpios(tmp, escala)
+            serie, t_serie = generar(tmp, tmp / "serie", todo=True, procesos=1)
+            paralelo, t_paralelo = generar(tmp, tmp / "paralelo", todo=True, procesos=args.procesos)
+            assert renderizadas(serie) == renderizadas(paralelo) == set(reporte.FIGURAS), serie
+            for nombre in reporte.FIGURAS:
+                png = f"{nombre}.png"
+                assert filecmp.cmp(tmp / "serie" / png, tmp / "paralelo" / png, shallow=False), nombre
+            assert (tmp / "paralelo" / "index.html").exists()
+
+            # El ETL reescribe todos los datasets aunque no cambien: no debe re-renderizarse nada
+            for archivo in {a for f in reporte.FIGURAS.values() for a in f.archivos}:
+                (tmp / archivo).write_bytes((tmp / archivo).read_bytes())
+            sin_cambios, t_sin_cambios = generar(tmp, tmp / "paralelo", procesos=args.procesos)
+            assert not renderizadas(sin_cambios), sin_cambios
+
+            df = pd.read_csv(tmp / MODIFICADO)
+            df.loc[0, "Mbps (Media de bajada)"] += 1
+            df.to_csv(tmp / MODIFICADO, index=False)
+            un_dataset, t_un_dataset = generar(tmp, tmp / "paralelo", procesos=args.procesos)
+            esperadas = {f.nombre for f in reporte.FIGURAS.values() if MODIFICADO in f.archivos}
+            assert renderizadas(un_dataset) == esperadas, renderizadas(un_dataset)
+
+            print(f"{str(escala) + 'x':<8}{t_serie:>13.2f}{t_paralelo:>14.2f}{t_serie / t_paralelo:>8.1f}x"
+                  f"{t_sin_cambios:>15.2f}{t_un_dataset:>14.2f} ({len(esperadas)} figuras)")
+    print("PNG idénticos en serie y en paralelo; solo se renderizan las figuras con datos nuevos")
+
+
+if __name__ == "__main__":
+    main()
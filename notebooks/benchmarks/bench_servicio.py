@@ -0,0 +1,209 @@
+"""Prueba de carga del servicio HTTP/JSON: latencia p50/p99 y rendimiento con clientes concurrentes.
+
+Escribe los datasets limpios del libro sintético, levanta ``servicio.py`` en
+otro proceso y lo consulta con ``--clientes`` conexiones persistentes a la
+vez, cada una con ``--peticiones`` peticiones, en cuatro escenarios:
+
+- ``caché``: un conjunto fijo de consultas por provincia (salen de la LRU).
+- ``sin caché``: cada consulta distinta (provincias y trimestres al azar).
+- ``304``: las consultas de ``caché`` con ``If-None-Match``.
+- ``localidades``: tablas por localidad, enviadas en trozos.
+
+Antes verifica que las respuestas coincidan con los CSV limpios, que un
+``ETag`` vigente dé ``304`` y que, al reescribir un dataset, el mismo
+``ETag`` deje de valer y la respuesta traiga el dato nuevo.
+
+    python -m benchmarks.bench_servicio --clientes 32 --peticiones 100
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+import tensor
+from benchmarks.bench_dashboard import escribir_limpios
+
+SERVICIO = Path(__file__).resolve().parents[1] / "servicio.py"
+
+
+class Cliente:
+    """Una conexión HTTP/1.1 persistente (lo mínimo para medir el servicio)."""
+
+    def __init__(self, lector, escritor):
+        self.lector, self.escritor = lector, escritor
+
+    @classmethod
+    async def conectar(cls, puerto):
+        return cls(*await asyncio.open_connection("127.0.0.1", puerto))
+
+    async def pedir(self, ruta, encabezados=None):
+        """``(estado, encabezados, cuerpo)`` de ``GET ruta``."""
+        lineas = [f"GET {ruta} HTTP/1.1", "Host: 127.0.0.1"]
+        lineas += [f"{nombre}: {valor}" for nombre, valor in (encabezados or {}).items()]
+        self.escritor.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1"))
+        await self.escritor.drain()
+        estado = int((await self.lector.readline()).split()[1])
+        respuesta = {}
+        while (linea := await self.lector.readline()) not in (b"\r\n", b""):
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            respuesta[nombre.strip().lower()] = valor.strip()
+        if respuesta.get("transfer-encoding") == "chunked":
+            partes = []
+            while (largo := int((await self.lector.readline()).strip(), 16)):
+                partes.append(await self.lector.readexactly(largo))
+                await self.lector.readline()
+            await self.lector.readline()
+            cuerpo = b"".join(partes)
+        else:
+            cuerpo = await self.lector.readexactly(int(respuesta.get("content-length", 0)))
+        return estado, respuesta, cuerpo
+
+    async def cerrar(self):
+        self.escritor.close()
+        await self.escritor.wait_closed()
+
+
+def url(ruta, **filtros):
+    consulta = "&".join(f"{nombre}={quote(str(valor))}" for nombre, valor in filtros.items() if valor is not None)
+    return f"{ruta}?{consulta}" if consulta else ruta
+
+
+async def verificar(puerto, carpeta):
+    cliente = await Cliente.conectar(puerto)
+    hogares = pd.read_csv(carpeta / "Penetracion_hogares_limpio.csv")
+    provincia = str(hogares["Provincia"].iloc[0])
+    anio = int(hogares["Año"].max())
+
+    estado, encabezados, cuerpo = await cliente.pedir(url("/provincias/penetracion", provincia=provincia,
+                                                          desde=f"{anio - 1}-T1", hasta=f"{anio}-T4"))
+    assert estado == 200, cuerpo
+    obtenido = pd.DataFrame(json.loads(cuerpo)["datos"])
+    esperado = hogares[(hogares["Provincia"] == provincia) & (hogares["Año"] >= anio - 1)].sort_values(
+        ["Año", "Trimestre"])
+    np.testing.assert_allclose(obtenido["Accesos por cada 100 hogares"], esperado["Accesos por cada 100 hogares"])
+    assert obtenido[["Año", "Trimestre"]].values.tolist() == esperado[["Año", "Trimestre"]].values.tolist()
+
+    localidades = pd.read_csv(carpeta / "Accesos_tecnologia_localidad_limpio.csv")
+    estado, _, cuerpo = await cliente.pedir(url("/localidades/tecnologias", provincia=provincia))
+    obtenido = json.loads(cuerpo)
+    esperado = localidades[localidades["Provincia"] == provincia]
+    assert estado == 200 and obtenido["filas"] == len(obtenido["datos"]) == len(esperado)
+    assert sum(fila["Accesos"] for fila in obtenido["datos"]) == esperado["Accesos"].sum()
+    # Un parámetro que la ruta no admite es un error de la consulta, no otra versión de la respuesta
+    estado, _, cuerpo = await cliente.pedir(url("/localidades/velocidades", tecnologia="ADSL"))
+    assert estado == 400, cuerpo
+
+    ruta = url("/provincias/velocidad", provincia=provincia)
+    estado, encabezados, cuerpo = await cliente.pedir(ruta)
+    etag = encabezados["etag"]
+    estado, _, vacio = await cliente.pedir(ruta, {"If-None-Match": etag})
+    assert estado == 304 and not vacio, estado
+
+    # El ETL reescribe el dataset: el ETag anterior ya no vale y se recalcula
+    velocidad = pd.read_csv(carpeta / "Velocidad_por_provincia_limpio.csv")
+    velocidad.loc[velocidad["Provincia"] == provincia, "Mbps (Media de bajada)"] += 1000
+    velocidad.to_csv(carpeta / "Velocidad_por_provincia_limpio.csv", index=False)
+    (carpeta / "Velocidad_por_provincia_limpio.parquet").unlink(missing_ok=True)
+    tensor.materializar(carpeta)
+    estado, encabezados, nuevo = await cliente.pedir(ruta, {"If-None-Match": etag})
+    assert estado == 200 and encabezados["etag"] != etag, estado
+    antes = pd.DataFrame(json.loads(cuerpo)["datos"])["Mbps (Media de bajada)"]
+    despues = pd.DataFrame(json.loads(nuevo)["datos"])["Mbps (Media de bajada)"]
+    np.testing.assert_allclose(despues - antes, 1000)
+    await cliente.cerrar()
+
+
+async def cargar(puerto, rutas, clientes, peticiones, encabezados=None):
+    """Latencias (s) de ``clientes`` conexiones concurrentes y duración total."""
+    latencias = []
+
+    async def usuario(semilla):
+        azar = random.Random(semilla)
+        cliente = await Cliente.conectar(puerto)
+        for _ in range(peticiones):
+            ruta = azar.choice(rutas) if isinstance(rutas, list) else rutas(azar)
+            inicio = time.perf_counter()
+            estado, _, _ = await cliente.pedir(ruta, encabezados(ruta) if encabezados else None)
+            latencias.append(time.perf_counter() - inicio)
+            assert estado in (200, 304), (estado, ruta)
+        await cliente.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(usuario(semilla) for semilla in range(clientes)))
+    return latencias, time.perf_counter() - inicio
+
+
+async def escenarios(puerto, carpeta, clientes, peticiones):
+    t = tensor.Tensor.cargar(carpeta / tensor.ARCHIVO)
+    provincias, periodos = list(t.provincias), list(t.periodos)
+    temas = ["penetracion", "velocidad", "tecnologias", "rangos"]
+    fijas = [url(f"/provincias/{tema}", provincia=p, desde=periodos[-8]) for tema in temas for p in provincias]
+
+    def distinta(azar):
+        desde, hasta = sorted(azar.sample(periodos, 2))
+        elegidas = ",".join(azar.sample(provincias, azar.randint(1, 5)))
+        return url(f"/provincias/{azar.choice(temas)}", provincia=elegidas, desde=desde, hasta=hasta)
+
+    etags = {}
+    cliente = await Cliente.conectar(puerto)
+    for ruta in fijas:
+        etags[ruta] = (await cliente.pedir(ruta))[1]["etag"]
+    await cliente.cerrar()
+    localidades = [url("/localidades/tecnologias", provincia=p) for p in provincias] + ["/localidades/velocidades"]
+
+    yield "caché", await cargar(puerto, fijas, clientes, peticiones)
+    yield "sin caché", await cargar(puerto, distinta, clientes, peticiones)
+    yield "304", await cargar(puerto, fijas, clientes, peticiones, lambda ruta: {"If-None-Match": etags[ruta]})
+    yield "localidades", await cargar(puerto, localidades, clientes, max(peticiones // 10, 1))
+
+
+async def correr(puerto, carpeta, clientes, peticiones):
+    await verificar(puerto, carpeta)
+    print(f"{'escenario':<14}{'peticiones':>11}{'p50 ms':>9}{'p99 ms':>9}{'pet/s':>9}")
+    async for nombre, (latencias, total) in escenarios(puerto, carpeta, clientes, peticiones):
+        ms = np.asarray(latencias) * 1000
+        print(f"{nombre:<14}{len(ms):>11}{np.percentile(ms, 50):>9.2f}{np.percentile(ms, 99):>9.2f}"
+              f"{len(ms) / total:>9.0f}")
+    cliente = await Cliente.conectar(puerto)
+    estadisticas = json.loads((await cliente.pedir("/"))[2])["estadisticas"]
+    await cliente.cerrar()
+    return estadisticas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--peticiones", type=int, default=100, help="peticiones por cliente y escenario")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        escribir_limpios(tmp, args.escala)
+        servidor = subprocess.Popen([sys.executable, str(SERVICIO), "--carpeta", str(tmp), "--puerto", "0"],
+                                    stdout=subprocess.PIPE, text=True)
+        try:
+            puerto = int(servidor.stdout.readline().rstrip().rstrip("/").rsplit(":", 1)[1])
+            print(f"{args.clientes} clientes concurrentes, servicio en el puerto {puerto}")
+            estadisticas = asyncio.run(correr(puerto, tmp, args.clientes, args.peticiones))
+        finally:
+            servidor.terminate()
+            servidor.wait()
+    print(f"Estadísticas del servicio: {estadisticas}")
+    # El único error es la consulta con un parámetro desconocido de verificar()
+    assert estadisticas["errores"] == 1, estadisticas
+    print("Respuestas iguales a los CSV limpios; ETag y 304 siguen la versión del dataset; "
+          "400 ante parámetros desconocidos")
+
+
+if __name__ == "__main__":
+    main()
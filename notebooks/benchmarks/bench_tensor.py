@@ -0,0 +1,166 @@
+"""Cortes del tensor provincial mapeado en memoria frente a filtros y ``groupby`` sobre las tablas.
+
+Escribe los datasets limpios del libro sintético, materializa el tensor y
+compara los cortes típicos del EDA y del dashboard hechos sobre las tablas
+largas (filtros, ``groupby``, ``pivot_table``) con los mismos cortes del
+``tensor.Tensor`` mapeado (``seleccionar``, ``reducir``, ``tabla``),
+verificando que den los mismos valores.
+
+Después levanta ``--procesos`` procesos que cargan los mismos datos, como
+los procesos de un dashboard: cada uno con sus DataFrames o todos mapeando el
+tensor. Informa la memoria física que sumaron (PSS: las páginas compartidas
+se reparten entre los procesos que las usan).
+
+    python -m benchmarks.bench_tensor --procesos 4
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+import almacen
+import tensor
+from benchmarks.bench_dashboard import escribir_limpios
+
+TECNOLOGIAS = ["ADSL", "Cablemodem", "Fibra óptica", "Wireless", "Otros"]
+HAB = "Accesos por cada 100 hab"
+MBPS = "Mbps (Media de bajada)"
+
+
+def cargar_tablas(carpeta):
+    return {archivo: almacen.leer(archivo, carpeta=carpeta) for archivo in tensor.FUENTES}
+
+
+def con_notas_al_pie(tablas):
+    """Las tablas con una fila vacía al final, como las notas al pie y filas en blanco del libro real."""
+    return {archivo: df.reindex([*df.index, len(df)]) for archivo, df in tablas.items()}
+
+
+def consultas(tablas, t):
+    """``{consulta: (con tablas, con el tensor, comparación)}``."""
+    tecnologias = tablas["Accesos_Por_Tecnologia_limpio.csv"]
+    poblacion = tablas["Penetracion_poblacion_limpio.csv"]
+    velocidad = tablas["Velocidad_por_provincia_limpio.csv"]
+    indicadores = [f"tecnologia:{c}" for c in TECNOLOGIAS]
+    anio, trimestre = int(tecnologias["Año"].max()), int(tecnologias.loc[tecnologias["Año"].idxmax(), "Trimestre"])
+    ultimo = f"{anio}-T{trimestre}"
+    provincia = str(tecnologias["Provincia"].iloc[0])
+
+    def iguales(a, b):
+        np.testing.assert_allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float), rtol=1e-12)
+
+    return {
+        "barras por provincia": (
+            lambda: poblacion.groupby("Provincia", observed=True)[HAB].sum().sort_index(),
+            lambda: t.reducir("suma", "periodo", indicador="penetracion:hab"),
+            iguales,
+        ),
+        "corte de un trimestre": (
+            lambda: tecnologias[(tecnologias["Año"] == anio) & (tecnologias["Trimestre"] == trimestre)]
+            .set_index("Provincia")[TECNOLOGIAS].sort_index(),
+            lambda: t.seleccionar(periodo=ultimo, indicador=indicadores),
+            iguales,
+        ),
+        "serie de una provincia": (
+            lambda: tecnologias[tecnologias["Provincia"] == provincia]
+            .sort_values(["Año", "Trimestre"])["Fibra óptica"],
+            lambda: t.seleccionar(provincia=provincia, indicador="tecnologia:Fibra óptica"),
+            iguales,
+        ),
+        "total nacional por trimestre": (
+            lambda: tecnologias.groupby(["Año", "Trimestre"])[TECNOLOGIAS].sum(),
+            lambda: t.reducir("suma", "provincia", indicador=indicadores),
+            iguales,
+        ),
+        "panel provincia × trimestre": (
+            lambda: velocidad.pivot_table(index="Provincia", columns=["Año", "Trimestre"], values=MBPS,
+                                          observed=True),
+            lambda: t.tabla("velocidad:mbps"),
+            iguales,
+        ),
+    }
+
+
+def medir(funcion, repeticiones):
+    """Microsegundos por llamada (el mínimo de ``repeticiones`` tandas)."""
+    llamadas = 50
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            resultado = funcion()
+        mejor = min(mejor, (time.perf_counter() - inicio) / llamadas)
+    return mejor * 1e6, resultado
+
+
+def pss_kb():
+    """Memoria física proporcional del proceso (PSS) en KB, de ``/proc/self/smaps_rollup``."""
+    with open("/proc/self/smaps_rollup") as archivo:
+        for linea in archivo:
+            if linea.startswith("Pss:"):
+                return int(linea.split()[1])
+    raise RuntimeError("Sin PSS en /proc/self/smaps_rollup")
+
+
+def _proceso(modo, carpeta, barrera, resultados):
+    # Todos los procesos están vivos en las dos mediciones: lo compartido de antes se reparte igual
+    barrera.wait()
+    antes = pss_kb()
+    if modo == "tablas":
+        datos = cargar_tablas(carpeta)
+        sum(df.select_dtypes("number").sum().sum() for df in datos.values())
+    else:
+        datos = tensor.Tensor.cargar(f"{carpeta}/{tensor.ARCHIVO}")
+        np.nansum(datos.valores)
+    barrera.wait()
+    resultados.put(pss_kb() - antes)
+    barrera.wait()
+
+
+def memoria(modo, carpeta, procesos):
+    contexto = multiprocessing.get_context("fork")
+    barrera = contexto.Barrier(procesos)
+    resultados = contexto.Queue()
+    hijos = [contexto.Process(target=_proceso, args=(modo, carpeta, barrera, resultados)) for _ in range(procesos)]
+    for hijo in hijos:
+        hijo.start()
+    total = sum(resultados.get() for _ in hijos)
+    for hijo in hijos:
+        hijo.join()
+    return total / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--procesos", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        escribir_limpios(tmp, args.escala)
+        t = tensor.Tensor.cargar(f"{tmp}/{tensor.ARCHIVO}")
+        tablas = cargar_tablas(tmp)
+        con_notas = tensor.Tensor.construir(con_notas_al_pie(tablas))
+        np.testing.assert_array_equal(con_notas.provincias, t.provincias)
+        np.testing.assert_array_equal(con_notas.valores, t.valores)
+        print(f"Tensor {t.valores.shape} ({t.valores.nbytes / 1024:.0f} KB) frente a "
+              f"{sum(df.memory_usage(deep=True).sum() for df in tablas.values()) / 1024:.0f} KB de tablas")
+
+        print(f"{'consulta':<32}{'tablas µs':>11}{'tensor µs':>11}{'speedup':>9}")
+        for nombre, (con_tablas, con_tensor, comparar) in consultas(tablas, t).items():
+            t_tablas, esperado = medir(con_tablas, args.repeticiones)
+            t_tensor, obtenido = medir(con_tensor, args.repeticiones)
+            comparar(esperado, obtenido)
+            print(f"{nombre:<32}{t_tablas:>11.1f}{t_tensor:>11.1f}{t_tablas / t_tensor:>8.1f}x")
+
+        print(f"Memoria física sumada por {args.procesos} procesos que cargan los datos (PSS):")
+        for modo in ("tablas", "tensor"):
+            print(f"  {modo:<8}{memoria(modo, tmp, args.procesos):>8.2f} MB")
+    print("Mismos valores con las tablas y con el tensor; las filas sin período ni provincia se ignoran")
+
+
+if __name__ == "__main__":
+    main()
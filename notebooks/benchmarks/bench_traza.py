@@ -0,0 +1,112 @@
+"""Costo de la instrumentación por tramos, activada y desactivada.
+
+Mide el costo por tramo de ``traza.tramo`` (desactivada: el contexto vacío
+compartido; activada: tiempo, memoria y registro del evento) y el ETL
+completo sobre el libro sintético sin traza y con traza, en un solo proceso y
+con el pool. Verifica que:
+
+- las salidas sean idénticas con y sin traza;
+- la traza sea un arreglo de eventos de Chrome legible, con un tramo por
+  cada etapa de la corrida (también las que corrieron en el pool) y los
+  tramos de escritura adentro;
+- el resumen tenga una fila por tramo.
+
+    python -m benchmarks.bench_traza --escalas 1 5 --procesos 2
+"""
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import etl
+import traza
+from benchmarks.sintetico import escribir_libro, generar_hojas
+
+
+def costo_por_tramo(llamadas=100_000):
+    """Microsegundos por ``with traza.tramo(...)`` con la traza en su estado actual."""
+    inicio = time.perf_counter()
+    for _ in range(llamadas):
+        with traza.tramo("vacio", "bench", filas=1):
+            pass
+    return (time.perf_counter() - inicio) / llamadas * 1e6
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def verificar_traza(ruta, salidas, procesos):
+    eventos = traza.leer(ruta)
+    etapas = {e["name"] for e in eventos if e["cat"] == "etapa"}
+    for hoja in etl.HOJAS:
+        nombre = hoja.nombre.strip()
+        faltantes = {f"{tipo}:{nombre}" for tipo in ("leer", "limpiar", "validar", "calidad", "escribir")} - etapas
+        assert not faltantes, f"Etapas sin tramo: {faltantes}"
+    escrituras = [e for e in eventos if e["name"] == "to_csv"]
+    assert len(escrituras) == len(etl.HOJAS), len(escrituras)
+    assert sum(e["args"]["filas"] for e in escrituras) == sum(len(pd.read_csv(r)) for r in salidas.values())
+    if procesos > 1:
+        assert len({e["pid"] for e in eventos}) > 1, "No volvieron tramos del pool"
+    corrida = next(e for e in eventos if e["name"] == "etl")
+    for evento in eventos:
+        assert corrida["ts"] <= evento["ts"] <= corrida["ts"] + corrida["dur"], evento["name"]
+    resumen = pd.read_csv(traza.ruta_resumen(ruta))
+    assert len(resumen) == len({(e["name"], e["cat"]) for e in eventos})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--procesos", type=int, default=max(os.cpu_count() or 1, 2))
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        traza.desactivar()
+        apagada = costo_por_tramo()
+        traza.activar(tmp / "micro.json")
+        encendida = costo_por_tramo()
+        traza.desactivar()
+        print(f"Costo por tramo: {apagada:.2f} µs desactivada, {encendida:.2f} µs activada")
+
+        print(f"{'escala':<8}{'procesos':>9}{'sin traza s':>13}{'con traza s':>13}{'costo':>8}{'eventos':>9}")
+        for escala in args.escalas:
+            libro = escribir_libro(generar_hojas(escala), tmp / f"Internet_{escala}.xlsx")
+            for procesos in (1, args.procesos):
+                base = tmp / f"sin_{escala}_{procesos}"
+                sin_traza = medir(lambda: etl.ejecutar(libro, base, procesos=procesos), args.repeticiones)
+
+                ruta = tmp / f"traza_{escala}_{procesos}.json"
+                destino = tmp / f"con_{escala}_{procesos}"
+
+                def con_traza():
+                    ruta.unlink(missing_ok=True)
+                    traza.activar(ruta)
+                    try:
+                        return etl.ejecutar(libro, destino, procesos=procesos)
+                    finally:
+                        traza.desactivar()
+
+                con = medir(con_traza, args.repeticiones)
+                salidas = etl.ejecutar(libro, destino, procesos=procesos)
+                for hoja in etl.HOJAS:
+                    assert filecmp.cmp(base / hoja.archivo, destino / hoja.archivo, shallow=False), hoja.nombre
+                verificar_traza(ruta, salidas, procesos)
+                print(f"{str(escala) + 'x':<8}{procesos:>9}{sin_traza:>13.2f}{con:>13.2f}"
+                      f"{con / sin_traza - 1:>8.1%}{len(traza.leer(ruta)):>9}")
+    print("Salidas idénticas con y sin traza; un tramo por etapa, también desde el pool")
+
+
+if __name__ == "__main__":
+    main()
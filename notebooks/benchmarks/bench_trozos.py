@@ -0,0 +1,101 @@
+"""Pico de memoria del ETL de las hojas por localidad: en memoria frente a por trozos.
+
+Para cada escala escribe ``Acc_vel_loc_sinrangos`` y
+``Accesos_tecnologia_localidad`` del libro sintético y corre su ETL (más el
+cubo de tecnologías) en un proceso nuevo por modo, midiendo el tiempo y el
+pico de memoria residente (RSS) del proceso. Verifica que ambos modos den los mismos CSV,
+vocabulario y cubo, y las mismas tablas en Parquet.
+
+    python -m benchmarks.bench_trozos --escalas 10 30 --filas 10000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import cubo
+import etl
+import trozos
+from benchmarks.sintetico import escribir_libro, generar_hojas
+
+
+def pico_rss_mb():
+    """Pico de RSS de este proceso (``VmHWM``; ``ru_maxrss`` se hereda del padre en Linux)."""
+    try:
+        with open("/proc/self/status") as estado:
+            for linea in estado:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def correr(libro, destino, filas_por_trozo):
+    """Corre el ETL de las hojas por localidad en este proceso e informa tiempo y pico de RSS."""
+    base = pico_rss_mb()
+    inicio = time.perf_counter()
+    etl.ejecutar(libro, destino, hojas=list(trozos.HOJAS), procesos=1, derivados=True,
+                 filas_por_trozo=filas_por_trozo)
+    return {"segundos": time.perf_counter() - inicio, "pico_mb": pico_rss_mb(), "base_mb": base}
+
+
+def en_proceso_nuevo(libro, destino, filas_por_trozo):
+    # Cada modo corre en su propio intérprete para que el pico de RSS sea solo suyo
+    comando = [sys.executable, "-m", "benchmarks.bench_trozos", "--hijo", str(libro), str(destino),
+               str(filas_por_trozo or 0)]
+    salida = subprocess.run(comando, check=True, capture_output=True, text=True).stdout
+    return json.loads(salida.splitlines()[-1])
+
+
+def comparar_salidas(a, b):
+    for hoja in etl.seleccionar_hojas(list(trozos.HOJAS)):
+        assert (a / hoja.archivo).read_bytes() == (b / hoja.archivo).read_bytes(), f"CSV distinto: {hoja.archivo}"
+        pd.testing.assert_frame_equal(pd.read_parquet(etl.almacen.ruta_parquet(hoja.archivo, a)),
+                                      pd.read_parquet(etl.almacen.ruta_parquet(hoja.archivo, b)))
+    assert (a / "vocabulario.json").read_bytes() == (b / "vocabulario.json").read_bytes(), "Vocabulario distinto"
+    cubo_a, cubo_b = cubo.Cubo.cargar(a / cubo.ARCHIVO), cubo.Cubo.cargar(b / cubo.ARCHIVO)
+    for campo in ("tecnologias", "provincias", "partidos", "localidades", "por_localidad", "por_provincia"):
+        np.testing.assert_array_equal(getattr(cubo_a, campo), getattr(cubo_b, campo))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[10, 30])
+    parser.add_argument("--filas", type=int, default=etl.FILAS_POR_TROZO, help="filas por trozo")
+    parser.add_argument("--hijo", nargs=3, metavar=("LIBRO", "DESTINO", "FILAS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.hijo:
+        libro, destino, filas = args.hijo
+        print(json.dumps(correr(libro, destino, int(filas) or None)))
+        return
+
+    print(f"{'escala':<8}{'filas':>10}{'modo':>12}{'tiempo s':>10}{'pico RSS MB':>13}{'sobre base MB':>15}")
+    for escala in args.escalas:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            # El libro solo lleva las hojas por localidad, que son las que se comparan
+            hojas = {nombre: df for nombre, df in generar_hojas(escala).items() if nombre in trozos.HOJAS}
+            filas = sum(len(df) for df in hojas.values())
+            libro = tmp / "Internet.xlsx"
+            escribir_libro(hojas, libro)
+            del hojas
+            modos = {"memoria": (tmp / "memoria", None), "trozos": (tmp / "trozos", args.filas)}
+            for modo, (destino, filas_por_trozo) in modos.items():
+                r = en_proceso_nuevo(libro, destino, filas_por_trozo)
+                print(f"{str(escala) + 'x':<8}{filas:>10}{modo:>12}{r['segundos']:>10.2f}{r['pico_mb']:>13.0f}"
+                      f"{r['pico_mb'] - r['base_mb']:>15.0f}")
+            comparar_salidas(tmp / "memoria", tmp / "trozos")
+    print(f"Salidas idénticas en ambos modos (trozos de {args.filas} filas)")
+
+
+if __name__ == "__main__":
+    main()
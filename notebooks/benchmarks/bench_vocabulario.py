@@ -0,0 +1,82 @@
+"""Memoria y ``groupby`` de las tablas por localidad: nombres como texto frente a códigos.
+
+Para cada tabla limpia con columnas de nombres se compara la memoria en
+pandas con los nombres como ``object`` (lo que devuelve ``pd.read_csv``) y
+como categóricas del vocabulario compartido, y el tiempo de un ``groupby``
+por provincia (y tecnología) y de unir dos datasets por provincia. Verifica
+que ambos caminos den los mismos totales por provincia.
+
+    python -m benchmarks.bench_vocabulario --escala 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+import etl
+import vocabulario
+from benchmarks.sintetico import generar_hojas
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+
+def agrupar(df):
+    claves = [c for c in ("Provincia", "Tecnologia") if c in df.columns]
+    valor = df.select_dtypes("number").columns[-1]
+    return df.groupby(claves, observed=True)[valor].sum()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    hojas = generar_hojas(args.escala)
+    vocab = vocabulario.Vocabulario()
+    texto, codificado = {}, {}
+    for hoja in etl.HOJAS:
+        df = hoja.limpiar(hojas[hoja.nombre].copy())
+        if "Provincia" not in df.columns:
+            continue
+        texto[hoja.archivo] = df
+        codificado[hoja.archivo] = vocab.aplicar(df)
+
+    print(f"{'dataset':<40}{'texto MB':>10}{'códigos MB':>12}{'groupby texto':>15}{'groupby códigos':>17}")
+    for archivo, df in texto.items():
+        cod = codificado[archivo]
+        # Por provincia deben coincidir (las etiquetas son las canónicas: se comparan por clave);
+        # por tecnología el vocabulario además une variantes
+        valor = df.select_dtypes("number").columns[-1]
+        por_texto = df.groupby(vocabulario.claves(df["Provincia"]))[valor].sum()
+        por_codigo = cod.groupby("Provincia", observed=True)[valor].sum()
+        por_codigo.index = vocabulario.claves(por_codigo.index)
+        np.testing.assert_allclose(por_codigo.reindex(por_texto.index).to_numpy(), por_texto.to_numpy())
+        memoria = df.memory_usage(deep=True).sum() / 2**20, cod.memory_usage(deep=True).sum() / 2**20
+        tiempos = medir(lambda: agrupar(df), args.repeticiones), medir(lambda: agrupar(cod), args.repeticiones)
+        print(f"{archivo[:-len('_limpio.csv')]:<40}{memoria[0]:>10.2f}{memoria[1]:>12.2f}"
+              f"{tiempos[0]:>15.2f}{tiempos[1]:>17.2f}")
+
+    # Join entre datasets por provincia: con categorías compartidas no hay que comparar texto
+    izquierda, derecha = "Accesos_tecnologia_localidad_limpio.csv", "Penetracion_hogares_limpio.csv"
+
+    def unir(tablas):
+        por_provincia = tablas[izquierda].groupby("Provincia", observed=True)["Accesos"].sum().reset_index()
+        return tablas[derecha].merge(por_provincia, on="Provincia")
+
+    unido_texto, unido_codigos = unir(texto), unir(codificado)
+    np.testing.assert_allclose(unido_texto["Accesos"].to_numpy(), unido_codigos["Accesos"].to_numpy())
+    print(f"Join {izquierda} x {derecha}: texto {medir(lambda: unir(texto), args.repeticiones):.2f} ms, "
+          f"códigos {medir(lambda: unir(codificado), args.repeticiones):.2f} ms")
+    print(f"Codificar todas las tablas: {medir(lambda: [vocab.aplicar(df) for df in texto.values()], 3):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
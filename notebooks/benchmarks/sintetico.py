@@ -0,0 +1,184 @@
+"""Libro sintético con la misma forma que ``Internet.xlsx`` de ENACOM.
+
+Genera las 15 hojas con sus columnas originales para 24 provincias y los
+trimestres 2014-T1 a 2024-T2. ``escala`` multiplica las filas de las hojas
+a nivel localidad y de velocidades, que son las que dominan el tamaño real.
+Como en el libro original, ``Acc_vel_loc_sinrangos`` trae las provincias en
+mayúsculas y los encabezados corridos una columna (ver
+``etl.ENCABEZADOS_ACC_VEL_LOC``).
+"""
+import numpy as np
+import pandas as pd
+
+PROVINCIAS = [
+    "Buenos Aires", "Capital Federal", "Catamarca", "Chaco", "Chubut", "Córdoba",
+    "Corrientes", "Entre Ríos", "Formosa", "Jujuy", "La Pampa", "La Rioja",
+    "Mendoza", "Misiones", "Neuquén", "Río Negro", "Salta", "San Juan",
+    "San Luis", "Santa Cruz", "Santa Fe", "Santiago Del Estero",
+    "Tierra Del Fuego", "Tucumán",
+]
+# Variantes de escritura como las que aparecen en la hoja original
+TECNOLOGIAS_LOCALIDAD = [
+    "ADSL", "CABLEMODEM", "FIBRA OPTICA", "Fibra óptica", "WIRELESS",
+    "SATELITAL", "DIAL UP", "OTROS", "4G", "3G", "TELEFONIA FIJA", "WIMAX",
+]
+NOMBRES_TRIMESTRE = {1: "Ene-Mar", 2: "Abr-Jun", 3: "Jul-Sept", 4: "Oct-Dic"}
+RANGOS = [
+    "HASTA 512 kbps", "+ 512 Kbps - 1 Mbps", "+ 1 Mbps - 6 Mbps", "+ 6 Mbps - 10 Mbps",
+    "+ 10 Mbps - 20 Mbps", "+ 20 Mbps - 30 Mbps", "+ 30 Mbps", "OTROS",
+]
+RANGOS_TOTALES = [
+    "Hasta 512 kbps", "Entre 512 Kbps y 1 Mbps", "Entre 1 Mbps y 6 Mbps",
+    "Entre 6 Mbps y 10 Mbps", "Entre 10 Mbps y 20 Mbps", "Entre 20 Mbps y 30 Mbps",
+    "Más de 30 Mbps", "OTROS",
+]
+
+
+def periodos(desde=2014, hasta=(2024, 2)):
+    """Lista de (Año, Trimestre) desde ``desde``-T1 hasta ``hasta`` inclusive."""
+    return [
+        (anio, trimestre)
+        for anio in range(desde, hasta[0] + 1)
+        for trimestre in range(1, 5)
+        if (anio, trimestre) <= hasta
+    ]
+
+
+def _por_provincia(periodos_):
+    filas = [(a, t, p) for a, t in reversed(periodos_) for p in PROVINCIAS]
+    return pd.DataFrame(filas, columns=["Año", "Trimestre", "Provincia"])
+
+
+def _totales(periodos_):
+    df = pd.DataFrame(list(reversed(periodos_)), columns=["Año", "Trimestre"])
+    df["Periodo"] = [f"{NOMBRES_TRIMESTRE[t]} {a}" for a, t in zip(df["Año"], df["Trimestre"])]
+    return df
+
+
+def generar_hojas(escala=1, semilla=0, periodos_=None):
+    """Devuelve ``{nombre de hoja: DataFrame}`` con datos sintéticos."""
+    rng = np.random.default_rng(semilla)
+    periodos_ = periodos_ or periodos()
+    hojas = {}
+
+    # Hojas a nivel localidad
+    n_localidades = 300 * escala
+    localidades = pd.DataFrame({
+        "Provincia": rng.choice(PROVINCIAS, n_localidades),
+        "Partido": [f"Partido {i // 8}" for i in range(n_localidades)],
+        "Localidad": [f"Localidad {i}" for i in range(n_localidades)],
+        "link Indec": rng.integers(2_000_000, 94_000_000, n_localidades).astype(float),
+    })
+    localidades.loc[rng.random(n_localidades) < 0.02, "link Indec"] = np.nan
+
+    vel_loc = localidades.loc[localidades.index.repeat(10)].reset_index(drop=True)
+    vel_loc["Velocidad (Mbps)"] = rng.choice([0.5, 1, 3, 6, 10, 20, 30, 50, 100, 300], len(vel_loc))
+    vel_loc["Accesos"] = rng.integers(-5, 5_000, len(vel_loc)).astype(float)
+    vel_loc["Provincia"] = vel_loc["Provincia"].str.upper()
+    # Provincia, Partido, Localidad, link Indec, Velocidad y Accesos bajo los encabezados corridos
+    vel_loc.columns = ["Partido", "Localidad", "link Indec", "Velocidad (Mbps)", "Provincia", "Accesos"]
+    hojas["Acc_vel_loc_sinrangos"] = vel_loc
+
+    tec_loc = localidades.loc[localidades.index.repeat(len(TECNOLOGIAS_LOCALIDAD))].reset_index(drop=True)
+    tec_loc = tec_loc.rename(columns={"link Indec": "Link Indec"})
+    tec_loc.insert(3, "Tecnologia", TECNOLOGIAS_LOCALIDAD * n_localidades)
+    tec_loc["Accesos"] = rng.integers(0, 8_000, len(tec_loc)).astype(float)
+    hojas["Accesos_tecnologia_localidad"] = tec_loc[
+        ["Provincia", "Partido", "Localidad", "Tecnologia", "Link Indec", "Accesos"]
+    ]
+
+    # Velocidades declaradas por provincia y trimestre
+    por_prov = _por_provincia(periodos_)
+    niveles = 18 * escala
+    vel = por_prov.loc[por_prov.index.repeat(niveles)].reset_index(drop=True)
+    vel["Velocidad"] = np.round(rng.lognormal(2.5, 1.2, len(vel)), 2)
+    vel.loc[rng.random(len(vel)) < 0.01, "Velocidad"] = np.nan
+    vel["Accesos"] = rng.integers(1, 200_000, len(vel))
+    hojas["Velocidad_sin_Rangos"] = vel
+
+    # Hojas por provincia y trimestre
+    n = len(por_prov)
+    df = por_prov.copy()
+    df["Mbps (Media de bajada)"] = np.round(rng.uniform(3, 170, n), 2)
+    hojas["Velocidad % por prov"] = df
+
+    df = por_prov.copy()
+    tecnologias = rng.integers(1_000, 1_500_000, (n, 5))
+    df[["ADSL", "Cablemodem", "Fibra óptica", "Wireless", "Otros"]] = tecnologias
+    df["Total"] = tecnologias.sum(axis=1)
+    # Como en el libro real: una nota al pie (sin provincia) y una fila en blanco
+    notas = pd.DataFrame({"Año": ["*", np.nan], "Trimestre": ["Datos provisorios", np.nan]})
+    hojas["Accesos Por Tecnología"] = pd.concat([df, notas], ignore_index=True)
+
+    df = por_prov.copy()
+    df["Accesos por cada 100 hab"] = np.round(rng.uniform(2.7, 52, n), 2)
+    hojas["Penetración-poblacion"] = df
+
+    df = por_prov.copy()
+    df["Accesos por cada 100 hogares"] = np.round(rng.uniform(9.5, 124, n), 2)
+    hojas["Penetracion-hogares"] = df
+
+    df = por_prov.copy()
+    rangos = rng.integers(0, 400_000, (n, len(RANGOS))).astype(float)
+    df[RANGOS] = rangos
+    # Como en el libro original, el total no cuenta los OTROS faltantes
+    df.loc[rng.random(n) < 0.05, "OTROS"] = np.nan
+    df["Total"] = df[RANGOS].sum(axis=1)
+    hojas["Accesos por rangos"] = df
+
+    df = por_prov.copy()
+    df["Banda ancha fija"] = rng.integers(10_000, 5_000_000, n)
+    df["Dial up"] = rng.integers(0, 5_000, n).astype(float)
+    df.loc[rng.random(n) < 0.1, "Dial up"] = np.nan
+    df["Total"] = df["Banda ancha fija"] + df["Dial up"].fillna(0)
+    hojas["Dial-BAf"] = df
+
+    # Hojas de totales nacionales
+    totales = _totales(periodos_)
+    m = len(totales)
+
+    df = totales[["Año", "Trimestre"]].copy()
+    df["Mbps (Media de bajada)"] = np.round(np.linspace(139, 4, m), 2)
+    df["Periodo"] = totales["Periodo"]
+    hojas["Totales VMD"] = df
+
+    df = totales[["Año", "Trimestre"]].copy()
+    tecnologias = rng.integers(50_000, 6_000_000, (m, 5))
+    df[["ADSL", "Cablemodem", "Fibra óptica", "Wireless", "Otros"]] = tecnologias
+    df["Total"] = tecnologias.sum(axis=1)
+    df["Periodo"] = totales["Periodo"]
+    hojas["Totales Accesos Por Tecnología"] = df
+
+    df = totales[["Año", "Trimestre"]].copy()
+    df["Accesos por cada 100 hogares"] = np.round(np.linspace(79, 49, m), 2)
+    df["Accesos por cada 100 hab"] = np.round(np.linspace(24.8, 15, m), 2)
+    df["Periodo"] = totales["Periodo"]
+    hojas["Penetracion-totales"] = df
+
+    df = totales[["Año", "Trimestre"]].copy()
+    rangos = rng.integers(0, 9_000_000, (m, len(RANGOS_TOTALES)))
+    df[RANGOS_TOTALES] = rangos
+    df["Total"] = rangos.sum(axis=1)
+    hojas["Totales Accesos por rango"] = df
+
+    df = totales[["Año", "Trimestre"]].copy()
+    df["Banda ancha fija"] = rng.integers(6_000_000, 11_000_000, m)
+    df["Dial up"] = rng.integers(10_000, 30_000, m)
+    df["Total"] = df["Banda ancha fija"] + df["Dial up"]
+    df["Periodo"] = totales["Periodo"]
+    hojas["Totales Dial-BAf"] = df
+
+    df = totales[["Año", "Trimestre"]].copy()
+    df["Ingresos (miles de pesos)"] = np.round(rng.uniform(2e6, 2.8e8, m), 3)
+    df["Periodo"] = totales["Periodo"]
+    hojas["Ingresos "] = df
+
+    return hojas
+
+
+def escribir_libro(hojas, ruta):
+    """Escribe las hojas en un .xlsx con el mismo orden que el libro original."""
+    with pd.ExcelWriter(ruta, engine="openpyxl") as writer:
+        for nombre, df in hojas.items():
+            df.to_excel(writer, sheet_name=nombre, index=False)
+    return ruta
@@ -0,0 +1,215 @@
+"""Controles de calidad declarativos sobre las hojas limpias.
+
+Cada hoja de ``etl.HOJAS`` declara sus reglas (``Hoja.reglas``) en lugar de
+armar columnas auxiliares y revisarlas a mano como en ``etl.ipynb``:
+
+- ``Suma``: una columna es la suma de otras (``Total`` = rangos o
+  tecnologías), comparando con tolerancia para los reales;
+- ``Rango``: valores dentro de ``[minimo, maximo]`` (``minimo=0`` es la no
+  negatividad);
+- ``Unica``: una sola fila por clave, p. ej. (Año, Trimestre, Provincia);
+- ``Referencia``: los nombres pertenecen a la lista de referencia de su
+  dimensión del vocabulario (``vocabulario.REFERENCIAS``), comparando por
+  clave canónica.
+
+Cada regla devuelve de una vez la máscara de filas que la violan
+(operaciones de columna de numpy/pandas, sin recorrer filas) y ``evaluar``
+resume todas las reglas de una hoja en un reporte compacto: una fila por
+regla violada con la cantidad de filas y algunos ejemplos. Los nulos no
+cuentan como violación (son de la limpieza). Las reglas de ``nivel="error"``
+frenan el ETL (``ErrorCalidad``) antes de escribir la hoja; las de
+``nivel="aviso"`` solo se informan.
+
+Uso::
+
+    python calidad.py Internet.xlsx    # reporte de todas las hojas
+"""
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import vocabulario
+
+COLUMNAS_REPORTE = ["hoja", "regla", "nivel", "filas", "ejemplos"]
+# Filas de ejemplo por regla violada
+EJEMPLOS = 3
+CLAVE = ("Año", "Trimestre", "Provincia")
+
+
+class ErrorCalidad(ValueError):
+    """Una hoja viola reglas de nivel ``"error"``; ``reporte`` trae el detalle."""
+
+    def __init__(self, reporte):
+        self.reporte = reporte
+        super().__init__(f"Controles de calidad fallidos:\n{reporte.to_string(index=False)}")
+
+    def __reduce__(self):
+        # Para volver del pool de procesos con el reporte (y no solo el mensaje)
+        return type(self), (self.reporte,)
+
+
+class Numeros(dict):
+    """Columnas de ``df`` como reales (el texto no numérico queda nulo), convertidas una sola vez.
+
+    Las reglas de una misma hoja comparten la conversión: ``Total`` se usa en
+    la suma y en el rango, pero se convierte una vez.
+    """
+
+    def __init__(self, df):
+        super().__init__()
+        self.df = df
+
+    def __missing__(self, columna):
+        serie = self.df[columna]
+        if not pd.api.types.is_numeric_dtype(serie):
+            serie = pd.to_numeric(serie, errors="coerce")
+        self[columna] = valores = serie.to_numpy(dtype=float, na_value=np.nan)
+        return valores
+
+    def matriz(self, columnas):
+        return np.column_stack([self[c] for c in columnas])
+
+
+@dataclass(frozen=True)
+class Suma:
+    """``total`` es la suma de ``sumandos`` (a menos de ``tolerancia`` absoluta o relativa)."""
+
+    total: str
+    sumandos: tuple
+    tolerancia: float = 0.01
+    relativa: float = 1e-9
+    nivel: str = "error"
+
+    def __str__(self):
+        if len(self.sumandos) > 3:
+            return f"{self.total} = {self.sumandos[0]} + ... + {self.sumandos[-1]} ({len(self.sumandos)} columnas)"
+        return f"{self.total} = {' + '.join(self.sumandos)}"
+
+    def violaciones(self, df, numeros=None):
+        numeros = numeros if numeros is not None else Numeros(df)
+        total = numeros[self.total]
+        suma = numeros.matriz(self.sumandos).sum(axis=1)
+        return np.abs(suma - total) > self.tolerancia + self.relativa * np.abs(total)
+
+
+@dataclass(frozen=True)
+class Rango:
+    """Los valores de ``columnas`` están entre ``minimo`` y ``maximo`` (``None``: sin cota)."""
+
+    columnas: tuple
+    minimo: float = None
+    maximo: float = None
+    nivel: str = "error"
+
+    def __str__(self):
+        cotas = [f"{self.minimo:g} <=" if self.minimo is not None else "",
+                 ", ".join(self.columnas),
+                 f"<= {self.maximo:g}" if self.maximo is not None else ""]
+        return " ".join(c for c in cotas if c)
+
+    def violaciones(self, df, numeros=None):
+        valores = (numeros if numeros is not None else Numeros(df)).matriz(self.columnas)
+        fuera = np.zeros(valores.shape, dtype=bool)
+        if self.minimo is not None:
+            fuera |= valores < self.minimo
+        if self.maximo is not None:
+            fuera |= valores > self.maximo
+        return fuera.any(axis=1)
+
+
+@dataclass(frozen=True)
+class Unica:
+    """Una sola fila por cada valor de ``columnas`` (las claves con nulos no cuentan)."""
+
+    columnas: tuple = CLAVE
+    nivel: str = "error"
+
+    def __str__(self):
+        return f"única ({', '.join(self.columnas)})"
+
+    def violaciones(self, df, numeros=None):
+        columnas = list(self.columnas)
+        return (df.duplicated(columnas, keep=False) & df[columnas].notna().all(axis=1)).to_numpy()
+
+
+@dataclass(frozen=True)
+class Referencia:
+    """Los nombres de ``columna`` están en la referencia de ``dimension`` del vocabulario."""
+
+    columna: str
+    dimension: str = "provincia"
+    nivel: str = "error"
+
+    def __str__(self):
+        return f"{self.columna} en la referencia de {self.dimension}"
+
+    def violaciones(self, df, numeros=None):
+        valores = df[self.columna]
+        presentes = valores.notna().to_numpy()
+        conocidas = vocabulario.claves(valores[presentes]).isin(vocabulario.referencia(self.dimension))
+        fuera = np.zeros(len(df), dtype=bool)
+        fuera[presentes] = ~conocidas
+        return fuera
+
+
+def evaluar(hoja, df):
+    """Reporte de las reglas de ``hoja`` violadas por ``df`` (una fila por regla)."""
+    filas = []
+    numeros = Numeros(df)
+    for regla in hoja.reglas:
+        mascara = regla.violaciones(df, numeros)
+        if mascara.any():
+            filas.append((hoja.nombre.strip(), str(regla), regla.nivel, int(mascara.sum()),
+                          df.index[mascara][:EJEMPLOS].tolist()))
+    return pd.DataFrame(filas, columns=COLUMNAS_REPORTE)
+
+
+def unir(reportes):
+    """Un solo reporte a partir de varios (p. ej. uno por trozo de la misma hoja)."""
+    reportes = [r for r in reportes if len(r)]
+    if not reportes:
+        return pd.DataFrame(columns=COLUMNAS_REPORTE)
+    unido = pd.concat(reportes, ignore_index=True).groupby(["hoja", "regla", "nivel"], sort=False).agg(
+        filas=("filas", "sum"),
+        ejemplos=("ejemplos", lambda ejemplos: sum(ejemplos, [])[:EJEMPLOS]),
+    )
+    return unido.reset_index()[COLUMNAS_REPORTE]
+
+
+def verificar(reporte):
+    """Levanta ``ErrorCalidad`` si el reporte tiene violaciones de nivel ``"error"``; si no, lo devuelve."""
+    errores = reporte[reporte["nivel"] == "error"]
+    if len(errores):
+        raise ErrorCalidad(errores.reset_index(drop=True))
+    return reporte
+
+
+def revisar(hoja, df):
+    """Evalúa las reglas de ``hoja`` y frena ante errores; devuelve el reporte de avisos."""
+    return verificar(evaluar(hoja, df))
+
+
+def evaluar_hojas(pares):
+    """Reporte conjunto de pares ``(Hoja, DataFrame limpio)`` (ver ``etl.iterar_hojas``)."""
+    return unir(evaluar(hoja, df) for hoja, df in pares)
+
+
+def main(argv=None):
+    import etl
+
+    parser = argparse.ArgumentParser(description="Controles de calidad de las hojas limpias")
+    parser.add_argument("libro", nargs="?", default=etl.LIBRO_LOCAL, help="copia local de Internet.xlsx")
+    parser.add_argument("--hojas", nargs="+", help="revisar solo estas hojas")
+    args = parser.parse_args(argv)
+
+    reporte = evaluar_hojas(etl.iterar_hojas(args.libro, args.hojas))
+    if reporte.empty:
+        print("Sin violaciones")
+    else:
+        print(reporte.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Motor de tasas de crecimiento de accesos por tecnología.
+
+Calcula en una sola pasada vectorizada, para todas las columnas a la vez:
+
+- ``qoq``: variación porcentual respecto del trimestre anterior.
+- ``yoy``: variación porcentual respecto del mismo trimestre del año anterior.
+- ``cagr``: crecimiento anual compuesto (%) desde el primer trimestre con
+  accesos de la serie.
+
+Las series se separan por ``Provincia`` (o por la columna que se indique) o
+se suman a totales nacionales con ``por=None``, así el crecimiento nunca se
+calcula cruzando de una provincia a otra. Los datos se ubican en una grilla
+trimestral completa: si falta el trimestre de referencia, la tasa es NaN; si
+la base es 0 (o negativa), la tasa también es NaN en lugar de infinito.
+"""
+import numpy as np
+import pandas as pd
+
+from etl import COLUMNAS_TECNOLOGIA
+
+PERIODO = ["Año", "Trimestre"]
+METRICAS = ("qoq", "yoy", "cagr")
+DESFASES = {"qoq": 1, "yoy": 4}
+
+
+def _variacion(actual, base):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tasa = (actual / base - 1) * 100
+    return np.where(base > 0, tasa, np.nan)
+
+
+def _desfasar(cubo, pasos):
+    base = np.full_like(cubo, np.nan)
+    base[:, pasos:] = cubo[:, :-pasos]
+    return base
+
+
+def _cagr(cubo):
+    positivo = cubo > 0
+    hay_base = positivo.any(axis=1)
+    primero = positivo.argmax(axis=1)
+    base = np.take_along_axis(cubo, primero[:, None, :], axis=1)
+    anios = (np.arange(cubo.shape[1])[None, :, None] - primero[:, None, :]) / 4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tasa = (np.power(cubo / base, 1 / anios) - 1) * 100
+    valido = hay_base[:, None, :] & (anios > 0) & (cubo >= 0)
+    return np.where(valido, tasa, np.nan)
+
+
+def tasas(df, columnas=COLUMNAS_TECNOLOGIA, por="Provincia", metricas=METRICAS):
+    """Tasas de crecimiento de ``columnas`` por grupo y trimestre.
+
+    Devuelve un DataFrame con ``por`` (si se indicó), ``Año``, ``Trimestre``,
+    las columnas originales y una columna ``<columna>_<métrica>`` en
+    porcentaje por cada métrica, ordenado por grupo y período.
+    """
+    columnas = list(columnas)
+    claves = ([por] if por else []) + PERIODO
+    agregado = df.groupby(claves, observed=True, sort=False)[columnas].sum(min_count=1).reset_index()
+
+    periodo = agregado["Año"].astype(int).to_numpy() * 4 + agregado["Trimestre"].astype(int).to_numpy() - 1
+    inicio = periodo.min()
+    posicion = periodo - inicio
+    if por:
+        grupo = pd.factorize(agregado[por], sort=True)[0]
+    else:
+        grupo = np.zeros(len(agregado), dtype=int)
+
+    # Grilla (grupo, trimestre, columna) con NaN en los trimestres faltantes
+    cubo = np.full((grupo.max() + 1, posicion.max() + 1, len(columnas)), np.nan)
+    cubo[grupo, posicion] = agregado[columnas].to_numpy(dtype=float)
+
+    resultado = {}
+    for metrica in metricas:
+        if metrica == "cagr":
+            resultado[metrica] = _cagr(cubo)
+        else:
+            resultado[metrica] = _variacion(cubo, _desfasar(cubo, DESFASES[metrica]))
+
+    salida = agregado[claves + columnas].copy()
+    for metrica, valores in resultado.items():
+        salida[[f"{c}_{metrica}" for c in columnas]] = valores[grupo, posicion]
+    orden = np.lexsort((posicion, grupo))
+    return salida.iloc[orden].reset_index(drop=True)
@@ -0,0 +1,279 @@
+"""Bocetos de cuantiles de ``Velocidad`` por provincia y trimestre.
+
+La hoja ``Velocidad_sin_Rangos`` trae una fila por velocidad declarada. En
+lugar de ordenar todas las filas para cada percentil, el ETL resume la
+columna ``Velocidad`` en un boceto por (Provincia, Año, Trimestre) y lo
+guarda en ``velocidad_bocetos.npz``, junto a los datasets limpios. Un
+segundo juego, ``velocidad_bocetos_accesos.npz``, pesa cada fila por sus
+``Accesos``: es la distribución de velocidades de los accesos, no de las
+filas de la hoja (ver ``distribucion``).
+
+Cada boceto es un histograma de baldes logarítmicos (al estilo DDSketch): el
+valor ``x`` cae en el balde ``k = ceil(log(x) / log(gamma))`` con
+``gamma = (1 + alfa) / (1 - alfa)``, y el cuantil se estima con el centro
+relativo del balde, con un error relativo de a lo sumo ``alfa``. Como un
+boceto son solo conteos por balde:
+
+- se arma en una sola pasada vectorizada (``np.bincount``) y no guarda las
+  filas;
+- dos bocetos se combinan sumando sus conteos, con el mismo resultado que
+  armar uno sobre la unión de las filas (trozos de una hoja, trimestres de
+  una actualización incremental o etapas que corrieron en otros procesos);
+- pasar de provincia × trimestre a provincia o al país es sumar filas de
+  ``conteos`` (``agrupar``).
+
+Con ``--incremental`` (ver ``incremental``) ``velocidad_bocetos.npz`` y
+``velocidad_bocetos_accesos.npz`` son carpetas con un boceto por trimestre
+(``2024-T2.npz``), que ``Bocetos.cargar`` combina al leerlas: incorporar un
+trimestre solo escribe su archivo.
+"""
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import vocabulario
+
+ARCHIVO = "velocidad_bocetos.npz"
+ARCHIVO_ACCESOS = "velocidad_bocetos_accesos.npz"
+ARCHIVO_UMBRALES = "velocidad_umbrales.csv"
+PESOS = "Accesos"
+HOJA = "Velocidad_sin_Rangos"
+COLUMNA = "Velocidad"
+CLAVE = ["Provincia", "Año", "Trimestre"]
+ALFA = 0.01
+# La limpieza descarta las velocidades por encima de este cuantil de la provincia
+Q_ANOMALOS = 0.99
+# Los valores menores (velocidad 0 o negativa) van a un balde aparte
+MINIMO = 1e-3
+
+
+def _gamma(alfa):
+    return (1 + alfa) / (1 - alfa)
+
+
+def _nombre(q):
+    return f"p{q * 100:g}"
+
+
+@dataclass
+class Bocetos:
+    """Un boceto por fila de ``claves``: ``conteos[i, j]`` es el peso del balde ``inicio + j``."""
+
+    claves: pd.DataFrame
+    conteos: np.ndarray
+    ceros: np.ndarray
+    inicio: int = 0
+    alfa: float = ALFA
+
+    @classmethod
+    def construir(cls, df, columna=COLUMNA, por=CLAVE, pesos=None, alfa=ALFA):
+        """Bocetos de ``columna`` por cada grupo de ``por`` (los nulos se ignoran).
+
+        Con ``pesos`` (una columna de ``df``) cada fila cuenta por su peso en
+        lugar de contar uno; los pesos faltantes o no numéricos cuentan cero.
+        """
+        df = df[df[columna].notna()]
+        grupos = df.groupby(list(por), sort=True, dropna=False)
+        claves = grupos.size().index.to_frame(index=False)
+        grupo = grupos.ngroup().to_numpy()
+        valores = df[columna].to_numpy(dtype=float)
+        if pesos is None:
+            peso = np.ones(len(df))
+        else:
+            peso = pd.to_numeric(df[pesos], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+        positivos = valores > MINIMO
+        indices = np.ceil(np.log(valores[positivos]) / np.log(_gamma(alfa))).astype(np.int64)
+        inicio = int(indices.min()) if len(indices) else 0
+        ancho = int(indices.max()) - inicio + 1 if len(indices) else 0
+        conteos = np.bincount(
+            grupo[positivos] * ancho + (indices - inicio),
+            weights=peso[positivos],
+            minlength=len(claves) * ancho,
+        ).reshape(len(claves), ancho)
+        ceros = np.bincount(grupo[~positivos], weights=peso[~positivos], minlength=len(claves))
+        return cls(claves, conteos, ceros, inicio, alfa)
+
+    @property
+    def totales(self):
+        return self.conteos.sum(axis=1) + self.ceros
+
+    def _centros(self):
+        gamma = _gamma(self.alfa)
+        return 2 * gamma ** (self.inicio + np.arange(self.conteos.shape[1])) / (gamma + 1)
+
+    def _balde(self, valores):
+        """Posición en ``conteos`` del balde de cada valor (> ``MINIMO``)."""
+        return np.ceil(np.log(valores) / np.log(_gamma(self.alfa))).astype(np.int64) - self.inicio
+
+    def media(self):
+        """Media estimada de cada boceto (con el centro de cada balde: error relativo de a lo sumo ``alfa``)."""
+        totales = self.totales
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(totales > 0, self.conteos @ self._centros() / totales, np.nan)
+
+    def fraccion_desde(self, valor):
+        """Fracción del peso de cada boceto en el balde de ``valor`` o por encima."""
+        desde = min(max(int(self._balde(np.asarray(valor, dtype=float))), 0), self.conteos.shape[1])
+        totales = self.totales
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(totales > 0, self.conteos[:, desde:].sum(axis=1) / totales, np.nan)
+
+    def recortar(self, maximos):
+        """Bocetos sin los baldes por encima de ``maximos`` (un valor por fila de ``claves``; NaN: sin recorte).
+
+        Con un borde de balde (p. ej. ``umbral``) es lo mismo que descartar
+        antes las filas con valores mayores.
+        """
+        maximos = np.asarray(maximos, dtype=float)
+        ultimo = np.full(len(maximos), np.iinfo(np.int64).max)
+        con_maximo = maximos > MINIMO
+        # El borde de un balde es una potencia exacta de gamma: se redondea en vez de ir al balde siguiente
+        ultimo[con_maximo] = np.rint(np.log(maximos[con_maximo]) / np.log(_gamma(self.alfa))).astype(np.int64)
+        ultimo[con_maximo] -= self.inicio
+        ultimo[~con_maximo & ~np.isnan(maximos)] = -1
+        baldes = np.arange(self.conteos.shape[1])
+        conteos = np.where(baldes[None, :] <= ultimo[:, None], self.conteos, 0.0)
+        return Bocetos(self.claves, conteos, self.ceros, self.inicio, self.alfa)
+
+    def _extender(self, inicio, ancho):
+        """``conteos`` llevados a los baldes ``[inicio, inicio + ancho)``."""
+        conteos = np.zeros((len(self.conteos), ancho))
+        desde = self.inicio - inicio
+        conteos[:, desde:desde + self.conteos.shape[1]] = self.conteos
+        return conteos
+
+    def filtrar(self, filas):
+        """Bocetos de las filas de ``claves`` marcadas en la máscara ``filas``."""
+        filas = np.asarray(filas, dtype=bool)
+        return Bocetos(self.claves[filas].reset_index(drop=True), self.conteos[filas], self.ceros[filas],
+                       self.inicio, self.alfa)
+
+    def agrupar(self, por=()):
+        """Bocetos combinados por ``por`` (un subconjunto de las claves; vacío: uno solo)."""
+        por = list(por)
+        if por:
+            grupo = self.claves.groupby(por, sort=True, dropna=False).ngroup().to_numpy()
+        else:
+            grupo = np.zeros(len(self.claves), dtype=np.int64)
+        orden = np.argsort(grupo, kind="stable")
+        cortes = np.flatnonzero(np.r_[True, np.diff(grupo[orden]) != 0]) if len(orden) else orden
+        claves = self.claves.iloc[orden[cortes]][por].reset_index(drop=True)
+        if len(cortes) == len(orden):
+            # Cada grupo ya es un solo boceto: solo se reordena
+            return Bocetos(claves, self.conteos[orden], self.ceros[orden], self.inicio, self.alfa)
+        return Bocetos(
+            claves=claves,
+            conteos=np.add.reduceat(self.conteos[orden], cortes, axis=0),
+            ceros=np.add.reduceat(self.ceros[orden], cortes),
+            inicio=self.inicio,
+            alfa=self.alfa,
+        )
+
+    def _valores(self, acumulado, rango, superior):
+        """Valor estimado del elemento de posición ``rango`` (ya entera) de cada boceto."""
+        gamma = _gamma(self.alfa)
+        balde = (acumulado <= rango[:, None]).sum(axis=1)
+        borde = gamma ** (self.inicio + np.minimum(balde, max(self.conteos.shape[1] - 1, 0)))
+        valor = borde if superior else 2 * borde / (gamma + 1)
+        return np.where(rango < self.ceros, 0.0, valor)
+
+    def cuantiles(self, qs=(0.5, 0.99), superior=False):
+        """Cuantiles estimados de cada boceto: las claves y una columna ``p<q>`` por cada ``q``.
+
+        Como ``pd.Series.quantile``, el cuantil ``q`` interpola entre los
+        elementos vecinos a la posición ``q * (n - 1)``. Con ``superior=True``
+        se devuelve el borde superior del balde del elemento anterior a esa
+        posición, sin interpolar: un umbral que deja pasar todo su balde.
+        """
+        totales = self.totales
+        ultimo = np.maximum(totales - 1, 0)
+        acumulado = np.cumsum(self.conteos, axis=1) + self.ceros[:, None]
+        resultado = self.claves.copy()
+        for q in qs:
+            bajo = np.floor(q * ultimo)
+            valor = self._valores(acumulado, bajo, superior)
+            if not superior:
+                alto = self._valores(acumulado, np.minimum(bajo + 1, ultimo), superior)
+                valor = valor + (q * ultimo - bajo) * (alto - valor)
+            resultado[_nombre(q)] = np.where(totales > 0, valor, np.nan)
+        return resultado
+
+    def umbral(self, q, por):
+        """Borde superior del cuantil ``q`` de cada grupo de ``por``, como ``Series`` indexada por grupo."""
+        umbrales = self.agrupar(por).cuantiles([q], superior=True)
+        return umbrales.set_index(list(por))[_nombre(q)]
+
+    def guardar(self, ruta):
+        if Path(ruta).is_dir():
+            # Los bocetos por trimestre del modo incremental pasan a un solo archivo
+            shutil.rmtree(ruta)
+        # Las claves de texto se guardan como texto de numpy, para leerlas sin pickle
+        columnas = {
+            f"clave_{i}": serie.to_numpy(dtype=str) if serie.dtype == object else serie.to_numpy()
+            for i, (_, serie) in enumerate(self.claves.items())
+        }
+        np.savez_compressed(ruta, por=np.asarray(self.claves.columns, dtype=str), conteos=self.conteos,
+                            ceros=self.ceros, inicio=self.inicio, alfa=self.alfa, **columnas)
+        return Path(ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Bocetos guardados en ``ruta``; de una carpeta, los de todos sus archivos combinados."""
+        if Path(ruta).is_dir():
+            return combinar(cls.cargar(parte) for parte in sorted(Path(ruta).glob("*.npz")))
+        with np.load(ruta, allow_pickle=False) as arreglos:
+            claves = pd.DataFrame({c: arreglos[f"clave_{i}"] for i, c in enumerate(arreglos["por"])})
+            return cls(claves, arreglos["conteos"], arreglos["ceros"], int(arreglos["inicio"]),
+                       float(arreglos["alfa"]))
+
+
+def combinar(bocetos):
+    """Une bocetos con las mismas columnas de clave, sumando los de claves repetidas."""
+    bocetos = list(bocetos)
+    if not bocetos:
+        raise ValueError("No hay bocetos para combinar")
+    alfas = {b.alfa for b in bocetos}
+    if len(alfas) > 1:
+        raise ValueError(f"No se pueden combinar bocetos con distinto alfa: {sorted(alfas)}")
+    con_baldes = [b for b in bocetos if b.conteos.shape[1]] or bocetos[:1]
+    inicio = min(b.inicio for b in con_baldes)
+    ancho = max(b.inicio + b.conteos.shape[1] for b in con_baldes) - inicio
+    unidos = Bocetos(
+        claves=pd.concat([b.claves for b in bocetos], ignore_index=True),
+        conteos=np.concatenate([b._extender(inicio, ancho) for b in bocetos]),
+        ceros=np.concatenate([b.ceros for b in bocetos]),
+        inicio=inicio,
+        alfa=alfas.pop(),
+    )
+    return unidos.agrupar(list(unidos.claves.columns))
+
+
+def escribir_umbrales(destino, bocetos, por, agregar=False):
+    """Guarda el umbral de anómalos que usó la limpieza para cada boceto, calculado por grupos de ``por``.
+
+    Con ``agregar=True`` las filas se suman al final del archivo existente.
+    """
+    umbral = bocetos.umbral(Q_ANOMALOS, por).rename("umbral")
+    tabla = bocetos.claves.join(umbral, on=list(por))
+    tabla.to_csv(Path(destino) / ARCHIVO_UMBRALES, index=False, mode="a" if agregar else "w", header=not agregar)
+    return tabla
+
+
+def escribir(destino, df):
+    """Bocetos de ``Velocidad`` de la hoja cruda (por fila y por accesos), guardados en ``destino``.
+
+    Las provincias se llevan a su etiqueta canónica del vocabulario, la misma
+    de los datasets limpios. Devuelve los bocetos por fila, que fijan el
+    umbral de la limpieza (el p99 de cada provincia sobre todos los
+    trimestres, guardado en ``velocidad_umbrales.csv``).
+    """
+    df = df.assign(Provincia=vocabulario.canonizar("provincia", df["Provincia"]))
+    bocetos = Bocetos.construir(df)
+    bocetos.guardar(Path(destino) / ARCHIVO)
+    Bocetos.construir(df, pesos=PESOS).guardar(Path(destino) / ARCHIVO_ACCESOS)
+    escribir_umbrales(destino, bocetos, ["Provincia"])
+    return bocetos
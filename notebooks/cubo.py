@@ -0,0 +1,204 @@
+"""Cubo OLAP preagregado sobre ``Accesos_tecnologia_localidad``.
+
+Suma los accesos una sola vez en todos los niveles de la jerarquía
+(país → provincia → partido → localidad) × tecnología normalizada, y los
+guarda en ``cubo_tecnologia_localidad.npz``:
+
+- Cada nivel guarda sus nombres una sola vez (codificación por diccionario):
+  el código de un elemento es su posición en el arreglo de nombres.
+- Los hijos de cada elemento son contiguos, así que la jerarquía se guarda
+  como desplazamientos (``partido_inicio``, ``localidad_inicio``) y bajar o
+  subir de nivel es un recorte de arreglo, sin recorrer la tabla original.
+- Las tecnologías se agrupan por su clave de ``vocabulario`` (minúsculas,
+  sin espacios ni acentos, como en ``eda.ipynb``), así "FIBRA OPTICA" y
+  "Fibra óptica" suman juntas, y se guardan con su etiqueta: la del
+  vocabulario cuando el dataset ya viene codificado por el ETL (si no, la
+  primera variante de cada clave).
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import vocabulario
+
+ARCHIVO = "cubo_tecnologia_localidad.npz"
+ORIGEN = "Accesos_tecnologia_localidad_limpio.csv"
+JERARQUIA = ["Provincia", "Partido", "Localidad"]
+
+
+def _codigos_texto(serie):
+    """Códigos de ``serie`` y el texto de cada código (los nulos cuentan como ``"nan"``)."""
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+    return codigos, np.asarray(pd.Index(unicos).astype(str), dtype=object)
+
+
+def _inicios(codigos, cantidad):
+    """Desplazamientos de cada bloque contiguo de ``codigos`` (longitud ``cantidad + 1``)."""
+    return np.searchsorted(codigos, np.arange(cantidad + 1))
+
+
+@dataclass
+class Cubo:
+    """Accesos por tecnología en cada nivel de la jerarquía geográfica."""
+
+    tecnologias: np.ndarray
+    provincias: np.ndarray
+    partidos: np.ndarray
+    localidades: np.ndarray
+    partido_inicio: np.ndarray     # partidos de la provincia i: [partido_inicio[i], partido_inicio[i + 1])
+    localidad_inicio: np.ndarray   # localidades del partido j: [localidad_inicio[j], localidad_inicio[j + 1])
+    por_provincia: np.ndarray
+    por_partido: np.ndarray
+    por_localidad: np.ndarray
+    _codigos: dict = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def construir(cls, df):
+        """Agrega el dataset limpio de accesos por tecnología y localidad."""
+        # Cada nivel como código con el orden alfabético de su nombre, sin pasar la tabla a texto
+        rangos, nombres = [], []
+        for columna in JERARQUIA:
+            codigos, etiquetas = _codigos_texto(df[columna])
+            ordenadas, rango = np.unique(etiquetas, return_inverse=True)
+            rangos.append(rango[codigos])
+            nombres.append(ordenadas)
+        tamanios = [len(n) for n in nombres]
+        clave = (rangos[0] * tamanios[1] + rangos[1]) * tamanios[2] + rangos[2]
+        # Localidades ordenadas por (provincia, partido, localidad), como groupby(sort=True)
+        claves_loc, localidad = np.unique(clave, return_inverse=True)
+        provincia_loc, resto = np.divmod(claves_loc, tamanios[1] * tamanios[2])
+        partido_loc, localidad_loc = np.divmod(resto, tamanios[2])
+
+        # La tecnología se normaliza sobre los valores únicos, no fila por fila
+        crudo, unicos = _codigos_texto(df["Tecnologia"])
+        claves_tecnologia = vocabulario.claves(unicos)
+        tecnologia, tecnologias = pd.factorize(claves_tecnologia[crudo], sort=True)
+        etiquetas = pd.Series([" ".join(nombre.split()) for nombre in unicos]).groupby(claves_tecnologia).first()
+
+        n_loc, n_tec = len(claves_loc), len(tecnologias)
+        accesos = np.bincount(
+            localidad * n_tec + tecnologia,
+            weights=df["Accesos"].to_numpy(dtype=float),
+            minlength=n_loc * n_tec,
+        ).reshape(n_loc, n_tec)
+
+        # Las localidades quedan ordenadas por (provincia, partido): cada nivel
+        # superior es una suma por bloques contiguos del nivel inferior
+        provincias, provincia_loc = np.unique(provincia_loc, return_inverse=True)
+        claves_partido, partido_loc = np.unique(claves_loc // tamanios[2], return_inverse=True)
+        localidad_inicio = _inicios(partido_loc, len(claves_partido))
+        provincia_partido = provincia_loc[localidad_inicio[:-1]]
+
+        por_partido = np.add.reduceat(accesos, localidad_inicio[:-1], axis=0)
+        partido_inicio = _inicios(provincia_partido, len(provincias))
+        por_provincia = np.add.reduceat(por_partido, partido_inicio[:-1], axis=0)
+
+        return cls(
+            tecnologias=np.asarray(etiquetas[tecnologias], dtype=str),
+            provincias=np.asarray(nombres[0][provincias], dtype=str),
+            partidos=np.asarray(nombres[1][claves_partido % tamanios[1]], dtype=str),
+            localidades=np.asarray(nombres[2][localidad_loc], dtype=str),
+            partido_inicio=partido_inicio,
+            localidad_inicio=localidad_inicio,
+            por_provincia=por_provincia,
+            por_partido=por_partido,
+            por_localidad=accesos,
+        )
+
+    def guardar(self, ruta):
+        campos = {k: v for k, v in vars(self).items() if not k.startswith("_")}
+        np.savez_compressed(ruta, **campos)
+        return Path(ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta, allow_pickle=False) as arreglos:
+            return cls(**{nombre: arreglos[nombre] for nombre in arreglos.files})
+
+    def _codigo(self, provincia=None, partido=None, localidad=None):
+        """Posición del elemento nombrado en su nivel: ``(nivel, código)``."""
+        if self._codigos is None:
+            provincia_partido = np.repeat(np.arange(len(self.provincias)), np.diff(self.partido_inicio))
+            partido_localidad = np.repeat(np.arange(len(self.partidos)), np.diff(self.localidad_inicio))
+            self._codigos = {
+                "provincia": {nombre: i for i, nombre in enumerate(self.provincias)},
+                "partido": {(p, nombre): i for i, (p, nombre) in enumerate(zip(provincia_partido, self.partidos))},
+                "localidad": {(p, nombre): i for i, (p, nombre) in enumerate(zip(partido_localidad, self.localidades))},
+            }
+        if localidad is not None and partido is None:
+            raise ValueError("Para consultar una localidad hay que indicar su partido")
+        if provincia is None:
+            if partido is not None:
+                raise ValueError("Para consultar un partido hay que indicar su provincia")
+            return "pais", None
+        codigo = self._codigos["provincia"].get(provincia)
+        if codigo is None:
+            raise KeyError(f"Provincia desconocida: {provincia!r}")
+        for nivel, nombre in (("partido", partido), ("localidad", localidad)):
+            if nombre is None:
+                return ("provincia" if nivel == "partido" else "partido"), codigo
+            siguiente = self._codigos[nivel].get((codigo, nombre))
+            if siguiente is None:
+                raise KeyError(f"{nivel.capitalize()} desconocido: {nombre!r}")
+            codigo = siguiente
+        return "localidad", codigo
+
+    def total(self, provincia=None, partido=None, localidad=None):
+        """Accesos por tecnología del elemento indicado (sin argumentos: el país)."""
+        nivel, codigo = self._codigo(provincia, partido, localidad)
+        if nivel == "pais":
+            valores = self.por_provincia.sum(axis=0)
+        else:
+            valores = getattr(self, f"por_{nivel}")[codigo]
+        return pd.Series(valores, index=self.tecnologias, name="Accesos")
+
+    def consultar(self, provincia=None, partido=None):
+        """Desglose un nivel más abajo: provincias, partidos de una provincia o
+        localidades de un partido, con una columna por tecnología."""
+        nivel, codigo = self._codigo(provincia, partido)
+        if nivel == "pais":
+            nombres, valores, columna = self.provincias, self.por_provincia, "Provincia"
+        elif nivel == "provincia":
+            desde, hasta = self.partido_inicio[codigo], self.partido_inicio[codigo + 1]
+            nombres, valores, columna = self.partidos[desde:hasta], self.por_partido[desde:hasta], "Partido"
+        else:
+            desde, hasta = self.localidad_inicio[codigo], self.localidad_inicio[codigo + 1]
+            nombres, valores, columna = self.localidades[desde:hasta], self.por_localidad[desde:hasta], "Localidad"
+        return pd.DataFrame(valores, index=pd.Index(nombres, name=columna), columns=self.tecnologias)
+
+
+def agregar(df):
+    """Accesos por localidad y tecnología: un agregado parcial que se puede volver a sumar."""
+    return df.groupby(JERARQUIA + ["Tecnologia"], observed=True, sort=False, dropna=False)["Accesos"].sum()
+
+
+def _leer_por_trozos(carpeta, filas_por_trozo):
+    columnas = JERARQUIA + ["Tecnologia", "Accesos"]
+    parquet = almacen.ruta_parquet(ORIGEN, carpeta)
+    if parquet.exists():
+        for lote in almacen.dataset(parquet).to_batches(batch_size=filas_por_trozo, columns=columnas):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(Path(carpeta) / ORIGEN, usecols=columnas, chunksize=filas_por_trozo)
+
+
+def materializar(carpeta=".", destino=None, filas_por_trozo=None):
+    """Construye el cubo a partir del dataset limpio y lo guarda en ``destino``.
+
+    Con ``filas_por_trozo`` el dataset se lee de a trozos y se suman sus
+    agregados parciales, sin tener nunca la tabla entera en memoria.
+    """
+    destino = Path(destino or carpeta)
+    if filas_por_trozo:
+        df = None
+        for trozo in _leer_por_trozos(carpeta, filas_por_trozo):
+            # Lo acumulado tiene una fila por localidad y tecnología: no crece con las filas leídas
+            df = agregar(trozo if df is None else pd.concat([df, trozo], ignore_index=True)).reset_index()
+    else:
+        df = almacen.leer(ORIGEN, columnas=JERARQUIA + ["Tecnologia", "Accesos"], carpeta=carpeta)
+    cubo = Cubo.construir(df)
+    cubo.guardar(destino / ARCHIVO)
+    return cubo
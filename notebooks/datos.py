@@ -0,0 +1,151 @@
+"""Capa de acceso a datos compartida por el dashboard.
+
+Cada dataset limpio se carga una sola vez por proceso y queda en un almacén
+en memoria compartido por todas las sesiones (al estilo de
+``st.cache_resource``): los aciertos devuelven el mismo DataFrame, sin
+volver a parsear ni copiar. En cada acceso se compara la fecha de
+modificación y el tamaño del archivo en disco, y si cambió se vuelve a cargar.
+
+Los DataFrames devueltos son compartidos y de solo lectura: quien necesite
+modificarlos debe trabajar sobre una copia (``.copy()``) o sobre el resultado
+de operaciones que devuelven un DataFrame nuevo (filtros, ``sort_values``...).
+"""
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import almacen
+import cubo
+import cuantiles
+import tensor
+import traza
+
+# Datasets que usa cada sección del dashboard
+SECCIONES = {
+    "Penetración del Servicio": [
+        "Penetracion_totales_limpio.csv",
+        tensor.ARCHIVO,
+    ],
+    "Calidad y Velocidad del Servicio": [
+        "velocidad_distribucion.csv",
+        tensor.ARCHIVO,
+    ],
+    "Tecnologías de Conexión": [
+        "Totales_Accesos_Por_Tecnologia_limpio.csv",
+        cubo.ARCHIVO,
+    ],
+    "KPI's": [
+        "kpis.csv",
+        "pronosticos.csv",
+    ],
+}
+
+# Artefactos que no son tablas se cargan con su propio lector
+CARGADORES = {
+    cubo.ARCHIVO: cubo.Cubo.cargar,
+    cuantiles.ARCHIVO: cuantiles.Bocetos.cargar,
+    # Mapeado en memoria: los procesos del dashboard comparten la caché de páginas
+    tensor.ARCHIVO: tensor.Tensor.cargar,
+}
+
+_cache = {}
+_bloqueos = defaultdict(threading.Lock)
+_bloqueo_global = threading.Lock()
+_estadisticas = {"aciertos": 0, "cargas": 0, "segundos_carga": 0.0}
+_precarga = None
+
+
+def _firma(archivo, carpeta):
+    """Identifica la versión en disco: (ruta, mtime en ns, tamaño)."""
+    for ruta in (almacen.ruta_parquet(archivo, carpeta), Path(carpeta) / archivo):
+        try:
+            mtime, tamanio = almacen.estado(ruta)
+        except FileNotFoundError:
+            continue
+        return str(ruta), mtime, tamanio
+    raise FileNotFoundError(Path(carpeta) / archivo)
+
+
+def version(archivo, carpeta="."):
+    """Versión en disco de ``archivo``; cambia cuando el ETL lo reescribe."""
+    return _firma(archivo, carpeta)
+
+
+def _bloqueo(clave):
+    with _bloqueo_global:
+        return _bloqueos[clave]
+
+
+def obtener(archivo, carpeta="."):
+    """Devuelve el dataset limpio ``archivo``, cargándolo solo si hace falta.
+
+    Los archivos de ``CARGADORES`` (p. ej. el cubo de ``cubo``) se leen con su
+    propio lector; el resto, con ``almacen.leer``.
+    """
+    clave = (str(Path(carpeta).resolve()), archivo)
+    firma = _firma(archivo, carpeta)
+    entrada = _cache.get(clave)
+    if entrada is not None and entrada[0] == firma:
+        _estadisticas["aciertos"] += 1
+        return entrada[1]
+
+    with _bloqueo(clave):
+        # Otra sesión pudo haberlo cargado mientras esperábamos
+        entrada = _cache.get(clave)
+        if entrada is not None and entrada[0] == firma:
+            _estadisticas["aciertos"] += 1
+            return entrada[1]
+        inicio = time.perf_counter()
+        with traza.tramo(f"cargar:{archivo}", "datos") as tramo:
+            if archivo in CARGADORES:
+                df = CARGADORES[archivo](Path(carpeta) / archivo)
+            else:
+                df = almacen.leer(archivo, carpeta=carpeta)
+            tramo.anotar(filas=traza.filas(df))
+        _estadisticas["segundos_carga"] += time.perf_counter() - inicio
+        _estadisticas["cargas"] += 1
+        _cache[clave] = (firma, df)
+        return df
+
+
+def precargar(archivos=None, carpeta=".", en_segundo_plano=False):
+    """Carga de antemano ``archivos`` (por defecto, todos los del dashboard).
+
+    Con ``en_segundo_plano=True`` la carga corre en un hilo y la función
+    vuelve enseguida; solo se lanza una precarga por proceso.
+    """
+    global _precarga
+    if archivos is None:
+        archivos = sorted({a for lista in SECCIONES.values() for a in lista})
+
+    def cargar():
+        for archivo in archivos:
+            try:
+                obtener(archivo, carpeta)
+            except FileNotFoundError:
+                pass
+
+    if not en_segundo_plano:
+        cargar()
+        return None
+    with _bloqueo_global:
+        if _precarga is None:
+            _precarga = threading.Thread(target=cargar, name="precarga-datos", daemon=True)
+            _precarga.start()
+    return _precarga
+
+
+def invalidar(archivo=None):
+    """Descarta un dataset del almacén (o todos) para forzar su recarga."""
+    with _bloqueo_global:
+        if archivo is None:
+            _cache.clear()
+        else:
+            for clave in [c for c in _cache if c[1] == archivo]:
+                del _cache[clave]
+
+
+def estadisticas():
+    """Aciertos, cargas y tiempo total de carga desde que arrancó el proceso."""
+    return dict(_estadisticas, en_memoria=len(_cache))
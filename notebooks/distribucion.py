@@ -0,0 +1,150 @@
+"""Distribución de velocidades ponderada por accesos, por provincia y trimestre.
+
+Cada fila de ``Velocidad_sin_Rangos`` es una velocidad declarada con sus
+``Accesos``: el promedio de las filas (``velocidad_promedio`` del dataset
+limpio) cuenta igual una velocidad con 3 accesos que una con 200.000, y el
+promedio simple de las provincias cuenta igual Tierra del Fuego que Buenos
+Aires. Este módulo precalcula las cifras por acceso, para que el dashboard
+y los KPIs solo tengan que buscar filas.
+
+Parte de los bocetos de ``cuantiles``: ``velocidad_bocetos_accesos.npz`` es
+un histograma de baldes logarítmicos por (Provincia, Año, Trimestre) donde
+cada velocidad pesa sus accesos. Se le aplica el mismo filtro de anómalos
+que a la hoja limpia, con los umbrales que usó la limpieza y que guarda
+``velocidad_umbrales.csv``: el percentil 99 de la provincia en el ETL
+completo, el de la provincia en cada trimestre con ``--incremental``. Un
+umbral es un borde de balde, así que recortar el histograma equivale a
+descartar las filas, y de ahí salen, para todos los grupos a la vez y sin
+volver a leer las filas:
+
+- ``accesos``, ``media`` y los percentiles ``p10``, ``p50``, ``p90`` y
+  ``p99`` de la velocidad de los accesos (error relativo de a lo sumo
+  ``cuantiles.ALFA``);
+- ``desde_<u>``: porcentaje de accesos con ``u`` Mbps o más (el balde de
+  ``u`` cuenta entero);
+- ``rangos_desde_<u>``: lo mismo según ``Accesos por rangos``, sobre los
+  accesos de velocidad conocida (sin ``OTROS``);
+- ``mbps``: la velocidad media de bajada de ``Velocidad % por prov``; en la
+  fila ``"Total nacional"``, el promedio de las provincias ponderado por sus
+  accesos (``Total`` de ``Accesos por rangos``), que es el denominador del
+  IVR (ver ``kpis``).
+
+Las filas ``"Total nacional"`` combinan los bocetos de todas las provincias
+del trimestre. La tabla se escribe en ``velocidad_distribucion.csv`` (y/o
+``.parquet``) como etapa derivada del ETL.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import cuantiles
+import etl
+
+ARCHIVO = "velocidad_distribucion.csv"
+# Datasets limpios de los que sale la tabla (los bocetos se escriben con el de velocidades)
+ORIGENES = ("velocidad_sin_rangos_limpio.csv", "accesos_por_rangos_limpio.csv", "Velocidad_por_provincia_limpio.csv")
+TOTAL_NACIONAL = "Total nacional"
+CLAVES = ["Año", "Trimestre", "Provincia"]
+PERCENTILES = (0.1, 0.5, 0.9, 0.99)
+# Mbps
+UMBRALES = (10, 30, 100)
+# Rangos de "Accesos por rangos" que empiezan en cada umbral o más arriba
+RANGOS_DESDE = {
+    10: ["+_10_Mbps_-_20_Mbps", "+_20_Mbps_-_30_Mbps", "+_30_Mbps"],
+    30: ["+_30_Mbps"],
+}
+VELOCIDAD = "Mbps (Media de bajada)"
+
+
+def _claves(df):
+    df["Año"] = df["Año"].astype(int)
+    df["Trimestre"] = df["Trimestre"].astype(int)
+    df["Provincia"] = df["Provincia"].astype(str)
+    return df
+
+
+def bocetos_por_acceso(carpeta="."):
+    """Bocetos por accesos de ``carpeta`` sin los valores por encima del umbral que usó la limpieza."""
+    carpeta = Path(carpeta)
+    por_acceso = cuantiles.Bocetos.cargar(carpeta / cuantiles.ARCHIVO_ACCESOS)
+    umbrales = pd.read_csv(carpeta / cuantiles.ARCHIVO_UMBRALES)
+    umbral = por_acceso.claves.merge(umbrales, on=cuantiles.CLAVE, how="left", validate="one_to_one")["umbral"]
+    return por_acceso.recortar(umbral.to_numpy(dtype=float))
+
+
+def estadisticos(bocetos):
+    """Claves de cada boceto con sus accesos, media, percentiles y porcentaje de accesos desde cada umbral."""
+    tabla = bocetos.cuantiles(PERCENTILES)
+    posicion = len(bocetos.claves.columns)
+    tabla.insert(posicion, "accesos", bocetos.totales)
+    tabla.insert(posicion + 1, "media", bocetos.media())
+    for umbral in UMBRALES:
+        tabla[f"desde_{umbral}"] = bocetos.fraccion_desde(umbral) * 100
+    return tabla
+
+
+def porcentajes_rangos(rangos):
+    """Porcentaje de los accesos de velocidad conocida en los rangos desde cada umbral, con el total nacional."""
+    columnas = sorted({c for lista in RANGOS_DESDE.values() for c in lista})
+    df = rangos[CLAVES + columnas].copy()
+    df["_conocidos"] = rangos["Total"] - rangos["OTROS"].fillna(0)
+    nacional = df.groupby(["Año", "Trimestre"], as_index=False)[columnas + ["_conocidos"]].sum(min_count=1)
+    df = pd.concat([_claves(df), _claves(nacional.assign(Provincia=TOTAL_NACIONAL))], ignore_index=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for umbral, lista in RANGOS_DESDE.items():
+            df[f"rangos_desde_{umbral}"] = df[lista].sum(axis=1, min_count=1) / df["_conocidos"] * 100
+    return df[CLAVES + [f"rangos_desde_{u}" for u in RANGOS_DESDE]]
+
+
+def velocidad_ponderada(velocidad, pesos):
+    """``mbps`` de cada provincia y, por trimestre, su promedio ponderado por ``pesos`` (``Total nacional``)."""
+    df = _claves(velocidad[CLAVES + [VELOCIDAD]].rename(columns={VELOCIDAD: "mbps"}))
+    df = df.merge(pesos, on=CLAVES, how="left")
+    validos = df["mbps"].notna() & df["_peso"].notna()
+    df["_ponderado"] = (df["mbps"] * df["_peso"]).where(validos)
+    df["_peso"] = df["_peso"].where(validos)
+    nacional = df.groupby(["Año", "Trimestre"], as_index=False)[["_ponderado", "_peso"]].sum(min_count=1)
+    nacional["mbps"] = nacional["_ponderado"] / nacional["_peso"]
+    nacional = _claves(nacional.assign(Provincia=TOTAL_NACIONAL))
+    return pd.concat([df[CLAVES + ["mbps"]], nacional[CLAVES + ["mbps"]]], ignore_index=True)
+
+
+def calcular(carpeta="."):
+    """Tabla de distribución de velocidades desde los bocetos y los datasets limpios de ``carpeta``."""
+    leer = lambda archivo: almacen.leer(archivo, carpeta=carpeta)
+    por_acceso = bocetos_por_acceso(carpeta)
+    distribucion = pd.concat([
+        estadisticos(por_acceso),
+        estadisticos(por_acceso.agrupar(["Año", "Trimestre"])).assign(Provincia=TOTAL_NACIONAL),
+    ], ignore_index=True)
+    distribucion = _claves(distribucion[CLAVES + [c for c in distribucion.columns if c not in CLAVES]])
+
+    rangos = _claves(leer("accesos_por_rangos_limpio.csv"))
+    # Los accesos de cada provincia pesan su velocidad media; sin rangos, los de Velocidad_sin_Rangos
+    pesos = rangos[CLAVES + ["Total"]].rename(columns={"Total": "_peso"}).merge(
+        distribucion[CLAVES + ["accesos"]], on=CLAVES, how="outer")
+    pesos["_peso"] = pesos["_peso"].fillna(pesos.pop("accesos"))
+
+    tabla = distribucion
+    for parte in (porcentajes_rangos(rangos), velocidad_ponderada(leer("Velocidad_por_provincia_limpio.csv"), pesos)):
+        tabla = tabla.merge(parte, on=CLAVES, how="outer")
+    orden = np.lexsort((tabla["Provincia"], tabla["Trimestre"], tabla["Año"]))
+    return tabla.iloc[orden].reset_index(drop=True)
+
+
+def materializar(carpeta=".", destino=None, formatos=etl.FORMATOS):
+    """Calcula la distribución de velocidades y la escribe en ``velocidad_distribucion.csv`` y/o ``.parquet``."""
+    destino = Path(destino or carpeta)
+    tabla = calcular(carpeta)
+    if "csv" in formatos:
+        tabla.to_csv(destino / ARCHIVO, index=False)
+    if "parquet" in formatos:
+        almacen.escribir(tabla, almacen.ruta_parquet(ARCHIVO, destino))
+    return tabla
+
+
+def nacional(tabla):
+    """Filas ``Total nacional`` de la tabla, una por trimestre."""
+    return tabla[tabla["Provincia"].astype(str) == TOTAL_NACIONAL]
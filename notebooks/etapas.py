@@ -0,0 +1,212 @@
+"""Ejecución de un grafo (DAG) de etapas con nombre sobre un pool de procesos.
+
+Cada ``Etapa`` declara de qué etapas toma sus entradas (``entradas``: sus
+resultados se pasan como argumentos, en ese orden) y detrás de cuáles tiene
+que correr sin usar su resultado (``despues``). ``ejecutar`` lanza cada etapa
+apenas están listas sus dependencias: las independientes corren a la vez en
+un ``ProcessPoolExecutor`` con tantos procesos como núcleos tenga la máquina,
+y las marcadas con ``en_proceso=False`` corren en el proceso principal (las
+que modifican estado compartido, como el vocabulario).
+
+Entre etapas listas se prioriza el orden de declaración, así una cadena
+declarada de corrido (leer → limpiar → validar → escribir de una hoja) avanza
+antes de empezar la siguiente y el resultado de cada etapa se libera en cuanto
+lo consumieron todas las que lo usan. Se registra el tiempo de cada etapa
+(medido dentro del proceso que la corre, sin la espera en la cola) y, con la
+traza activa (ver ``traza``), cada etapa es un tramo con las filas que
+produjo; los tramos medidos en el pool vuelven al proceso principal.
+"""
+import heapq
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+import traza
+
+
+@dataclass(frozen=True)
+class Etapa:
+    """Un paso del grafo: ``funcion(*resultados de entradas)``."""
+
+    nombre: str
+    funcion: Callable
+    entradas: tuple = ()
+    despues: tuple = ()
+    en_proceso: bool = True
+
+
+@dataclass
+class Corrida:
+    """Resultados que nadie consumió, segundos por etapa y duración total."""
+
+    resultados: dict = field(default_factory=dict)
+    tiempos: dict = field(default_factory=dict)
+    total: float = 0.0
+    procesos: int = 1
+
+    def resumen(self):
+        """Tabla de segundos por etapa.
+
+        Las etapas con nombre ``"tipo:sujeto"`` (``"leer:Dial-BAf"``) se
+        muestran como una fila por sujeto y una columna por tipo; el resto, de
+        a una por fila.
+        """
+        tipos, filas, sueltas = [], {}, {}
+        for nombre, segundos in self.tiempos.items():
+            tipo, _, sujeto = nombre.partition(":")
+            if not sujeto:
+                sueltas[nombre] = segundos
+                continue
+            if tipo not in tipos:
+                tipos.append(tipo)
+            filas.setdefault(sujeto, {})[tipo] = segundos
+        lineas = []
+        if filas:
+            lineas.append(f"{'':<36}" + "".join(f"{tipo:>11}" for tipo in tipos))
+            for sujeto, por_tipo in filas.items():
+                celdas = (f"{por_tipo[t]:>11.2f}" if t in por_tipo else f"{'':>11}" for t in tipos)
+                lineas.append(f"{sujeto[:35]:<36}" + "".join(celdas))
+        lineas += [f"{nombre[:35]:<36}{segundos:>11.2f}" for nombre, segundos in sueltas.items()]
+        suma = sum(self.tiempos.values())
+        lineas.append(
+            f"{len(self.tiempos)} etapas en {self.total:.2f} s con {self.procesos} proceso(s) "
+            f"(suma de etapas {suma:.2f} s, concurrencia {suma / max(self.total, 1e-9):.1f}x)"
+        )
+        return "\n".join(lineas)
+
+
+def ordenar(etapas):
+    """Valida el grafo y devuelve los nombres en un orden topológico."""
+    por_nombre = {}
+    for etapa in etapas:
+        if etapa.nombre in por_nombre:
+            raise ValueError(f"Etapa repetida: {etapa.nombre!r}")
+        por_nombre[etapa.nombre] = etapa
+    faltantes = {d for e in etapas for d in e.entradas + e.despues if d not in por_nombre}
+    if faltantes:
+        raise ValueError(f"Dependencias desconocidas: {sorted(faltantes)}")
+
+    pendientes = {e.nombre: len(set(e.entradas + e.despues)) for e in etapas}
+    siguientes = _siguientes(etapas)
+    listas = [e.nombre for e in etapas if pendientes[e.nombre] == 0]
+    orden = []
+    while listas:
+        nombre = listas.pop()
+        orden.append(nombre)
+        for siguiente in siguientes[nombre]:
+            pendientes[siguiente] -= 1
+            if pendientes[siguiente] == 0:
+                listas.append(siguiente)
+    if len(orden) < len(etapas):
+        raise ValueError(f"Hay un ciclo entre: {sorted(set(por_nombre) - set(orden))}")
+    return orden
+
+
+def _siguientes(etapas):
+    siguientes = {e.nombre: [] for e in etapas}
+    for etapa in etapas:
+        for dependencia in set(etapa.entradas + etapa.despues):
+            siguientes[dependencia].append(etapa.nombre)
+    return siguientes
+
+
+def _cronometrar(funcion, argumentos, nombre):
+    with traza.tramo(nombre, "etapa") as tramo:
+        inicio = time.perf_counter()
+        resultado = funcion(*argumentos)
+        segundos = time.perf_counter() - inicio
+        tramo.anotar(filas=traza.filas(resultado))
+    return resultado, segundos
+
+
+def _en_pool(funcion, argumentos, nombre):
+    # Los tramos medidos en el proceso del pool vuelven con el resultado
+    return (*_cronometrar(funcion, argumentos, nombre), traza.extraer())
+
+
+def ejecutar(etapas, procesos=None):
+    """Corre el grafo y devuelve una ``Corrida``.
+
+    ``procesos`` es el tamaño del pool (por defecto, la cantidad de núcleos);
+    con ``procesos=1`` todo corre en el proceso actual, en orden. Si una
+    etapa falla se cancelan las que no empezaron y se propaga su excepción.
+    """
+    etapas = list(etapas)
+    ordenar(etapas)
+    procesos = procesos or os.cpu_count() or 1
+    posicion = {e.nombre: i for i, e in enumerate(etapas)}
+    siguientes = _siguientes(etapas)
+    pendientes = {e.nombre: set(e.entradas + e.despues) for e in etapas}
+    # Cuántas etapas todavía tienen que leer cada resultado
+    lectores = {e.nombre: 0 for e in etapas}
+    for etapa in etapas:
+        for entrada in etapa.entradas:
+            lectores[entrada] += 1
+
+    corrida = Corrida(procesos=procesos)
+    resultados = {}
+    listas = [posicion[e.nombre] for e in etapas if not pendientes[e.nombre]]
+    heapq.heapify(listas)
+    inicio = time.perf_counter()
+
+    def terminar(etapa, resultado, segundos):
+        corrida.tiempos[etapa.nombre] = segundos
+        resultados[etapa.nombre] = resultado
+        for entrada in etapa.entradas:
+            lectores[entrada] -= 1
+            if lectores[entrada] == 0:
+                del resultados[entrada]
+        for siguiente in siguientes[etapa.nombre]:
+            pendientes[siguiente].discard(etapa.nombre)
+            if not pendientes[siguiente]:
+                heapq.heappush(listas, posicion[siguiente])
+
+    def correr(etapa, lanzar):
+        argumentos = [resultados[entrada] for entrada in etapa.entradas]
+        try:
+            return lanzar(etapa.funcion, argumentos, etapa.nombre)
+        except Exception as error:
+            error.add_note(f"En la etapa {etapa.nombre!r}")
+            raise
+
+    if procesos == 1:
+        while listas:
+            etapa = etapas[heapq.heappop(listas)]
+            terminar(etapa, *correr(etapa, _cronometrar))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            en_curso = {}
+            try:
+                while listas or en_curso:
+                    # Primero se reparten las del pool; las locales corren mientras tanto
+                    locales = []
+                    while listas:
+                        etapa = etapas[heapq.heappop(listas)]
+                        if etapa.en_proceso:
+                            en_curso[correr(etapa, lambda *a: pool.submit(_en_pool, *a))] = etapa
+                        else:
+                            locales.append(etapa)
+                    for etapa in locales:
+                        terminar(etapa, *correr(etapa, _cronometrar))
+                    if listas or not en_curso:
+                        continue
+                    hechas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                    for futuro in sorted(hechas, key=lambda f: posicion[en_curso[f].nombre]):
+                        etapa = en_curso.pop(futuro)
+                        try:
+                            resultado, segundos, eventos = futuro.result()
+                        except Exception as error:
+                            error.add_note(f"En la etapa {etapa.nombre!r}")
+                            raise
+                        traza.agregar(eventos)
+                        terminar(etapa, resultado, segundos)
+            except BaseException:
+                for futuro in en_curso:
+                    futuro.cancel()
+                raise
+
+    corrida.total = time.perf_counter() - inicio
+    corrida.resultados = resultados
+    return corrida
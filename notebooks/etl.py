@@ -0,0 +1,618 @@
+"""ETL del dataset Internet de ENACOM.
+
+Lee una copia local de ``Internet.xlsx`` una sola vez y pasa cada hoja por su
+paso de limpieza (los mismos pasos de ``etl.ipynb``), escribiendo todos los
+``*_limpio.csv`` (y su versión Parquet tipada, ver ``almacen``) en una sola
+corrida. Las velocidades de ``Velocidad_sin_Rangos`` se resumen además en
+bocetos de cuantiles por provincia y trimestre (``cuantiles``). Desde la
+terminal, al final se materializan la distribución de velocidades ponderada
+por accesos (``distribucion``), la tabla de KPIs (``kpis``), sus
+pronósticos del trimestre siguiente (``pronostico``), el cubo de accesos por
+tecnología y localidad (``cubo``) y el tensor provincia × trimestre ×
+indicador para mapear en memoria (``tensor``).
+
+El ETL completo es un grafo de etapas (ver ``etapas``): por cada hoja
+leer → limpiar → validar → codificar → escribir, y al final las etapas
+derivadas. Las hojas son independientes entre sí y corren en paralelo en un
+pool de procesos; solo la codificación con el vocabulario compartido corre en
+el proceso principal y en el orden de ``HOJAS``, para que los códigos sean los
+mismos que en una corrida secuencial.
+
+Las reglas de calidad de cada hoja (``Hoja.reglas``, ver ``calidad``) se
+evalúan en una etapa propia sobre la hoja limpia, a la par de la
+codificación: si alguna regla de nivel error falla, la hoja no se escribe y la
+corrida se corta.
+
+Con la variable de entorno ``TRAZA`` cada etapa (y los puntos calientes de
+adentro: conversiones numéricas, ``groupby``, escritura) queda medida en una
+traza con filas y memoria (ver ``traza``)::
+
+    TRAZA=traza.json python etl.py Internet.xlsx
+
+Uso::
+
+    python etl.py Internet.xlsx --destino .
+    python etl.py --descargar          # baja el libro una vez y lo procesa
+    python etl.py --incremental        # solo trimestres nuevos o revisados
+    python etl.py --procesos 4         # tamaño del pool (por defecto, un proceso por núcleo)
+    python etl.py --por-trozos 20000   # hojas por localidad de a 20000 filas (memoria acotada)
+"""
+import argparse
+import functools
+import os
+import tempfile
+import time
+import urllib.request
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import calidad
+import cuantiles
+import etapas
+import traza
+import vocabulario
+
+URL_ENACOM = "https://indicadores.enacom.gob.ar/Files/Datos_Abiertos/Internet.xlsx"
+LIBRO_LOCAL = "Internet.xlsx"
+FORMATOS = ("csv", "parquet")
+FILAS_POR_TROZO = 20_000
+
+COLUMNAS_TECNOLOGIA = ["ADSL", "Cablemodem", "Fibra óptica", "Wireless", "Otros"]
+COLUMNAS_RANGOS = [
+    "HASTA_512_kbps",
+    "+_512_Kbps_-_1_Mbps",
+    "+_1_Mbps_-_6_Mbps",
+    "+_6_Mbps_-_10_Mbps",
+    "+_10_Mbps_-_20_Mbps",
+    "+_20_Mbps_-_30_Mbps",
+    "+_30_Mbps",
+    "OTROS",
+]
+COLUMNAS_RANGOS_TOTALES = [
+    "Hasta 512 kbps",
+    "Entre 512 Kbps y 1 Mbps",
+    "Entre 1 Mbps y 6 Mbps",
+    "Entre 6 Mbps y 10 Mbps",
+    "Entre 10 Mbps y 20 Mbps",
+    "Entre 20 Mbps y 30 Mbps",
+    "Más de 30 Mbps",
+    "OTROS",
+]
+# En Acc_vel_loc_sinrangos los encabezados del libro de ENACOM están corridos una columna: "Partido"
+# trae la provincia, "Localidad" el partido, ... y "Provincia" la velocidad
+ENCABEZADOS_ACC_VEL_LOC = ["Partido", "Localidad", "link Indec", "Velocidad (Mbps)", "Provincia", "Accesos"]
+COLUMNAS_ACC_VEL_LOC = ["Provincia", "Partido", "Localidad", "link Indec", "Velocidad (Mbps)", "Accesos"]
+TRIMESTRES_INICIO = {"Ene-Mar": "01-01", "Abr-Jun": "04-01", "Jul-Sept": "07-01", "Oct-Dic": "10-01"}
+
+
+# Limpieza por hoja (mismos pasos que etl.ipynb)
+
+def limpiar_acc_vel_loc(df):
+    if df.columns.tolist() == ENCABEZADOS_ACC_VEL_LOC:
+        df.columns = COLUMNAS_ACC_VEL_LOC
+    with traza.tramo("to_numeric", "limpiar", filas=len(df)):
+        df["Velocidad (Mbps)"] = pd.to_numeric(df["Velocidad (Mbps)"], errors="coerce")
+    df["link Indec"] = df["link Indec"].fillna("Desconocido")
+    df["Accesos"] = df["Accesos"].fillna(0)
+    # Los valores negativos no son válidos para "Accesos"
+    return df[df["Accesos"] >= 0]
+
+
+def limpiar_velocidad_sin_rangos(df, bocetos=None):
+    """Promedio de velocidad y total de accesos por provincia y trimestre.
+
+    El percentil 99 de cada provincia sale de sus bocetos de cuantiles (ver
+    ``cuantiles``); si no se pasan ``bocetos`` se arman sobre ``df``. Las
+    provincias se agrupan por su etiqueta canónica, la de los bocetos.
+    """
+    df = df.dropna(subset=["Velocidad"])
+    df = df.assign(Provincia=vocabulario.canonizar("provincia", df["Provincia"]))
+
+    # Filtrar valores anómalos por encima del percentil 99 de la provincia
+    if bocetos is None:
+        with traza.tramo("bocetos", "limpiar", filas=len(df)):
+            bocetos = cuantiles.Bocetos.construir(df)
+    p99 = bocetos.umbral(cuantiles.Q_ANOMALOS, ["Provincia"])
+    df = df[df["Velocidad"] <= df["Provincia"].map(p99)]
+
+    with traza.tramo("groupby", "limpiar", filas=len(df)):
+        agrupado = df.groupby(["Año", "Trimestre", "Provincia"]).agg(
+            Velocidad_Promedio=("Velocidad", "mean"),
+            Total_Accesos=("Accesos", "sum"),
+        ).reset_index()
+    agrupado = agrupado.rename(columns={
+        "Año": "anio",
+        "Trimestre": "trimestre",
+        "Provincia": "provincia",
+        "Velocidad_Promedio": "velocidad_promedio",
+        "Total_Accesos": "total_accesos",
+    })
+
+    # Reducir tamaño de las columnas
+    agrupado["anio"] = agrupado["anio"].astype("int16")
+    agrupado["trimestre"] = agrupado["trimestre"].astype("int8")
+    agrupado["total_accesos"] = agrupado["total_accesos"].astype("int32")
+    return agrupado
+
+
+def limpiar_accesos_tecnologia_localidad(df):
+    with traza.tramo("to_numeric", "limpiar", filas=len(df)):
+        df["Accesos"] = pd.to_numeric(df["Accesos"], errors="coerce").fillna(0)
+    return df[df["Accesos"] >= 0]
+
+
+def limpiar_velocidad_media(df):
+    """Limpieza común de 'Velocidad % por prov' y 'Totales VMD'."""
+    columna = "Mbps (Media de bajada)"
+    df[columna] = pd.to_numeric(df[columna], errors="coerce")
+    df[columna] = df[columna].fillna(df[columna].median())
+    # Velocidades mayores a 500 Mbps se consideran atípicas
+    return df[df[columna] <= 500]
+
+
+def limpiar_accesos_por_tecnologia(df):
+    """Limpieza común de 'Accesos Por Tecnología' y su hoja de totales."""
+    # Las notas al pie y filas en blanco del final de la hoja no tienen período (ni provincia)
+    df = df.dropna(subset=[c for c in ("Año", "Trimestre", "Provincia") if c in df.columns]).copy()
+    columnas = COLUMNAS_TECNOLOGIA + ["Total"]
+    df[columnas] = df[columnas].apply(pd.to_numeric, errors="coerce")
+    df[columnas] = df[columnas].fillna(df[columnas].mean())
+    df["Total Correcto"] = df["Total"] == df[COLUMNAS_TECNOLOGIA].sum(axis=1)
+    return df
+
+
+def _limpiar_penetracion(df, columnas):
+    df[columnas] = df[columnas].apply(pd.to_numeric, errors="coerce")
+    df[columnas] = df[columnas].fillna(df[columnas].mean())
+    return df.drop_duplicates()
+
+
+def limpiar_penetracion_poblacion(df):
+    return _limpiar_penetracion(df, ["Accesos por cada 100 hab"])
+
+
+def limpiar_penetracion_hogares(df):
+    return _limpiar_penetracion(df, ["Accesos por cada 100 hogares"])
+
+
+def limpiar_penetracion_totales(df):
+    return _limpiar_penetracion(df, ["Accesos por cada 100 hogares", "Accesos por cada 100 hab"])
+
+
+def limpiar_totales_accesos_por_rango(df):
+    df = df.apply(pd.to_numeric, errors="coerce")
+    df = df.fillna(df.mean()).drop_duplicates()
+    df["Total_calculado"] = df.iloc[:, 2:10].sum(axis=1)
+    df["Total_correcto"] = df["Total"] == df["Total_calculado"]
+    return df
+
+
+def limpiar_accesos_por_rangos(df):
+    df.columns = df.columns.str.strip().str.replace(" ", "_")
+    df["OTROS"] = df["OTROS"].fillna(0)
+
+    # Redondear a 2 decimales para evitar problemas de redondeo al comparar
+    df["Suma_Rangos"] = df[COLUMNAS_RANGOS].sum(axis=1).round(2)
+    df["Total"] = df["Total"].round(2)
+    df["Consistencia"] = df["Suma_Rangos"] == df["Total"]
+    return df
+
+
+def limpiar_dial_baf(df):
+    df["Dial up"] = df["Dial up"].fillna(0)
+    df["Suma_Rangos"] = df["Banda ancha fija"] + df["Dial up"]
+    df["Consistencia"] = np.isclose(df["Suma_Rangos"], df["Total"])
+    return df
+
+
+def limpiar_totales_dial_baf(df):
+    df.columns = [col.strip().replace(" ", "_").lower() for col in df.columns]
+    df["periodo"] = pd.to_datetime(df["periodo"], errors="coerce", format="%b-%Y")
+    df["proporcion_dial_up"] = df["dial_up"] / df["total"]
+    return df
+
+
+def _fecha_inicio_trimestre(periodo):
+    partes = periodo.split(" ")
+    return f"{partes[-1]}-{TRIMESTRES_INICIO.get(partes[0], '01-01')}"
+
+
+def limpiar_ingresos(df):
+    df.columns = df.columns.str.strip()
+    df["Fecha de inicio"] = pd.to_datetime(
+        df["Periodo"].apply(_fecha_inicio_trimestre), format="%Y-%m-%d"
+    )
+    return df
+
+
+@dataclass(frozen=True)
+class Hoja:
+    """Una hoja del libro, el CSV limpio que produce, su paso de limpieza y sus reglas de calidad."""
+
+    nombre: str
+    archivo: str
+    limpiar: Callable[[pd.DataFrame], pd.DataFrame]
+    reglas: tuple = ()
+
+
+# Reglas comunes (ver ``calidad``); se evalúan sobre las columnas de la hoja ya limpia
+PROVINCIA = calidad.Referencia("Provincia")
+TRIMESTRE = calidad.Rango(("Trimestre",), 1, 4)
+POR_PROVINCIA = calidad.Unica(("Año", "Trimestre", "Provincia"))
+POR_PERIODO = calidad.Unica(("Año", "Trimestre"))
+VELOCIDAD_MEDIA = calidad.Rango(("Mbps (Media de bajada)",), 0, 500)
+TECNOLOGIAS = (
+    calidad.Suma("Total", tuple(COLUMNAS_TECNOLOGIA)),
+    calidad.Rango(tuple(COLUMNAS_TECNOLOGIA) + ("Total",), 0),
+)
+
+HOJAS = [
+    Hoja("Acc_vel_loc_sinrangos", "Acc_vel_loc_sinrangos_limpio.csv", limpiar_acc_vel_loc, (
+        calidad.Rango(("Velocidad (Mbps)", "Accesos"), 0), PROVINCIA,
+    )),
+    Hoja("Velocidad_sin_Rangos", "velocidad_sin_rangos_limpio.csv", limpiar_velocidad_sin_rangos, (
+        calidad.Rango(("velocidad_promedio", "total_accesos"), 0),
+        calidad.Rango(("trimestre",), 1, 4),
+        calidad.Unica(("anio", "trimestre", "provincia")),
+        calidad.Referencia("provincia"),
+    )),
+    Hoja("Accesos_tecnologia_localidad", "Accesos_tecnologia_localidad_limpio.csv",
+         limpiar_accesos_tecnologia_localidad, (calidad.Rango(("Accesos",), 0), PROVINCIA)),
+    Hoja("Velocidad % por prov", "Velocidad_por_provincia_limpio.csv", limpiar_velocidad_media, (
+        VELOCIDAD_MEDIA, TRIMESTRE, POR_PROVINCIA, PROVINCIA,
+    )),
+    Hoja("Totales VMD", "Totales_VMD_limpio.csv", limpiar_velocidad_media, (
+        VELOCIDAD_MEDIA, TRIMESTRE, POR_PERIODO,
+    )),
+    Hoja("Totales Accesos Por Tecnología", "Totales_Accesos_Por_Tecnologia_limpio.csv",
+         limpiar_accesos_por_tecnologia, TECNOLOGIAS + (TRIMESTRE, POR_PERIODO)),
+    Hoja("Accesos Por Tecnología", "Accesos_Por_Tecnologia_limpio.csv", limpiar_accesos_por_tecnologia,
+         TECNOLOGIAS + (TRIMESTRE, POR_PROVINCIA, PROVINCIA)),
+    Hoja("Penetración-poblacion", "Penetracion_poblacion_limpio.csv", limpiar_penetracion_poblacion, (
+        calidad.Rango(("Accesos por cada 100 hab",), 0), TRIMESTRE, POR_PROVINCIA, PROVINCIA,
+    )),
+    Hoja("Penetracion-hogares", "Penetracion_hogares_limpio.csv", limpiar_penetracion_hogares, (
+        calidad.Rango(("Accesos por cada 100 hogares",), 0), TRIMESTRE, POR_PROVINCIA, PROVINCIA,
+    )),
+    Hoja("Penetracion-totales", "Penetracion_totales_limpio.csv", limpiar_penetracion_totales, (
+        calidad.Rango(("Accesos por cada 100 hogares", "Accesos por cada 100 hab"), 0), TRIMESTRE, POR_PERIODO,
+    )),
+    Hoja("Totales Accesos por rango", "Totales_Accesos_por_rango_limpio.csv", limpiar_totales_accesos_por_rango, (
+        calidad.Suma("Total", tuple(COLUMNAS_RANGOS_TOTALES)),
+        calidad.Rango(tuple(COLUMNAS_RANGOS_TOTALES) + ("Total",), 0),
+        TRIMESTRE, POR_PERIODO,
+    )),
+    Hoja("Accesos por rangos", "accesos_por_rangos_limpio.csv", limpiar_accesos_por_rangos, (
+        calidad.Suma("Total", tuple(COLUMNAS_RANGOS)),
+        calidad.Rango(tuple(COLUMNAS_RANGOS) + ("Total",), 0),
+        TRIMESTRE, POR_PROVINCIA, PROVINCIA,
+    )),
+    Hoja("Dial-BAf", "Dial_BAf_limpio.csv", limpiar_dial_baf, (
+        calidad.Suma("Total", ("Banda ancha fija", "Dial up")),
+        calidad.Rango(("Banda ancha fija", "Dial up", "Total"), 0),
+        TRIMESTRE, PROVINCIA,
+        # El libro de ENACOM repite filas de un mismo trimestre en esta hoja: se informa sin frenar
+        calidad.Unica(("Año", "Trimestre", "Provincia"), nivel="aviso"),
+    )),
+    Hoja("Totales Dial-BAf", "Totales Dial_BAf_limpio.csv", limpiar_totales_dial_baf, (
+        calidad.Suma("total", ("banda_ancha_fija", "dial_up")),
+        calidad.Rango(("banda_ancha_fija", "dial_up", "total"), 0),
+        calidad.Rango(("trimestre",), 1, 4),
+        calidad.Unica(("año", "trimestre")),
+    )),
+    Hoja("Ingresos ", "Ingresos_limpio.csv", limpiar_ingresos, (
+        calidad.Rango(("Ingresos (miles de pesos)",), 0), TRIMESTRE, POR_PERIODO,
+    )),
+]
+
+
+def descargar_libro(url=URL_ENACOM, destino=LIBRO_LOCAL):
+    """Descarga el libro de ENACOM una sola vez y devuelve la ruta local."""
+    destino = Path(destino)
+    urllib.request.urlretrieve(url, destino)
+    return destino
+
+
+def seleccionar_hojas(nombres=None):
+    if nombres is None:
+        return list(HOJAS)
+    por_nombre = {hoja.nombre.strip(): hoja for hoja in HOJAS}
+    faltantes = [n for n in nombres if n.strip() not in por_nombre]
+    if faltantes:
+        raise ValueError(f"Hojas desconocidas: {faltantes}")
+    return [por_nombre[n.strip()] for n in nombres]
+
+
+def iterar_hojas(libro, hojas=None):
+    """Recorre las hojas limpias de un libro abierto una sola vez.
+
+    ``libro`` puede ser una ruta o un ``pd.ExcelFile`` ya abierto. Devuelve
+    pares ``(Hoja, DataFrame limpio)`` de a uno, así solo una hoja vive en
+    memoria a la vez.
+    """
+    if not isinstance(libro, pd.ExcelFile):
+        with pd.ExcelFile(libro, engine="openpyxl") as abierto:
+            yield from iterar_hojas(abierto, hojas)
+        return
+    for hoja in seleccionar_hojas(hojas):
+        yield hoja, hoja.limpiar(libro.parse(hoja.nombre))
+
+
+# Libros abiertos por este proceso: (ruta, mtime, tamaño) -> pd.ExcelFile
+_abiertos = {}
+
+
+def abrir_libro(libro):
+    """``pd.ExcelFile`` del libro; cada proceso abre cada ruta una sola vez.
+
+    ``libro`` puede ser un ``pd.ExcelFile`` ya abierto o una ruta (lo que
+    recibe cada proceso del pool, ya que el archivo abierto no se puede pasar
+    entre procesos).
+    """
+    if isinstance(libro, pd.ExcelFile):
+        return libro
+    ruta = Path(libro).resolve()
+    estado = ruta.stat()
+    clave = (str(ruta), estado.st_mtime_ns, estado.st_size)
+    if clave not in _abiertos:
+        for vieja in [c for c in _abiertos if c[0] == clave[0]]:
+            _abiertos.pop(vieja).close()
+        _abiertos[clave] = pd.ExcelFile(ruta, engine="openpyxl")
+    return _abiertos[clave]
+
+
+def leer_hoja(libro, nombre):
+    """Hoja cruda ``nombre`` del libro (ver ``abrir_libro``)."""
+    return abrir_libro(libro).parse(nombre)
+
+
+def validar(hoja, df):
+    """Controles mínimos de una hoja ya limpia antes de escribirla."""
+    if df.empty:
+        raise ValueError(f"La hoja {hoja.nombre.strip()!r} quedó vacía después de la limpieza")
+    duplicadas = df.columns[df.columns.duplicated()].tolist()
+    if duplicadas:
+        raise ValueError(f"La hoja {hoja.nombre.strip()!r} tiene columnas repetidas: {duplicadas}")
+    return df
+
+
+def escribir_hoja(hoja, destino, formatos, df):
+    """Escribe la hoja limpia en ``formatos``; devuelve ``(ruta del CSV, filas)``."""
+    ruta = Path(destino) / hoja.archivo
+    if "csv" in formatos:
+        with traza.tramo("to_csv", "escribir", filas=len(df)):
+            df.to_csv(ruta, index=False)
+    if "parquet" in formatos:
+        with traza.tramo("parquet", "escribir", filas=len(df)):
+            almacen.escribir(df, almacen.ruta_parquet(hoja.archivo, destino))
+    return ruta, len(df)
+
+
+def _materializar(funcion, *args, **kwargs):
+    # Con un subconjunto de hojas puede faltar algún dataset: se informa, no se aborta
+    try:
+        return funcion(*args, **kwargs)
+    except FileNotFoundError as error:
+        return error
+
+
+def _materializado(archivo, destino):
+    return (Path(destino) / archivo).exists() or almacen.ruta_parquet(archivo, destino).exists()
+
+
+def etapas_derivadas(destino=".", formatos=FORMATOS, despues=(), filas_por_trozo=None, cambiados=None):
+    """Etapas que materializan los artefactos derivados de los datasets limpios.
+
+    Con ``filas_por_trozo`` el cubo se arma leyendo su dataset de a trozos.
+    El IVR de los KPIs usa el promedio nacional ponderado de la distribución
+    de velocidades y los pronósticos se calculan desde la tabla de KPIs, así
+    que corren en ese orden.
+
+    Con ``cambiados`` (archivos de datasets limpios que cambiaron, como tras
+    ``incremental.actualizar``) solo quedan los derivados que salen de alguno
+    de ellos, los que dependen de esos y los que todavía no están en
+    ``destino``; los demás quedan como estaban. Los que quedan se recalculan
+    sobre toda la historia, no solo sobre los trimestres cambiados.
+    """
+    import cubo
+    import distribucion
+    import kpis
+    import pronostico
+    import tensor
+
+    funciones = {
+        "Distribución de velocidades": functools.partial(
+            _materializar, distribucion.materializar, destino, formatos=formatos),
+        "Cubo de tecnologías": functools.partial(
+            _materializar, cubo.materializar, destino, filas_por_trozo=filas_por_trozo),
+        "Tensor provincial": functools.partial(_materializar, tensor.materializar, destino),
+    }
+    grafo = [etapas.Etapa(nombre, funcion, despues=tuple(despues)) for nombre, funcion in funciones.items()]
+    grafo.append(etapas.Etapa(
+        "KPIs", functools.partial(_materializar, kpis.materializar, destino, formatos=formatos),
+        despues=tuple(despues) + ("Distribución de velocidades",),
+    ))
+    grafo.append(etapas.Etapa(
+        "Pronósticos", functools.partial(_materializar, pronostico.materializar, destino, formatos=formatos),
+        despues=tuple(despues) + ("KPIs",),
+    ))
+    if cambiados is None:
+        return grafo
+
+    origenes = {
+        "Distribución de velocidades": (distribucion.ARCHIVO, distribucion.ORIGENES),
+        "Cubo de tecnologías": (cubo.ARCHIVO, (cubo.ORIGEN,)),
+        "Tensor provincial": (tensor.ARCHIVO, tuple(tensor.FUENTES)),
+        "KPIs": (kpis.ARCHIVO, kpis.ORIGENES),
+        "Pronósticos": (pronostico.ARCHIVO, ()),
+    }
+    elegidas = []
+    for etapa in grafo:
+        archivo, fuentes = origenes[etapa.nombre]
+        corren = {e.nombre for e in elegidas}
+        previas = {d for d in etapa.despues if d in origenes}
+        if set(fuentes) & set(cambiados) or previas & corren or not _materializado(archivo, destino):
+            # Las derivadas previas que no corren ya están materializadas: no se espera por ellas
+            elegidas.append(replace(etapa, despues=tuple(d for d in etapa.despues if d not in previas - corren)))
+    return elegidas
+
+
+def informar_derivados(corrida):
+    for etapa in etapas_derivadas():
+        resultado = corrida.resultados.get(etapa.nombre)
+        if isinstance(resultado, FileNotFoundError):
+            print(f"{etapa.nombre}: no materializado, falta {resultado.filename}")
+        elif etapa.nombre in corrida.tiempos:
+            print(f"{etapa.nombre}: materializado en {corrida.tiempos[etapa.nombre]:.2f} s")
+        else:
+            print(f"{etapa.nombre}: sin cambios en sus datasets")
+
+
+def etapas_etl(libro, destino, hojas=None, formatos=FORMATOS, vocab=None, derivados=False,
+               filas_por_trozo=None, temporal=None):
+    """Grafo del ETL: una cadena de etapas por hoja y, opcionalmente, las derivadas.
+
+    Con ``filas_por_trozo`` las hojas a nivel localidad se procesan de a
+    trozos (ver ``trozos``), guardando los intermedios en ``temporal``.
+    """
+    vocab = vocab if vocab is not None else vocabulario.Vocabulario.cargar(destino)
+    grafo = []
+    anterior = ()
+    for hoja in seleccionar_hojas(hojas):
+        nombre = hoja.nombre.strip()
+        funciones = [
+            functools.partial(leer_hoja, libro, hoja.nombre),
+            hoja.limpiar,
+            functools.partial(validar, hoja),
+            functools.partial(calidad.revisar, hoja),
+            vocab.aplicar,
+            functools.partial(escribir_hoja, hoja, destino, formatos),
+        ]
+        if filas_por_trozo:
+            import trozos
+
+            if hoja.nombre in trozos.HOJAS:
+                carpeta = Path(temporal) / Path(hoja.archivo).stem
+                funciones = [
+                    functools.partial(trozos.leer, libro, hoja.nombre, carpeta, filas_por_trozo),
+                    functools.partial(trozos.limpiar, hoja),
+                    functools.partial(trozos.validar, hoja),
+                    trozos.revisar,
+                    functools.partial(trozos.codificar, vocab),
+                    functools.partial(trozos.escribir, hoja, destino, formatos),
+                ]
+        leer, limpiar, validar_, revisar, codificar, escribir = funciones
+        grafo.append(etapas.Etapa(f"leer:{nombre}", leer))
+        entradas = (f"leer:{nombre}",)
+        if hoja.nombre == cuantiles.HOJA:
+            # Los bocetos se guardan junto a los datos limpios y fijan el umbral de la limpieza
+            grafo.append(etapas.Etapa(f"bocetos:{nombre}", functools.partial(cuantiles.escribir, destino),
+                                      entradas=entradas))
+            entradas += (f"bocetos:{nombre}",)
+        grafo += [
+            etapas.Etapa(f"limpiar:{nombre}", limpiar, entradas=entradas),
+            etapas.Etapa(f"validar:{nombre}", validar_, entradas=(f"limpiar:{nombre}",)),
+            # Las reglas de calidad corren a la par de la codificación; con errores la hoja no se escribe
+            etapas.Etapa(f"calidad:{nombre}", revisar, entradas=(f"limpiar:{nombre}",)),
+            # Los nombres nuevos entran al vocabulario en el orden de HOJAS, como en una corrida secuencial
+            etapas.Etapa(f"codificar:{nombre}", codificar, entradas=(f"validar:{nombre}",),
+                         despues=anterior, en_proceso=False),
+            etapas.Etapa(f"escribir:{nombre}", escribir, entradas=(f"codificar:{nombre}",),
+                         despues=(f"calidad:{nombre}",)),
+        ]
+        anterior = (f"codificar:{nombre}",)
+    grafo.append(etapas.Etapa("vocabulario", functools.partial(vocab.guardar, destino), despues=anterior,
+                              en_proceso=False))
+    if derivados:
+        escritas = tuple(e.nombre for e in grafo if e.nombre.startswith("escribir:"))
+        grafo += etapas_derivadas(destino, formatos, despues=escritas + ("vocabulario",),
+                                  filas_por_trozo=filas_por_trozo)
+    return grafo
+
+
+def ejecutar(libro=LIBRO_LOCAL, destino=".", hojas=None, formatos=FORMATOS, verbose=False, procesos=None,
+             derivados=False, filas_por_trozo=None):
+    """Corre el ETL completo y devuelve ``{nombre de hoja: ruta del CSV}``.
+
+    ``formatos`` indica qué salidas escribir: ``"csv"`` (los ``*_limpio.csv``
+    que usa ``eda.ipynb``) y/o ``"parquet"`` (el almacén tipado de ``almacen``).
+    Los nombres de provincias, partidos, localidades y tecnologías se llevan
+    al vocabulario compartido de ``destino`` (ver ``vocabulario``).
+    ``procesos`` es el tamaño del pool (por defecto, uno por núcleo; con 1 todo
+    corre en este proceso) y ``derivados=True`` agrega al grafo los derivados
+    (KPIs, pronósticos, cubo y tensor).
+    Con ``filas_por_trozo`` las hojas a nivel localidad se leen, limpian y
+    escriben de a esa cantidad de filas, con el mismo resultado (ver ``trozos``).
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    # Un libro ya abierto no se puede pasar a otros procesos
+    procesos = 1 if isinstance(libro, pd.ExcelFile) else procesos or os.cpu_count() or 1
+    if procesos == 1 and not isinstance(libro, pd.ExcelFile):
+        # En un solo proceso se comparte el libro abierto entre todas las hojas
+        with pd.ExcelFile(libro, engine="openpyxl") as abierto:
+            return ejecutar(abierto, destino, hojas, formatos, verbose, procesos, derivados, filas_por_trozo)
+
+    # Los trozos intermedios quedan junto al destino y se borran al terminar
+    with tempfile.TemporaryDirectory(dir=destino, prefix=".trozos-") as temporal, \
+            traza.tramo("etl", "corrida", procesos=procesos):
+        grafo = etapas_etl(libro, destino, hojas, formatos, derivados=derivados,
+                           filas_por_trozo=filas_por_trozo, temporal=temporal)
+        corrida = etapas.ejecutar(grafo, procesos)
+    traza.exportar()
+    salidas = {}
+    for hoja in seleccionar_hojas(hojas):
+        ruta, filas = corrida.resultados[f"escribir:{hoja.nombre.strip()}"]
+        salidas[hoja.nombre] = ruta
+        if verbose:
+            print(f"{hoja.nombre.strip()}: {filas} filas -> {ruta}")
+    if verbose:
+        avisos = calidad.unir(corrida.resultados[f"calidad:{h.nombre.strip()}"] for h in seleccionar_hojas(hojas))
+        if len(avisos):
+            print(f"Avisos de calidad:\n{avisos.to_string(index=False)}")
+        if derivados:
+            informar_derivados(corrida)
+        print(corrida.resumen())
+        if traza.activa():
+            print(f"Traza en {traza.ruta()} (resumen en {traza.ruta_resumen(traza.ruta())})")
+    return salidas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ETL del dataset Internet de ENACOM")
+    parser.add_argument("libro", nargs="?", default=LIBRO_LOCAL, help="copia local de Internet.xlsx")
+    parser.add_argument("--destino", default=".", help="carpeta donde escribir los *_limpio.csv")
+    parser.add_argument("--hojas", nargs="+", help="procesar solo estas hojas")
+    parser.add_argument("--descargar", action="store_true", help="descargar el libro de ENACOM antes de procesarlo")
+    parser.add_argument("--incremental", action="store_true", help="procesar solo los trimestres nuevos o revisados")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=FORMATOS, help="formatos de salida")
+    parser.add_argument("--procesos", type=int, help="procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--por-trozos", type=int, nargs="?", const=FILAS_POR_TROZO, metavar="FILAS",
+                        help=f"procesar las hojas por localidad de a FILAS filas (por defecto, {FILAS_POR_TROZO})")
+    args = parser.parse_args(argv)
+
+    if args.descargar:
+        descargar_libro(destino=args.libro)
+
+    inicio = time.perf_counter()
+    if args.incremental:
+        from incremental import actualizar
+
+        salidas = actualizar(args.libro, args.destino, args.hojas, formatos=args.formatos, verbose=True)
+        # Solo los artefactos derivados de las hojas que cambiaron
+        cambiados = {hoja.archivo for hoja in seleccionar_hojas(args.hojas) if salidas[hoja.nombre]}
+        grafo = etapas_derivadas(args.destino, args.formatos, cambiados=cambiados)
+        informar_derivados(etapas.ejecutar(grafo, args.procesos))
+    else:
+        salidas = ejecutar(args.libro, args.destino, args.hojas, formatos=args.formatos, verbose=True,
+                           procesos=args.procesos, derivados=True, filas_por_trozo=args.por_trozos)
+    print(f"{len(salidas)} hojas procesadas en {time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
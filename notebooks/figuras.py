@@ -0,0 +1,147 @@
+"""Construcción de figuras del dashboard con caché, reducción de puntos y métricas.
+
+Cada figura se construye una sola vez por versión de sus datasets (ver
+``datos.version``) y por combinación de parámetros; en las siguientes
+recargas se devuelve la figura ya armada junto con su JSON serializado, sin
+volver a agrupar ni a llamar a Plotly Express.
+
+Para que el JSON enviado al navegador no crezca con los datos:
+
+- las secciones suman del lado del servidor las barras que Plotly apilaría
+  (una barra por provincia en lugar de una por provincia y trimestre, con
+  ``tensor.Tensor.por_provincia``);
+- ``reducir`` aplica LTTB (Largest-Triangle-Three-Buckets) a las series
+  largas y deja como máximo ``MAX_PUNTOS`` puntos por serie.
+
+``iniciar_seccion``/``terminar_seccion`` registran, por sección, el tiempo de
+render, el tamaño de las figuras y cuántas salieron de la caché, y lo
+informan con ``logging`` (logger ``figuras``). Con la traza activa (ver
+``traza``) cada sección y cada figura construida son además tramos.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+import datos
+import traza
+
+MAX_FIGURAS = 128
+MAX_PUNTOS = 500
+
+log = logging.getLogger(__name__)
+
+_cache = OrderedDict()
+_bloqueo = threading.Lock()
+_render = threading.local()
+_secciones = defaultdict(lambda: {"renders": 0, "segundos": 0.0, "figuras": 0, "aciertos": 0, "bytes": 0})
+
+
+def obtener(nombre, construir, archivos=(), parametros=(), carpeta="."):
+    """Figura ``nombre`` construida con ``construir()`` o tomada de la caché.
+
+    La clave es ``nombre``, la versión en disco de cada uno de ``archivos`` y
+    ``parametros``: si cambia un dataset o un parámetro, se vuelve a construir.
+    """
+    clave = (nombre, tuple(datos.version(archivo, carpeta) for archivo in archivos), tuple(parametros))
+    with _bloqueo:
+        entrada = _cache.get(clave)
+        if entrada is not None:
+            _cache.move_to_end(clave)
+    acierto = entrada is not None
+    if not acierto:
+        with traza.tramo(f"figura:{nombre}", "figura") as tramo:
+            figura = construir()
+            entrada = (figura, figura.to_json())
+            tramo.anotar(kb=round(len(entrada[1]) / 1024, 1))
+        with _bloqueo:
+            _cache[clave] = entrada
+            while len(_cache) > MAX_FIGURAS:
+                _cache.popitem(last=False)
+
+    if getattr(_render, "seccion", None) is not None:
+        _render.metricas["figuras"] += 1
+        _render.metricas["aciertos"] += acierto
+        _render.metricas["bytes"] += len(entrada[1])
+    return entrada[0]
+
+
+def lttb(y, puntos):
+    """Índices de los ``puntos`` que LTTB conserva de la serie ``y`` (x = posición)."""
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+
+    # puntos - 2 baldes entre el primer y el último punto, que siempre se conservan
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(int)
+    elegidos = [0]
+    for i in range(puntos - 2):
+        desde, hasta = bordes[i], bordes[i + 1]
+        siguiente = slice(hasta, bordes[i + 2]) if i + 2 < len(bordes) else slice(n - 1, n)
+        x_medio = np.arange(n)[siguiente].mean()
+        y_medio = y[siguiente].mean()
+        a = elegidos[-1]
+        x = np.arange(desde, hasta)
+        # Área del triángulo (punto anterior, candidato, promedio del balde siguiente)
+        areas = np.abs((a - x_medio) * (y[desde:hasta] - y[a]) - (a - x) * (y_medio - y[a]))
+        elegidos.append(desde + int(np.argmax(areas)))
+    elegidos.append(n - 1)
+    return np.array(elegidos)
+
+
+def reducir(df, columnas, puntos=MAX_PUNTOS):
+    """Filas de ``df`` (ordenado en x) que conservan la forma de cada serie de ``columnas``.
+
+    Se unen los puntos que LTTB elige para cada columna, así cada serie
+    conserva sus picos y ninguna queda con más de ``puntos`` puntos propios.
+    """
+    if len(df) <= puntos:
+        return df
+    filas = np.unique(np.concatenate([lttb(df[columna].to_numpy(), puntos) for columna in columnas]))
+    return df.iloc[filas]
+
+
+def iniciar_seccion(seccion):
+    """Marca el comienzo del render de ``seccion`` en este hilo (una sesión)."""
+    _render.seccion = seccion
+    _render.inicio = time.perf_counter()
+    _render.metricas = {"figuras": 0, "aciertos": 0, "bytes": 0}
+    _render.contexto = traza.tramo(f"seccion:{seccion}", "seccion")
+    _render.tramo = _render.contexto.__enter__()
+
+
+def terminar_seccion():
+    """Cierra la medición abierta con ``iniciar_seccion`` y la informa por ``logging``."""
+    seccion = getattr(_render, "seccion", None)
+    if seccion is None:
+        return None
+    segundos = time.perf_counter() - _render.inicio
+    render = _render.metricas
+    with _bloqueo:
+        metricas = _secciones[seccion]
+        metricas["renders"] += 1
+        metricas["segundos"] += segundos
+        for clave, valor in render.items():
+            metricas[clave] += valor
+    log.info(
+        "%s: %.1f ms, %d figuras (%d desde caché), %.1f KB",
+        seccion, segundos * 1000, render["figuras"], render["aciertos"], render["bytes"] / 1024,
+    )
+    _render.tramo.anotar(**render)
+    _render.contexto.__exit__(None, None, None)
+    traza.exportar(cada=traza.INTERVALO)
+    _render.seccion = None
+    return dict(render, segundos=segundos)
+
+
+def estadisticas():
+    """Totales por sección desde que arrancó el proceso."""
+    return {seccion: dict(metricas) for seccion, metricas in _secciones.items()}
+
+
+def limpiar():
+    with _bloqueo:
+        _cache.clear()
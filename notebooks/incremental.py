@@ -0,0 +1,258 @@
+"""Actualización incremental del ETL por trimestre.
+
+Cada hoja limpia se guarda particionada por (Año, Trimestre) en
+``particiones/<dataset>/<Año>-T<Trimestre>.csv`` junto con un manifiesto de
+hashes del contenido crudo de cada partición. En cada corrida solo se limpian
+y agregan los trimestres nuevos o revisados, y el ``*_limpio.csv`` final se
+actualiza agregando esas particiones (o rearmándolo a partir de las
+particiones existentes si hubo revisiones), sin volver a procesar la historia.
+El Parquet tipado de cada hoja queda particionado: ``<dataset>_limpio.parquet``
+es una carpeta con un archivo por trimestre (ver ``almacen``), así que un
+trimestre nuevo o revisado solo escribe su archivo.
+
+Las hojas a nivel localidad no tienen columna de período y se tratan como una
+única partición. Como cada trimestre se limpia por separado, los umbrales y
+rellenos que el ETL completo calcula sobre toda la tabla (percentil 99 de
+``Velocidad`` por provincia, medias y medianas para nulos) se calculan dentro
+de cada trimestre; ``velocidad_umbrales.csv`` guarda esos umbrales por
+trimestre para que ``distribucion`` recorte con los mismos que la limpieza.
+Los bocetos de cuantiles de ``Velocidad`` también quedan particionados:
+``velocidad_bocetos.npz`` (y su versión pesada por accesos) es una carpeta
+con un boceto por trimestre, que se combinan al leerlos (ver ``cuantiles``).
+Si solo hay trimestres nuevos, se escriben sus bocetos y se agregan sus
+umbrales al final de ``velocidad_umbrales.csv``, sin cargar los de los demás
+trimestres; si se revisó o eliminó alguno, los umbrales se vuelven a escribir
+desde los bocetos de todas las particiones. Las reglas de calidad (ver
+``calidad``) se evalúan sobre cada partición limpiada, antes de escribirla.
+
+Con ``python etl.py --incremental`` después se materializan solo los
+artefactos derivados (distribución, KPIs, pronósticos, cubo y tensor) de las
+hojas que cambiaron, o los que faltan (ver ``etl.etapas_derivadas``). Esos sí
+se recalculan sobre toda la historia: su costo crece con ella.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import calidad
+import cuantiles
+import etl
+import traza
+import vocabulario
+
+MANIFIESTO = "manifiesto.json"
+CARPETA_PARTICIONES = "particiones"
+CLAVE = ["Año", "Trimestre"]
+PARTICION_UNICA = "completo"
+
+
+@dataclass
+class Cambios:
+    """Particiones nuevas, revisadas y eliminadas de una hoja."""
+
+    nuevas: list = field(default_factory=list)
+    revisadas: list = field(default_factory=list)
+    eliminadas: list = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.nuevas or self.revisadas or self.eliminadas)
+
+
+_orden = almacen.orden_particion
+
+
+def indices_particiones(df):
+    """Posiciones de las filas de cada partición: ``{"<Año>-T<Trimestre>": array}``."""
+    if not set(CLAVE).issubset(df.columns):
+        return {PARTICION_UNICA: np.arange(len(df))}
+    grupos = df.groupby(CLAVE, sort=False, dropna=False).indices
+    return {f"{anio}-T{trimestre}": posiciones for (anio, trimestre), posiciones in grupos.items()}
+
+
+def hashes_particiones(df, indices):
+    """Hash estable del contenido (columnas, tipos y valores) de cada partición.
+
+    Las filas se hashean una sola vez para toda la hoja; cada partición solo
+    combina los hashes de sus filas.
+    """
+    firma = repr(list(zip(df.columns, df.dtypes.astype(str)))).encode()
+    filas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    hashes = {}
+    for clave, posiciones in indices.items():
+        h = hashlib.sha1(firma)
+        h.update(filas[posiciones].tobytes())
+        hashes[clave] = h.hexdigest()
+    return hashes
+
+
+def leer_manifiesto(destino):
+    ruta = Path(destino) / MANIFIESTO
+    if not ruta.exists():
+        return {}
+    return json.loads(ruta.read_text(encoding="utf-8"))
+
+
+def escribir_manifiesto(destino, manifiesto):
+    ruta = Path(destino) / MANIFIESTO
+    ruta.write_text(json.dumps(manifiesto, indent=1, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+
+
+def carpeta_particiones(destino, hoja):
+    return Path(destino) / CARPETA_PARTICIONES / Path(hoja.archivo).stem
+
+
+def _archivos(carpeta):
+    """Nombres de los archivos de ``carpeta``: una sola lectura del directorio, no una consulta por partición."""
+    return set(os.listdir(carpeta))
+
+
+def _ensamblar(ruta, archivos, agregar=False):
+    """Concatena CSV de particiones (con encabezado) en un único CSV.
+
+    Trabaja a nivel de bytes: no vuelve a parsear las particiones. Con
+    ``agregar=True`` solo suma los cuerpos al final del archivo existente.
+    """
+    with open(ruta, "ab" if agregar else "wb") as salida:
+        for i, archivo in enumerate(archivos):
+            with open(archivo, "rb") as entrada:
+                encabezado = entrada.readline()
+                if i == 0 and not agregar:
+                    salida.write(encabezado)
+                salida.write(entrada.read())
+
+
+def actualizar_hoja(hoja, crudo, destino, hashes_previos, formatos=etl.FORMATOS, vocab=None):
+    """Limpia solo las particiones cambiadas de una hoja.
+
+    Si se pasa ``vocab`` (un ``vocabulario.Vocabulario``), las columnas de
+    nombres de cada partición se llevan a sus categorías compartidas.
+    Devuelve ``(Cambios, hashes actuales)``.
+    """
+    carpeta = carpeta_particiones(destino, hoja)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    salida = Path(destino) / hoja.archivo
+    parquet = almacen.ruta_parquet(hoja.archivo, destino) if "parquet" in formatos else None
+    bocetos = hoja.nombre == cuantiles.HOJA
+    por_fila, por_acceso = Path(destino) / cuantiles.ARCHIVO, Path(destino) / cuantiles.ARCHIVO_ACCESOS
+    particionadas = [parquet] if parquet is not None else []
+    particionadas += [por_fila, por_acceso] if bocetos else []
+    for ruta in particionadas:
+        if not ruta.is_dir():
+            # El Parquet (o los bocetos) de un solo archivo del ETL completo pasan a uno por trimestre
+            ruta.unlink(missing_ok=True)
+            ruta.mkdir()
+
+    indices = indices_particiones(crudo)
+    hashes = hashes_particiones(crudo, indices)
+
+    escritas = _archivos(carpeta)
+    en_parquet = _archivos(parquet) if parquet is not None else set()
+    con_bocetos = _archivos(por_fila) & _archivos(por_acceso) if bocetos else set()
+    cambios = Cambios()
+    for clave, valor in hashes.items():
+        # Una partición limpiada antes de que existieran los bocetos se vuelve a procesar
+        sin_bocetos = bocetos and f"{clave}.npz" not in con_bocetos
+        sin_parquet = parquet is not None and f"{clave}.parquet" not in en_parquet
+        if clave not in hashes_previos or f"{clave}.csv" not in escritas or sin_bocetos or sin_parquet:
+            cambios.nuevas.append(clave)
+        elif hashes_previos[clave] != valor:
+            cambios.revisadas.append(clave)
+    cambios.eliminadas = [clave for clave in hashes_previos if clave not in hashes]
+
+    resumenes = []
+    for clave in cambios.nuevas + cambios.revisadas:
+        parte = crudo.iloc[indices[clave]].copy()
+        if bocetos:
+            # Cada trimestre guarda sus bocetos para combinarlos después sin volver a limpiarlo; las
+            # claves llevan la provincia canónica, como los datasets limpios
+            parte["Provincia"] = vocabulario.canonizar("provincia", parte["Provincia"])
+            resumen = cuantiles.Bocetos.construir(parte)
+            resumen.guardar(por_fila / f"{clave}.npz")
+            cuantiles.Bocetos.construir(parte, pesos=cuantiles.PESOS).guardar(por_acceso / f"{clave}.npz")
+            resumenes.append(resumen)
+            limpio = hoja.limpiar(parte, resumen)
+        else:
+            limpio = hoja.limpiar(parte)
+        # Cada trimestre es una clave distinta: las reglas de la partición valen para toda la hoja
+        calidad.revisar(hoja, limpio)
+        if vocab is not None:
+            limpio = vocab.aplicar(limpio)
+        limpio.to_csv(carpeta / f"{clave}.csv", index=False)
+        if parquet is not None:
+            almacen.escribir(limpio, parquet / f"{clave}.parquet")
+    for clave in cambios.eliminadas:
+        (carpeta / f"{clave}.csv").unlink(missing_ok=True)
+        if parquet is not None:
+            (parquet / f"{clave}.parquet").unlink(missing_ok=True)
+        if bocetos:
+            (por_fila / f"{clave}.npz").unlink(missing_ok=True)
+            (por_acceso / f"{clave}.npz").unlink(missing_ok=True)
+
+    ordenadas = sorted(hashes, key=_orden)
+    solo_agregados = (
+        salida.exists()
+        and not cambios.revisadas
+        and not cambios.eliminadas
+        and len(hashes_previos) > 0
+        # Agregar al final solo conserva el orden si lo nuevo es lo más reciente
+        and all(_orden(c) > _orden(v) for c in cambios.nuevas for v in hashes_previos)
+    )
+    if solo_agregados:
+        _ensamblar(salida, [carpeta / f"{c}.csv" for c in sorted(cambios.nuevas, key=_orden)], agregar=True)
+    elif cambios or not salida.exists():
+        _ensamblar(salida, [carpeta / f"{c}.csv" for c in ordenadas])
+
+    umbrales = Path(destino) / cuantiles.ARCHIVO_UMBRALES
+    if bocetos and (cambios or not umbrales.exists()):
+        # Cada trimestre se limpió con el p99 de sus propias filas (ver arriba)
+        if solo_agregados and umbrales.exists():
+            # Un trimestre nuevo no cambia los umbrales de los demás
+            cuantiles.escribir_umbrales(destino, cuantiles.combinar(resumenes), cuantiles.CLAVE, agregar=True)
+        else:
+            cuantiles.escribir_umbrales(destino, cuantiles.Bocetos.cargar(por_fila), cuantiles.CLAVE)
+    return cambios, hashes
+
+
+def actualizar(libro=etl.LIBRO_LOCAL, destino=".", hojas=None, completo=False, formatos=etl.FORMATOS,
+               verbose=False):
+    """Refresca los ``*_limpio.csv`` procesando solo los trimestres cambiados.
+
+    Con ``completo=True`` se ignora el manifiesto y se reconstruye todo.
+    Devuelve ``{nombre de hoja: Cambios}``.
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    manifiesto = {} if completo else leer_manifiesto(destino)
+
+    if not isinstance(libro, pd.ExcelFile):
+        with pd.ExcelFile(libro, engine="openpyxl") as abierto:
+            return actualizar(abierto, destino, hojas, completo, formatos, verbose)
+
+    vocab = vocabulario.Vocabulario.cargar(destino)
+    resultado = {}
+    for hoja in etl.seleccionar_hojas(hojas):
+        nombre = hoja.nombre.strip()
+        with traza.tramo(f"leer:{nombre}", "etapa") as tramo:
+            crudo = libro.parse(hoja.nombre)
+            tramo.anotar(filas=len(crudo))
+        with traza.tramo(f"actualizar:{nombre}", "etapa"):
+            cambios, hashes = actualizar_hoja(hoja, crudo, destino, manifiesto.get(hoja.nombre, {}), formatos,
+                                              vocab)
+        manifiesto[hoja.nombre] = hashes
+        resultado[hoja.nombre] = cambios
+        if verbose:
+            print(
+                f"{hoja.nombre.strip()}: {len(cambios.nuevas)} nuevas, "
+                f"{len(cambios.revisadas)} revisadas, {len(cambios.eliminadas)} eliminadas"
+            )
+        # El manifiesto (y el vocabulario) se guardan después de cada hoja para poder retomar
+        vocab.guardar(destino)
+        escribir_manifiesto(destino, manifiesto)
+    traza.exportar()
+    return resultado
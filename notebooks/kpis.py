@@ -0,0 +1,142 @@
+"""Materialización de los KPIs del proyecto para todas las provincias y trimestres.
+
+Se ejecuta al final del ETL y deja una tabla compacta ``kpis.parquet`` (y
+``kpis.csv``) con una fila por (Año, Trimestre, Provincia), más las filas
+``"Total nacional"``. El dashboard solo busca filas en esta tabla.
+
+- Penetración: accesos por cada 100 hogares, meta del +2% para el trimestre
+  siguiente, valor real del trimestre siguiente y si se alcanzó la meta.
+- IVR (Índice de Velocidad Relativa): velocidad media de bajada de la
+  provincia sobre el promedio nacional del mismo trimestre × 100, con la
+  meta del +1% y su cumplimiento en el trimestre siguiente. El promedio
+  nacional pondera cada provincia por sus accesos (columna ``mbps`` de las
+  filas ``"Total nacional"`` de ``distribucion``): con el promedio simple,
+  una provincia chica pesaba lo mismo que Buenos Aires.
+- Crecimiento por tecnología: variación trimestral e interanual (``crecimiento``).
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import crecimiento
+import distribucion
+import etl
+
+ARCHIVO = "kpis.csv"
+# Datasets limpios que usa ``calcular``, además de la distribución de velocidades
+ORIGENES = (
+    "Penetracion_hogares_limpio.csv", "Penetracion_totales_limpio.csv", "Velocidad_por_provincia_limpio.csv",
+    "Totales_VMD_limpio.csv", "Accesos_Por_Tecnologia_limpio.csv",
+)
+TOTAL_NACIONAL = distribucion.TOTAL_NACIONAL
+META_PENETRACION = 0.02
+META_IVR = 0.01
+CLAVES = ["Año", "Trimestre", "Provincia"]
+
+
+def _periodo(df):
+    return df["Año"].astype(int) * 4 + df["Trimestre"].astype(int) - 1
+
+
+def _con_meta(df, columna, prefijo, meta):
+    """Agrega meta, valor del trimestre siguiente y cumplimiento de ``columna``.
+
+    El trimestre siguiente se busca por período exacto: si falta, queda NaN.
+    """
+    df = df.copy()
+    df[f"{prefijo}_meta"] = df[columna] * (1 + meta)
+
+    periodo = _periodo(df)
+    siguiente = df[["Provincia", columna]].assign(_periodo=periodo - 1)
+    siguiente = siguiente.rename(columns={columna: f"{prefijo}_siguiente"})
+    df = df.assign(_periodo=periodo).merge(siguiente, on=["Provincia", "_periodo"], how="left")
+
+    df[f"{prefijo}_variacion"] = (df[f"{prefijo}_siguiente"] / df[columna] - 1) * 100
+    alcanzada = df[f"{prefijo}_siguiente"] >= df[f"{prefijo}_meta"]
+    df[f"{prefijo}_meta_alcanzada"] = alcanzada.where(df[f"{prefijo}_siguiente"].notna())
+    return df.drop(columns="_periodo")
+
+
+def kpi_penetracion(hogares, totales):
+    columna = "Accesos por cada 100 hogares"
+    nacional = totales[["Año", "Trimestre", columna]].assign(Provincia=TOTAL_NACIONAL)
+    df = pd.concat([hogares[CLAVES + [columna]], nacional], ignore_index=True)
+    df["Provincia"] = df["Provincia"].astype(str)
+    df = df.rename(columns={columna: "hogares"})
+    return _con_meta(df, "hogares", "hogares", META_PENETRACION)
+
+
+def kpi_ivr(velocidad_por_prov, totales_vmd, distribucion_velocidad):
+    columna = "Mbps (Media de bajada)"
+    df = velocidad_por_prov[CLAVES + [columna]].rename(columns={columna: "mbps"})
+    df["Provincia"] = df["Provincia"].astype(str)
+    promedio = distribucion.nacional(distribucion_velocidad).dropna(subset=["mbps"])
+    promedio = promedio[["Año", "Trimestre", "mbps"]].rename(columns={"mbps": "_promedio"})
+    df = df.merge(promedio, on=["Año", "Trimestre"], how="left")
+    df["ivr"] = df["mbps"] / df.pop("_promedio") * 100
+    df = _con_meta(df, "ivr", "ivr", META_IVR)
+
+    nacional = totales_vmd[["Año", "Trimestre", columna]].rename(columns={columna: "mbps"})
+    return pd.concat([df, nacional.assign(Provincia=TOTAL_NACIONAL)], ignore_index=True)
+
+
+def kpi_tecnologias(accesos_por_tecnologia):
+    metricas = ["qoq", "yoy"]
+    por_provincia = crecimiento.tasas(accesos_por_tecnologia, por="Provincia", metricas=metricas)
+    nacional = crecimiento.tasas(accesos_por_tecnologia, por=None, metricas=metricas)
+    df = pd.concat([por_provincia, nacional.assign(Provincia=TOTAL_NACIONAL)], ignore_index=True)
+    df["Provincia"] = df["Provincia"].astype(str)
+    columnas = [c for c in df.columns if c.endswith(tuple(f"_{m}" for m in metricas))]
+    return df[CLAVES + columnas]
+
+
+def calcular(carpeta="."):
+    """Calcula la tabla de KPIs a partir de los datasets limpios de ``carpeta``."""
+    leer = lambda archivo: almacen.leer(archivo, carpeta=carpeta)
+    try:
+        distribucion_velocidad = leer(distribucion.ARCHIVO)
+    except FileNotFoundError:
+        # Carpetas de antes de la distribución de velocidades: se calcula desde los bocetos
+        distribucion_velocidad = distribucion.calcular(carpeta)
+    partes = [
+        kpi_penetracion(leer("Penetracion_hogares_limpio.csv"), leer("Penetracion_totales_limpio.csv")),
+        kpi_ivr(leer("Velocidad_por_provincia_limpio.csv"), leer("Totales_VMD_limpio.csv"), distribucion_velocidad),
+        kpi_tecnologias(leer("Accesos_Por_Tecnologia_limpio.csv")),
+    ]
+    tabla = partes[0]
+    for parte in partes[1:]:
+        for df in (tabla, parte):
+            df["Año"] = df["Año"].astype(int)
+            df["Trimestre"] = df["Trimestre"].astype(int)
+        tabla = tabla.merge(parte, on=CLAVES, how="outer")
+
+    # Booleanos con faltantes como tipo anulable para que Parquet los conserve
+    for columna in [c for c in tabla.columns if c.endswith("_meta_alcanzada")]:
+        tabla[columna] = tabla[columna].astype("boolean")
+    orden = np.lexsort((tabla["Provincia"], tabla["Trimestre"], tabla["Año"]))
+    return tabla.iloc[orden].reset_index(drop=True)
+
+
+def materializar(carpeta=".", destino=None, formatos=etl.FORMATOS):
+    """Calcula los KPIs y los escribe en ``kpis.csv`` y/o ``kpis.parquet``."""
+    destino = Path(destino or carpeta)
+    tabla = calcular(carpeta)
+    if "csv" in formatos:
+        tabla.to_csv(destino / ARCHIVO, index=False)
+    if "parquet" in formatos:
+        almacen.escribir(tabla, almacen.ruta_parquet(ARCHIVO, destino))
+    return tabla
+
+
+def periodos(tabla):
+    """(Año, Trimestre) disponibles en la tabla, del más reciente al más antiguo."""
+    return sorted(set(zip(tabla["Año"], tabla["Trimestre"])), reverse=True)
+
+
+def consultar(tabla, anio, trimestre, provincias=True):
+    """Filas de un trimestre; ``provincias=False`` devuelve solo el total nacional."""
+    filas = tabla[(tabla["Año"] == anio) & (tabla["Trimestre"] == trimestre)]
+    nacional = filas["Provincia"] == TOTAL_NACIONAL
+    return filas[~nacional if provincias else nacional]
@@ -0,0 +1,199 @@
+"""Pronóstico del trimestre siguiente de los KPIs por provincia.
+
+Las metas de ``kpis`` (+2% de penetración, +1% de IVR) se fijan sobre el
+valor del trimestre; este módulo dice si son realistas según la trayectoria
+de cada provincia. Para cada serie (provincia × indicador) y cada trimestre
+de origen se ajusta por mínimos cuadrados, sobre los últimos ``VENTANA``
+trimestres hasta el origen, una tendencia lineal más un efecto por trimestre
+del año, y se pronostica el trimestre siguiente con:
+
+- el intervalo de predicción de nivel ``NIVEL`` (t de Student con los grados
+  de libertad del ajuste);
+- la probabilidad de alcanzar la meta del KPI (``<indicador>_meta``).
+
+Todas las series y todos los orígenes se ajustan a la vez: los datos se
+ubican en una grilla (serie, trimestre) con NaN en los faltantes, las
+ventanas son vistas de esa grilla (``sliding_window_view``) y las ecuaciones
+normales de cada ajuste se arman con ``einsum`` y se resuelven en lote con
+una sola ``np.linalg.svd`` (que da también el rango de cada ajuste), sin un
+ajuste por serie en Python. Los faltantes pesan cero, así cada ventana usa
+solo sus trimestres con datos; con menos de ``MINIMO`` el pronóstico queda
+NaN.
+
+El ETL materializa ``pronosticos.csv`` / ``pronosticos.parquet`` a partir de
+la tabla de KPIs y la sección KPI's del dashboard solo la lee.
+"""
+import math
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+import almacen
+import etl
+import kpis
+
+ARCHIVO = "pronosticos.csv"
+# Indicador de la tabla de KPIs -> su columna de meta (None: sin meta)
+INDICADORES = {"hogares": "hogares_meta", "ivr": "ivr_meta", "mbps": None}
+VENTANA = 16
+MINIMO = 10
+NIVEL = 0.9
+COLUMNAS = [
+    "Año", "Trimestre", "Provincia", "indicador", "valor", "pronostico", "inferior", "superior",
+    "meta", "probabilidad_meta", "siguiente", "observaciones",
+]
+
+
+def _diseno(periodos, posiciones):
+    """Columnas del modelo: constante, tendencia y un efecto por trimestre (T1 es la base)."""
+    trimestre = periodos % 4
+    return np.stack(
+        [np.ones(periodos.shape), posiciones.astype(float)] + [(trimestre == q).astype(float) for q in (1, 2, 3)],
+        axis=-1,
+    )
+
+
+def _cdf_normal(x):
+    return 0.5 * (1 + np.vectorize(math.erf, otypes=[float])(x / math.sqrt(2)))
+
+
+def _cdf_t(x, libertad):
+    # Aproximación de la t de Student por la normal (Abramowitz y Stegun 26.7.8)
+    return _cdf_normal(x * (1 - 1 / (4 * libertad)) / np.sqrt(1 + x ** 2 / (2 * libertad)))
+
+
+def _cuantil_t(p, libertad):
+    # Desarrollo de Cornish-Fisher del cuantil de la t alrededor del de la normal
+    z = NormalDist().inv_cdf(p)
+    return (z + (z ** 3 + z) / (4 * libertad) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * libertad ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * libertad ** 3))
+
+
+def ajustar(grilla, inicio, ventana=VENTANA, minimo=MINIMO, nivel=NIVEL):
+    """Pronósticos del trimestre siguiente a cada origen de cada serie de ``grilla``.
+
+    ``grilla[s, p]`` es el valor de la serie ``s`` en el período ``inicio + p``
+    (``Año * 4 + Trimestre - 1``), con NaN en los faltantes. Devuelve arreglos
+    ``(series, períodos)``: pronóstico, error estándar de predicción, grados de
+    libertad, extremos del intervalo y observaciones de cada ventana.
+    """
+    series, periodos = grilla.shape
+    relleno = np.concatenate([np.full((series, ventana - 1), np.nan), grilla], axis=1)
+    ventanas = sliding_window_view(relleno, ventana, axis=1)
+    presentes = ~np.isnan(ventanas)
+    valores = np.where(presentes, ventanas, 0.0)
+
+    # Período absoluto de cada lugar de cada ventana; el origen es el último
+    absolutos = inicio + np.arange(periodos)[:, None] - (ventana - 1) + np.arange(ventana)[None, :]
+    x = _diseno(absolutos, np.broadcast_to(np.arange(ventana), absolutos.shape))
+    x0 = _diseno(absolutos[:, -1] + 1, np.full(periodos, ventana))
+
+    # Ecuaciones normales de todos los ajustes: (series, períodos, k, k) y (series, períodos, k)
+    pesos = presentes.astype(float)
+    a = np.einsum("pvk,spv,pvl->spkl", x, pesos, x)
+    b = np.einsum("pvk,spv->spk", x, valores)
+    # Una sola descomposición por ajuste da la pseudoinversa y el rango (ventanas a las que les falta un trimestre)
+    u, valores_singulares, vt = np.linalg.svd(a, hermitian=True)
+    tolerancia = valores_singulares[..., :1] * a.shape[-1] * np.finfo(float).eps
+    significativos = valores_singulares > tolerancia
+    inversos = np.where(significativos, 1 / np.where(significativos, valores_singulares, 1), 0)
+    inversa = (vt.swapaxes(-1, -2) * inversos[..., None, :]) @ u.swapaxes(-1, -2)
+    coeficientes = np.einsum("spkl,spl->spk", inversa, b)
+
+    residuos = (valores - np.einsum("pvk,spk->spv", x, coeficientes)) * pesos
+    observaciones = presentes.sum(axis=2)
+    libertad = observaciones - significativos.sum(axis=2)
+    valido = (observaciones >= minimo) & (libertad > 0) & presentes[:, :, -1]
+    libertad = np.where(valido, libertad, 1)
+    varianza = (residuos ** 2).sum(axis=2) / libertad
+
+    pronostico = np.einsum("pk,spk->sp", x0, coeficientes)
+    error = np.sqrt(varianza * (1 + np.einsum("pk,spkl,pl->sp", x0, inversa, x0)))
+    margen = _cuantil_t(0.5 + nivel / 2, libertad) * error
+    nulo = lambda arreglo: np.where(valido, arreglo, np.nan)
+    return {
+        "pronostico": nulo(pronostico),
+        "error": nulo(error),
+        "libertad": nulo(libertad),
+        "inferior": nulo(pronostico - margen),
+        "superior": nulo(pronostico + margen),
+        "observaciones": observaciones,
+    }
+
+
+def probabilidad(umbral, pronostico, error, libertad):
+    """Probabilidad de que el valor del trimestre siguiente sea al menos ``umbral``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estadistico = (umbral - pronostico) / error
+    return np.where(np.isnan(estadistico), np.nan, 1 - _cdf_t(np.nan_to_num(estadistico), libertad))
+
+
+def calcular(tabla, indicadores=INDICADORES, ventana=VENTANA, minimo=MINIMO, nivel=NIVEL):
+    """Pronósticos de todos los indicadores y provincias de la tabla de KPIs, en formato largo."""
+    periodo = tabla["Año"].astype(int).to_numpy() * 4 + tabla["Trimestre"].astype(int).to_numpy() - 1
+    inicio = periodo.min()
+    posicion = periodo - inicio
+    provincias, fila = np.unique(tabla["Provincia"].astype(str), return_inverse=True)
+    forma = (len(indicadores), len(provincias), posicion.max() + 1)
+
+    # Grillas (indicador, provincia, trimestre) del valor y de la meta
+    grilla = np.full(forma, np.nan)
+    metas = np.full(forma, np.nan)
+    for i, (indicador, meta) in enumerate(indicadores.items()):
+        grilla[i, fila, posicion] = tabla[indicador].to_numpy(dtype=float)
+        if meta is not None:
+            metas[i, fila, posicion] = tabla[meta].to_numpy(dtype=float)
+    series = grilla.reshape(-1, forma[2])
+    ajuste = ajustar(series, inicio, ventana, minimo, nivel)
+    prob = probabilidad(metas.reshape(series.shape), ajuste["pronostico"], ajuste["error"], ajuste["libertad"])
+    siguiente = np.full(series.shape, np.nan)
+    siguiente[:, :-1] = series[:, 1:]
+
+    s, p = np.nonzero(~np.isnan(ajuste["pronostico"]))
+    absoluto = inicio + p
+    resultado = pd.DataFrame({
+        "Año": absoluto // 4,
+        "Trimestre": absoluto % 4 + 1,
+        "Provincia": provincias[s % len(provincias)],
+        "indicador": np.asarray(list(indicadores))[s // len(provincias)],
+        "valor": series[s, p],
+        "pronostico": ajuste["pronostico"][s, p],
+        "inferior": ajuste["inferior"][s, p],
+        "superior": ajuste["superior"][s, p],
+        "meta": metas.reshape(series.shape)[s, p],
+        "probabilidad_meta": prob[s, p],
+        "siguiente": siguiente[s, p],
+        "observaciones": ajuste["observaciones"][s, p],
+    })
+    orden = np.lexsort((resultado["Provincia"], resultado["indicador"], resultado["Trimestre"], resultado["Año"]))
+    return resultado.iloc[orden].reset_index(drop=True)[COLUMNAS]
+
+
+def materializar(carpeta=".", destino=None, formatos=etl.FORMATOS):
+    """Calcula los pronósticos desde la tabla de KPIs y los escribe en ``pronosticos.csv`` y/o ``.parquet``."""
+    destino = Path(destino or carpeta)
+    tabla = calcular(almacen.leer(kpis.ARCHIVO, carpeta=carpeta))
+    if "csv" in formatos:
+        tabla.to_csv(destino / ARCHIVO, index=False)
+    if "parquet" in formatos:
+        almacen.escribir(tabla, almacen.ruta_parquet(ARCHIVO, destino))
+    return tabla
+
+
+def consultar(tabla, anio, trimestre, indicador):
+    """Pronósticos de ``indicador`` hechos en el trimestre (``Año``, ``Trimestre``), indexados por provincia."""
+    filas = tabla[(tabla["Año"] == anio) & (tabla["Trimestre"] == trimestre) & (tabla["indicador"] == indicador)]
+    return filas.set_index(filas["Provincia"].astype(str))
+
+
+def agregar(df, tabla, anio, trimestre, indicador):
+    """``df`` (una fila por ``Provincia``) con el pronóstico, su intervalo y la probabilidad de la meta."""
+    filas = consultar(tabla, anio, trimestre, indicador)
+    provincias = df["Provincia"].astype(str)
+    return df.assign(**{
+        columna: provincias.map(filas[columna]).to_numpy()
+        for columna in ("pronostico", "inferior", "superior", "probabilidad_meta")
+    })
@@ -0,0 +1,370 @@
+"""Reporte estático (HTML + PNG) con las figuras de ``eda.ipynb``.
+
+Cada análisis del EDA es una función registrada con ``@figura``, que declara
+los datasets limpios que usa y dibuja con matplotlib/seaborn como en el
+notebook. ``generar`` las renderiza sin pantalla (backend Agg) como etapas de
+un grafo (ver ``etapas``), repartidas en un pool de procesos, y escribe un PNG
+por figura y un ``index.html`` que las reúne.
+
+La huella de cada figura es un hash del contenido de sus datasets y del
+código de su función; queda en ``manifiesto.json`` junto al reporte. Una
+figura cuya huella no cambió desde la última corrida no se vuelve a dibujar:
+después de una publicación de ENACOM solo se renderizan las figuras de las
+hojas que cambiaron.
+
+Uso::
+
+    python reporte.py --carpeta . --destino reporte    # solo las figuras con datos nuevos
+    python reporte.py --todo --procesos 4              # todas, en 4 procesos
+"""
+import argparse
+import functools
+import hashlib
+import html
+import inspect
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+import crecimiento  # noqa: E402
+import cubo  # noqa: E402
+import etapas  # noqa: E402
+
+DESTINO = "reporte"
+MANIFIESTO = "manifiesto.json"
+DPI = 100
+# Semilla del bootstrap de las barras de error de seaborn: el mismo dato da el mismo PNG
+SEMILLA = 0
+TECNOLOGIAS = ["ADSL", "Cablemodem", "Fibra óptica", "Wireless", "Otros"]
+
+
+@dataclass(frozen=True)
+class Figura:
+    """Una figura del reporte: ``funcion(*datasets)`` dibuja sobre la figura actual de pyplot."""
+
+    nombre: str
+    titulo: str
+    funcion: Callable
+    archivos: tuple
+
+
+FIGURAS = {}
+
+
+def figura(titulo, *archivos):
+    """Registra la función decorada como figura del reporte, con los datasets que recibe en orden."""
+    def registrar(funcion):
+        FIGURAS[funcion.__name__] = Figura(funcion.__name__, titulo, funcion, archivos)
+        return funcion
+    return registrar
+
+
+def cargar(archivo, carpeta="."):
+    ruta = Path(carpeta) / archivo
+    if archivo == cubo.ARCHIVO:
+        return cubo.Cubo.cargar(ruta)
+    return pd.read_csv(ruta)
+
+
+# Figuras (los mismos gráficos de eda.ipynb)
+
+@figura("Accesos por cada 100 habitantes en las provincias", "Penetracion_poblacion_limpio.csv")
+def penetracion_poblacion(penetracion_poblacion):
+    penetracion_poblacion_sorted = penetracion_poblacion[["Provincia", "Accesos por cada 100 hab"]].sort_values(
+        by="Accesos por cada 100 hab", ascending=False)
+    plt.figure(figsize=(12, 6))
+    sns.barplot(data=penetracion_poblacion_sorted, x="Provincia", y="Accesos por cada 100 hab", palette="viridis",
+                hue="Provincia", dodge=False, legend=False, seed=SEMILLA)
+    plt.xticks(rotation=90)
+    plt.title("Accesos por cada 100 habitantes en las provincias", fontsize=16)
+    plt.ylabel("Accesos por cada 100 habitantes")
+    plt.xlabel("Provincia")
+
+
+@figura("Accesos por cada 100 hogares en las provincias", "Penetracion_hogares_limpio.csv")
+def penetracion_hogares(penetracion_hogares):
+    penetracion_hogares_sorted = penetracion_hogares.sort_values(by="Accesos por cada 100 hogares", ascending=False)
+    plt.figure(figsize=(10, 6))
+    sns.barplot(data=penetracion_hogares_sorted, x="Provincia", y="Accesos por cada 100 hogares",
+                palette="cubehelix", hue="Provincia", legend=False, seed=SEMILLA)
+    plt.xticks(rotation=90)
+    plt.title("Accesos por cada 100 hogares en las provincias", fontsize=16)
+    plt.ylabel("Accesos por cada 100 hogares")
+    plt.xlabel("Provincia")
+
+
+@figura("Tendencias de accesos por cada 100 hogares y habitantes", "Penetracion_totales_limpio.csv")
+def tendencias_penetracion(penetracion_totales):
+    plt.figure(figsize=(12, 6))
+    sns.lineplot(data=penetracion_totales, x="Periodo", y="Accesos por cada 100 hogares", marker="o",
+                 label="Hogares", color="blue")
+    sns.lineplot(data=penetracion_totales, x="Periodo", y="Accesos por cada 100 hab", marker="o",
+                 label="Habitantes", color="green")
+    plt.title("Tendencias de Accesos por cada 100 hogares y habitantes", fontsize=16)
+    plt.ylabel("Accesos por cada 100")
+    plt.xlabel("Periodo")
+    plt.xticks(rotation=45)
+    plt.legend()
+    plt.grid(True)
+
+
+@figura("Incremento planificado del 2% en el próximo trimestre", "Penetracion_hogares_limpio.csv")
+def meta_penetracion(penetracion_hogares):
+    # El último trimestre con datos (el notebook fija 2024-T2)
+    anio, trimestre = penetracion_hogares[["Año", "Trimestre"]].sort_values(["Año", "Trimestre"]).iloc[-1]
+    acceso_actual = penetracion_hogares[(penetracion_hogares["Año"] == anio)
+                                        & (penetracion_hogares["Trimestre"] == trimestre)].copy()
+    acceso_actual["Nuevo_acceso"] = acceso_actual["Accesos por cada 100 hogares"] * 1.02
+
+    x = np.arange(len(acceso_actual["Provincia"]))
+    width = 0.35
+    plt.figure(figsize=(12, 6))
+    plt.bar(x - width / 2, acceso_actual["Accesos por cada 100 hogares"], width, label="Acceso Actual",
+            color="skyblue")
+    plt.bar(x + width / 2, acceso_actual["Nuevo_acceso"], width, label="Acceso Planificado (2%)", color="orange")
+    plt.xticks(x, acceso_actual["Provincia"], rotation=45)
+    plt.xlabel("Provincia")
+    plt.ylabel("Accesos por cada 100 Hogares")
+    plt.title(f"Incremento Planificado del 2% en el Próximo Trimestre ({anio}-T{trimestre})")
+    plt.legend()
+    plt.grid(axis="y")
+
+
+@figura("Distribución de velocidades promedio a nivel nacional", "velocidad_sin_rangos_limpio.csv")
+def distribucion_velocidad(velocidad_sin_rangos):
+    plt.figure(figsize=(12, 6))
+    sns.histplot(velocidad_sin_rangos["velocidad_promedio"], bins=20, kde=True, color="skyblue")
+    plt.title("Distribución de Velocidades Promedio a Nivel Nacional")
+    plt.xlabel("Velocidad Promedio (Mbps)")
+    plt.ylabel("Frecuencia")
+
+
+@figura("Top 10 provincias por velocidad media de bajada", "Velocidad_por_provincia_limpio.csv")
+def top10_velocidad(velocidad_por_provincia):
+    velocidad_top10 = (velocidad_por_provincia.groupby("Provincia")["Mbps (Media de bajada)"].mean()
+                       .nlargest(10).reset_index())
+    plt.figure(figsize=(10, 6))
+    sns.barplot(data=velocidad_top10, y="Provincia", x="Mbps (Media de bajada)", palette="Blues_d",
+                hue="Provincia", dodge=False, legend=False)
+    plt.title("Top 10 Provincias por Velocidad Media de Bajada (Mbps)")
+    plt.xlabel("Velocidad Media (Mbps)")
+    plt.ylabel("Provincia")
+
+
+@figura("Velocidad promedio por región", "Velocidad_por_provincia_limpio.csv")
+def velocidad_por_provincia(velocidad_por_provincia):
+    plt.figure(figsize=(12, 6))
+    sns.barplot(data=velocidad_por_provincia, x="Provincia", y="Mbps (Media de bajada)", errorbar=None,
+                color="steelblue")
+    plt.title("Velocidad Promedio por Región (Mbps)")
+    plt.xlabel("Provincia")
+    plt.ylabel("Velocidad Promedio (Mbps)")
+    plt.xticks(rotation=45)
+
+
+def _ivr(velocidad_por_prov):
+    velocidad_promedio_nacional = velocidad_por_prov["Mbps (Media de bajada)"].mean()
+    return velocidad_por_prov.assign(IVR=velocidad_por_prov["Mbps (Media de bajada)"] / velocidad_promedio_nacional
+                                     * 100)
+
+
+@figura("Índice de Velocidad Relativa (IVR) por provincia", "Velocidad_por_provincia_limpio.csv")
+def ivr(velocidad_por_prov):
+    velocidad_por_prov_sorted = _ivr(velocidad_por_prov).sort_values(by="IVR", ascending=False)
+    plt.figure(figsize=(14, 8))
+    sns.barplot(x="IVR", y="Provincia", data=velocidad_por_prov_sorted, hue="Provincia", palette="coolwarm",
+                orient="h", legend=False, seed=SEMILLA)
+    plt.axvline(100, color="gray", linestyle="--", label="Promedio Nacional (100%)")
+    plt.title("Índice de Velocidad Relativa (IVR) por Provincia", fontsize=16)
+    plt.xlabel("IVR (Relación con el Promedio Nacional)", fontsize=12)
+    plt.ylabel("Provincia", fontsize=12)
+    plt.legend(loc="lower right")
+
+
+@figura("Progreso hacia el aumento del IVR (+1%) por provincia", "Velocidad_por_provincia_limpio.csv")
+def meta_ivr(velocidad_por_prov):
+    velocidad_por_prov = _ivr(velocidad_por_prov)
+    velocidad_por_prov["IVR_meta"] = velocidad_por_prov["IVR"] * 1.01
+    plt.figure(figsize=(12, 6))
+    sns.barplot(data=velocidad_por_prov.sort_values("IVR_meta", ascending=False), x="IVR", y="Provincia",
+                label="IVR Actual", seed=SEMILLA)
+    sns.scatterplot(data=velocidad_por_prov, x="IVR_meta", y="Provincia", color="black", s=50,
+                    label="Meta IVR (+1%)")
+    plt.axvline(100, color="gray", linestyle="--", label="Promedio Nacional (100%)")
+    plt.title("Progreso hacia el Aumento del IVR (+1%) por Provincia")
+    plt.xlabel("IVR")
+    plt.ylabel("Provincia")
+    plt.legend()
+
+
+@figura("Tendencia temporal de las tecnologías de conexión", "Totales_Accesos_Por_Tecnologia_limpio.csv")
+def tendencias_tecnologias(totales_accesos_por_tecnologia):
+    tendencias = totales_accesos_por_tecnologia.groupby(["Año", "Trimestre"])[TECNOLOGIAS].sum()
+    tendencias.plot(kind="line", figsize=(14, 8), marker="o")
+    plt.title("Tendencia Temporal de las Tecnologías de Conexión (2014-2024)")
+    plt.xlabel("Periodo (Año-Trimestre)")
+    plt.ylabel("Cantidad de Accesos")
+    plt.grid(True, linestyle="--", alpha=0.7)
+    plt.legend(title="Tecnologías", bbox_to_anchor=(1.05, 1), loc="upper left")
+
+
+@figura("Accesos por tecnología", cubo.ARCHIVO)
+def accesos_por_tecnologia(cubo_tecnologia):
+    plt.figure(figsize=(10, 6))
+    cubo_tecnologia.total().sort_values(ascending=False).plot(kind="bar", color="skyblue", edgecolor="black")
+    plt.title("Accesos por Tecnología", fontsize=16)
+    plt.ylabel("Número de Accesos", fontsize=14)
+    plt.xlabel("Tecnología", fontsize=14)
+    plt.xticks(rotation=45, fontsize=12)
+    plt.yticks(fontsize=12)
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+
+
+@figura("Crecimiento trimestral de accesos por tecnología", "Accesos_Por_Tecnologia_limpio.csv")
+def crecimiento_trimestral(accesos_por_tecnologia):
+    tasas_crecimiento = crecimiento.tasas(accesos_por_tecnologia, por=None)
+    tasas_crecimiento["Periodo"] = (tasas_crecimiento["Año"].astype(str) + " T"
+                                    + tasas_crecimiento["Trimestre"].astype(str))
+    tasas_crecimiento = tasas_crecimiento.set_index("Periodo").dropna(
+        subset=[f"{tecnologia}_qoq" for tecnologia in crecimiento.COLUMNAS_TECNOLOGIA])
+    plt.figure(figsize=(10, 6))
+    colores = {"ADSL": "b", "Cablemodem": "g", "Fibra óptica": "r", "Wireless": "c", "Otros": "m"}
+    for tecnologia, color in colores.items():
+        plt.plot(tasas_crecimiento.index, tasas_crecimiento[f"{tecnologia}_qoq"], label=tecnologia, marker="o",
+                 linestyle="-", color=color)
+    plt.title("Crecimiento Trimestral de Accesos por Tecnología", fontsize=14)
+    plt.xlabel("Periodo", fontsize=12)
+    plt.ylabel("Crecimiento (%)", fontsize=12)
+    plt.xticks(rotation=45)
+    plt.legend(title="Tecnologías", loc="best")
+    plt.grid(True)
+
+
+# Generación
+
+def huellas(figuras, carpeta=".", dpi=DPI):
+    """Hash de cada figura: contenido de sus datasets, código de su función y resolución.
+
+    Las figuras a las que les falta algún dataset quedan con ``None``. Cada
+    archivo se lee una sola vez aunque lo usen varias figuras.
+    """
+    por_archivo = {}
+    for archivo in {a for f in figuras for a in f.archivos}:
+        ruta = Path(carpeta) / archivo
+        if ruta.exists():
+            por_archivo[archivo] = hashlib.blake2b(ruta.read_bytes(), digest_size=16).hexdigest()
+    resultado = {}
+    for f in figuras:
+        if not all(a in por_archivo for a in f.archivos):
+            resultado[f.nombre] = None
+            continue
+        partes = [inspect.getsource(f.funcion), str(dpi)] + [por_archivo[a] for a in f.archivos]
+        resultado[f.nombre] = hashlib.blake2b("\n".join(partes).encode(), digest_size=16).hexdigest()
+    return resultado
+
+
+def renderizar(nombre, carpeta, destino, dpi=DPI):
+    """Dibuja la figura ``nombre`` sin pantalla y la guarda como ``<nombre>.png``; devuelve la ruta."""
+    f = FIGURAS[nombre]
+    sns.set_theme(style="whitegrid", palette="pastel")
+    try:
+        f.funcion(*(cargar(archivo, carpeta) for archivo in f.archivos))
+        plt.tight_layout()
+        ruta = Path(destino) / f"{nombre}.png"
+        plt.gcf().savefig(ruta, dpi=dpi)
+    finally:
+        plt.close("all")
+    return ruta
+
+
+def escribir_html(destino, estados):
+    """``index.html`` con todas las figuras del reporte, en el orden del registro."""
+    bloques = []
+    for nombre, estado in estados.items():
+        f = FIGURAS[nombre]
+        fuentes = ", ".join(html.escape(a) for a in f.archivos)
+        if estado == "sin datos":
+            imagen = f"<p><em>Sin datos: falta {fuentes}</em></p>"
+        else:
+            imagen = f'<img src="{html.escape(nombre)}.png" alt="{html.escape(f.titulo)}">'
+        bloques.append(f'<section id="{html.escape(nombre)}">\n<h2>{html.escape(f.titulo)}</h2>\n{imagen}\n'
+                       f"<p class=\"fuentes\">Datos: {fuentes}</p>\n</section>")
+    pagina = (
+        "<!DOCTYPE html>\n<html lang=\"es\">\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>Análisis del Sector de Telecomunicaciones en Argentina</title>\n"
+        "<style>body{font-family:sans-serif;max-width:1100px;margin:auto}img{max-width:100%}"
+        ".fuentes{color:#666;font-size:small}</style>\n</head>\n<body>\n"
+        "<h1>Análisis del Sector de Telecomunicaciones en Argentina</h1>\n"
+        f"<p>Generado el {datetime.now():%Y-%m-%d %H:%M}.</p>\n" + "\n".join(bloques) + "\n</body>\n</html>\n"
+    )
+    ruta = Path(destino) / "index.html"
+    ruta.write_text(pagina, encoding="utf-8")
+    return ruta
+
+
+def generar(carpeta=".", destino=DESTINO, nombres=None, todo=False, procesos=None, dpi=DPI, verbose=False):
+    """Renderiza las figuras cuya huella cambió y reescribe el ``index.html``.
+
+    Devuelve ``{figura: estado}`` con ``"renderizada"``, ``"sin cambios"`` o
+    ``"sin datos"``. Con ``todo=True`` se ignora el manifiesto.
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    figuras = [FIGURAS[n] for n in (nombres or FIGURAS)]
+    manifiesto_ruta = destino / MANIFIESTO
+    manifiesto = {} if todo or not manifiesto_ruta.exists() else json.loads(manifiesto_ruta.read_text())
+
+    actuales = huellas(figuras, carpeta, dpi)
+    estados, pendientes = {}, []
+    for f in figuras:
+        if actuales[f.nombre] is None:
+            estados[f.nombre] = "sin datos"
+        elif manifiesto.get(f.nombre) == actuales[f.nombre] and (destino / f"{f.nombre}.png").exists():
+            estados[f.nombre] = "sin cambios"
+        else:
+            estados[f.nombre] = "renderizada"
+            pendientes.append(f.nombre)
+
+    if pendientes:
+        grafo = [etapas.Etapa(f"figura:{nombre}", functools.partial(renderizar, nombre, carpeta, destino, dpi))
+                 for nombre in pendientes]
+        corrida = etapas.ejecutar(grafo, procesos)
+        if verbose:
+            print(corrida.resumen())
+        manifiesto.update({nombre: actuales[nombre] for nombre in pendientes})
+        manifiesto_ruta.write_text(json.dumps(manifiesto, indent=1, ensure_ascii=False))
+    escribir_html(destino, {f.nombre: estados[f.nombre] for f in FIGURAS.values() if f.nombre in estados})
+    return estados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reporte estático con las figuras del EDA")
+    parser.add_argument("--carpeta", default=".", help="carpeta con los datasets limpios")
+    parser.add_argument("--destino", default=DESTINO, help="carpeta del reporte (PNG + index.html)")
+    parser.add_argument("--figuras", nargs="+", choices=list(FIGURAS), help="solo estas figuras")
+    parser.add_argument("--todo", action="store_true", help="renderizar todas aunque no hayan cambiado")
+    parser.add_argument("--procesos", type=int, help="procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--dpi", type=int, default=DPI)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    estados = generar(args.carpeta, args.destino, args.figuras, args.todo, args.procesos, args.dpi, verbose=True)
+    cuentas = pd.Series(estados).value_counts()
+    print(f"{len(estados)} figuras ({', '.join(f'{estado}: {n}' for estado, n in cuentas.items())}) "
+          f"en {time.perf_counter() - inicio:.2f} s -> {Path(args.destino) / 'index.html'}")
+
+
+if __name__ == "__main__":
+    main()
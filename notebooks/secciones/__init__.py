@@ -0,0 +1,50 @@
+"""Secciones del dashboard, un módulo por sección importado recién al abrirla.
+
+Cada módulo expone ``render()`` y trae sus propias dependencias (pandas,
+Plotly, las capas de datos y de figuras). Así el proceso que solo muestra
+``Inicio`` no importa nada pesado ni carga datasets: la primera pantalla de
+un proceso nuevo sale sin esperar a pandas ni a Plotly. Los módulos quedan en
+``sys.modules``, de modo que cada recarga de Streamlit solo vuelve a ejecutar
+``render()``.
+
+Al abrir la primera sección con datos se lanza en segundo plano la precarga
+de todos los datasets (ver ``datos.precargar``) y cada render se mide con
+``figuras.iniciar_seccion``/``figuras.terminar_seccion``.
+"""
+import importlib
+
+# Título en la barra lateral -> módulo de la sección
+MODULOS = {
+    "Inicio": "inicio",
+    "Penetración del Servicio": "penetracion",
+    "Calidad y Velocidad del Servicio": "calidad",
+    "Tecnologías de Conexión": "tecnologias",
+    "KPI's": "indicadores",
+}
+# Secciones de solo texto: no se miden ni disparan la precarga de datos
+ESTATICAS = {"Inicio"}
+
+
+def cargar(seccion):
+    """Módulo de ``seccion`` (se importa la primera vez que se pide)."""
+    return importlib.import_module(f"{__name__}.{MODULOS[seccion]}")
+
+
+def mostrar(seccion):
+    """Renderiza ``seccion``; las dependencias pesadas se importan recién acá."""
+    modulo = cargar(seccion)
+    if seccion in ESTATICAS:
+        modulo.render()
+        return
+
+    import datos
+    import figuras
+
+    # Los datasets se cargan una sola vez por proceso y se comparten entre secciones y sesiones
+    datos.precargar(en_segundo_plano=True)
+    figuras.iniciar_seccion(seccion)
+    try:
+        modulo.render()
+    finally:
+        # Fin del render de la sección: tiempo, figuras servidas desde caché y tamaño
+        figuras.terminar_seccion()
@@ -0,0 +1,158 @@
+"""Sección 1.2: Calidad y Velocidad del Servicio."""
+import plotly.express as px
+import streamlit as st
+
+import distribucion
+import figuras
+import tensor
+from secciones.comun import mostrar, obtener_derivado
+
+
+def render():
+    st.header("1.2 Calidad y Velocidad del Servicio")
+
+    st.write("""
+    Esta sección tiene como objetivo identificar las velocidades promedio de Internet y su distribución entre las provincias de Argentina. 
+    Se exploran las siguientes hojas de datos:
+    - **Velocidad_sin_Rangos**
+    - **Velocidad % por prov**
+    - **Totales VMD**
+    - **Accesos por rangos**
+    - **Totales Accesos por rango**
+    """)
+    
+    st.write("""
+    En esta área se realizaron los análisis de:
+    - Distribución de velocidades (ponderada por accesos)
+    - Análisis por provincia
+    - Velocidad promedio por provincia
+    """)
+
+    # Distribución de velocidades por acceso, precalculada por el ETL (ver distribucion)
+    tabla_distribucion = obtener_derivado(
+        distribucion.ARCHIVO, "el promedio nacional y la distribución de velocidades por acceso")
+
+    if tabla_distribucion is not None:
+        nacional = distribucion.nacional(tabla_distribucion).sort_values(["Año", "Trimestre"])
+        # Promedio nacional de velocidad media: cada provincia pesa según sus accesos
+        ultimo = nacional.dropna(subset=["mbps"]).iloc[-1]
+        st.write(f"**Promedio Nacional de Velocidad Media de Bajada** ({ultimo['Año']}-T{ultimo['Trimestre']}, "
+                 f"ponderado por accesos): {ultimo['mbps']:.2f} Mbps")
+
+        ultimo = nacional.dropna(subset=["media"]).iloc[-1]
+        st.write(f"**Velocidad declarada por acceso a nivel nacional** ({ultimo['Año']}-T{ultimo['Trimestre']}): "
+                 f"media {ultimo['media']:.2f} Mbps, mediana {ultimo['p50']:.2f} Mbps, "
+                 f"percentil 99 {ultimo['p99']:.2f} Mbps; {ultimo['desde_30']:.1f}% de los accesos con 30 Mbps o más")
+
+        st.subheader("Gráfico: Mediana y Percentil 99 de Velocidad por Provincia")
+        provincias = tabla_distribucion[
+            (tabla_distribucion["Provincia"] != distribucion.TOTAL_NACIONAL) & tabla_distribucion["p50"].notna()]
+        periodos = provincias[["Año", "Trimestre"]].drop_duplicates().sort_values(
+            ["Año", "Trimestre"], ascending=False)
+        opciones = [f"{anio}-T{trimestre}" for anio, trimestre in periodos.itertuples(index=False)]
+        periodo = st.selectbox("Trimestre", opciones)
+        anio, trimestre = periodos.iloc[opciones.index(periodo)]
+        del_periodo = provincias[(provincias["Año"] == anio) & (provincias["Trimestre"] == trimestre)]
+
+        def construir_percentiles():
+            por_provincia = del_periodo[["Provincia", "p50", "p99"]].sort_values("p50")
+            fig_percentiles = px.bar(
+                por_provincia.melt(id_vars="Provincia", var_name="Estadístico", value_name="Mbps"),
+                x="Provincia",
+                y="Mbps",
+                color="Estadístico",
+                barmode="group",
+                title=f"Mediana (p50) y Percentil 99 de Velocidad por Acceso y Provincia: {periodo}",
+                template="plotly",
+            )
+            fig_percentiles.update_layout(xaxis_tickangle=45, title_font_size=16)
+            return fig_percentiles
+
+        fig_percentiles = figuras.obtener(
+            "velocidad_percentiles", construir_percentiles, [distribucion.ARCHIVO], parametros=(periodo,)
+        )
+        mostrar(fig_percentiles)
+
+        st.subheader("Gráfico: Accesos con 30 Mbps o más por Provincia")
+        st.write("""
+        Porcentaje de accesos con 30 Mbps o más según las velocidades declaradas (**Velocidad_sin_Rangos**) y según
+        los rangos de velocidad (**Accesos por rangos**, sobre los accesos de velocidad conocida).
+        """)
+
+        def construir_umbral():
+            por_provincia = del_periodo[["Provincia", "desde_30", "rangos_desde_30"]].sort_values("desde_30")
+            por_provincia = por_provincia.rename(columns={
+                "desde_30": "Velocidades declaradas", "rangos_desde_30": "Accesos por rangos"})
+            fig_umbral = px.bar(
+                por_provincia.melt(id_vars="Provincia", var_name="Fuente", value_name="% de accesos"),
+                x="Provincia",
+                y="% de accesos",
+                color="Fuente",
+                barmode="group",
+                title=f"Accesos con 30 Mbps o más por Provincia: {periodo}",
+                template="plotly",
+            )
+            fig_umbral.update_layout(xaxis_tickangle=45, title_font_size=16)
+            return fig_umbral
+
+        fig_umbral = figuras.obtener("velocidad_desde_30", construir_umbral, [distribucion.ARCHIVO],
+                                     parametros=(periodo,))
+        mostrar(fig_umbral)
+
+    # Gráfico interactivo de velocidad promedio por provincia
+    st.subheader("Gráfico: Velocidad Promedio por Provincia")
+    # Tensor provincia × trimestre × indicador, mapeado en memoria
+    tensor_provincial = obtener_derivado(tensor.ARCHIVO, "la velocidad promedio por provincia")
+    if tensor_provincial is not None:
+        st.write("""
+        Este gráfico muestra la velocidad promedio de bajada de internet por provincia. Las provincias están ordenadas de acuerdo con su velocidad media.
+        """)
+
+        def construir_velocidad():
+            # Crear gráfico interactivo con Plotly
+            # Sumar por provincia del lado del servidor (Plotly apilaría una barra por trimestre)
+            fig_velocidad = px.bar(
+                tensor_provincial.por_provincia("velocidad:mbps", columna="Mbps (Media de bajada)"),
+                x="Provincia",
+                y="Mbps (Media de bajada)",
+                color="Provincia",  # Colorea las barras por provincia
+                title="Velocidad Promedio por Provincia (Mbps)",
+                labels={"Mbps (Media de bajada)": "Velocidad Promedio (Mbps)", "Provincia": "Provincia"},
+                template="plotly",  # Estilo visual
+            )
+
+            # Mejorar diseño del gráfico
+            fig_velocidad.update_layout(
+                xaxis_title="Provincia",
+                yaxis_title="Velocidad Promedio (Mbps)",
+                xaxis_tickangle=45,  # Rotación de etiquetas del eje X
+                title_font_size=16
+            )
+
+            return fig_velocidad
+
+        fig_velocidad = figuras.obtener("velocidad", construir_velocidad, [tensor.ARCHIVO])
+
+        # Mostrar gráfico en el dashboard
+        mostrar(fig_velocidad)
+
+    # Insights Significativos
+    st.subheader("Insights Significativos")
+    st.markdown("""
+    - **Disparidad en la calidad del servicio**:
+      - Existe una gran variabilidad en las velocidades de internet entre provincias. 
+      - Las velocidades promedio van desde 3.46 Mbps (mínimo) hasta 170.78 Mbps (máximo), con una desviación estándar de 43.26 Mbps.
+    
+    - **Diferencias regionales**:
+      - Provincias más urbanizadas, como *Capital Federal* y *Buenos Aires*, lideran en velocidades promedio debido a una infraestructura avanzada.
+      - Regiones rurales como *Chubut* presentan velocidades significativamente más bajas, reflejando brechas en desarrollo tecnológico e inversión.
+    
+    - **Distribución sesgada**:
+      - La velocidad promedio nacional (61.3 Mbps) es mayor que la mediana (44.64 Mbps), indicando la influencia de algunas provincias con velocidades muy altas en el promedio general.
+    
+    - **Infraestructura y población**:
+      - Las provincias con mayor densidad de población tienden a contar con mejores servicios, mientras que las áreas rurales enfrentan desafíos de acceso.
+    
+    - **Oportunidades de mejora**:
+      - Las regiones con bajas velocidades ofrecen una oportunidad para inversiones estratégicas y expansión del mercado, especialmente mediante tecnologías alternativas como el internet satelital.
+    """)
@@ -0,0 +1,21 @@
+"""Lo que comparten las secciones con gráficos."""
+import streamlit as st
+
+import datos
+import traza
+
+# Con la variable de entorno TRAZA, cada envío de una figura al navegador es un tramo (ver traza)
+mostrar = traza.envolver(st.plotly_chart, "st.plotly_chart", "render")
+
+
+def obtener_derivado(archivo, contenido):
+    """Artefacto ``archivo`` del ETL, o ``None`` con un aviso si todavía no se materializó.
+
+    El dashboard solo lee: los artefactos derivados (tensor, cubo, KPIs,
+    pronósticos, distribución de velocidades) los escribe el ETL.
+    """
+    try:
+        return datos.obtener(archivo)
+    except FileNotFoundError:
+        st.info(f"Corré el ETL (`python etl.py`) para ver {contenido}.")
+        return None
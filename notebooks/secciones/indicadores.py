@@ -0,0 +1,240 @@
+"""Sección KPI's: metas de penetración e IVR con sus pronósticos y crecimiento por tecnología."""
+import plotly.graph_objects as go
+import streamlit as st
+
+import figuras
+import kpis
+import pronostico
+from secciones.comun import mostrar, obtener_derivado
+
+
+def render():
+    st.header("📊 KPI: Aumentar en un 2% el acceso al servicio de internet por provincia")
+
+    st.write("""
+    Este gráfico muestra un objetivo clave: aumentar en un **2%** el acceso al servicio de internet para el próximo trimestre, 
+    expresado en términos de accesos por cada 100 hogares para cada provincia. La comparación incluye el acceso actual y el acceso planificado.
+    """)
+
+    # Los KPIs y los pronósticos del trimestre siguiente se materializan al final del ETL
+    tabla_kpis = obtener_derivado(kpis.ARCHIVO, "los KPIs")
+    if tabla_kpis is None:
+        return
+    tabla_pronosticos = obtener_derivado(pronostico.ARCHIVO, "los KPIs con sus pronósticos")
+    if tabla_pronosticos is None:
+        return
+
+    # Trimestre de referencia (por defecto, el más reciente)
+    anio, trimestre = st.selectbox(
+        "Trimestre",
+        kpis.periodos(tabla_kpis),
+        format_func=lambda periodo: f"{periodo[0]} T{periodo[1]}",
+    )
+    acceso_actual = kpis.consultar(tabla_kpis, anio, trimestre).dropna(subset=['hogares']).rename(columns={
+        'hogares': 'Accesos por cada 100 hogares',
+        'hogares_meta': 'Nuevo_acceso',
+        'hogares_siguiente': 'Acceso Real Siguiente',
+        'hogares_variacion': 'Variación Real (%)',
+        'hogares_meta_alcanzada': 'Meta Alcanzada',
+    })
+    acceso_actual = pronostico.agregar(acceso_actual, tabla_pronosticos, anio, trimestre, "hogares")
+
+    def barra_pronostico(df):
+        # Pronóstico según la trayectoria de cada provincia, con su intervalo de predicción
+        return go.Bar(
+            x=df['Provincia'],
+            y=df['pronostico'],
+            name=f"Pronóstico (intervalo {pronostico.NIVEL:.0%})",
+            marker_color="seagreen",
+            error_y=dict(
+                type="data",
+                symmetric=False,
+                array=df['superior'] - df['pronostico'],
+                arrayminus=df['pronostico'] - df['inferior'],
+            ),
+        )
+
+    def construir_kpi():
+        # Gráfico interactivo con Plotly
+        fig_kpi = go.Figure()
+
+        # Barras de Acceso Actual
+        fig_kpi.add_trace(go.Bar(
+            x=acceso_actual['Provincia'],
+            y=acceso_actual['Accesos por cada 100 hogares'],
+            name="Acceso Actual",
+            marker_color="skyblue"
+        ))
+
+        # Barras de Nuevo Acceso (Planificado)
+        fig_kpi.add_trace(go.Bar(
+            x=acceso_actual['Provincia'],
+            y=acceso_actual['Nuevo_acceso'],
+            name="Acceso Planificado (2%)",
+            marker_color="orange"
+        ))
+
+        # Barras del pronóstico del próximo trimestre
+        fig_kpi.add_trace(barra_pronostico(acceso_actual))
+
+        # Diseño del gráfico
+        fig_kpi.update_layout(
+            title="Incremento Planificado del 2% en el Próximo Trimestre",
+            xaxis_title="Provincia",
+            yaxis_title="Accesos por cada 100 Hogares",
+            barmode="group",  # Barras agrupadas
+            xaxis_tickangle=45,
+            template="plotly",
+            legend_title_text="Categoría"
+        )
+
+        return fig_kpi
+
+    fig_kpi = figuras.obtener(
+        "kpi_penetracion", construir_kpi, [kpis.ARCHIVO, pronostico.ARCHIVO], parametros=(anio, trimestre)
+    )
+
+    # Mostrar gráfico en Streamlit
+    mostrar(fig_kpi)
+
+    # Tabla con resultados detallados
+    st.subheader("📋 Datos Detallados por Provincia")
+    st.write("""
+    La probabilidad de alcanzar la meta sale del pronóstico de cada provincia: una tendencia más un efecto por trimestre
+    ajustados sobre sus últimos trimestres. Una probabilidad baja indica que la meta del 2% está por encima de su trayectoria.
+    """)
+    st.dataframe(acceso_actual[[
+        'Provincia', 'Accesos por cada 100 hogares', 'Nuevo_acceso', 'pronostico', 'inferior', 'superior',
+        'probabilidad_meta', 'Acceso Real Siguiente', 'Variación Real (%)', 'Meta Alcanzada',
+    ]].rename(columns={
+        'pronostico': 'Pronóstico',
+        'inferior': 'Pronóstico Mínimo',
+        'superior': 'Pronóstico Máximo',
+        'probabilidad_meta': 'Probabilidad de la Meta',
+    }))
+
+    # KPI - Aumento del 1% en el Índice de Velocidad Relativa (IVR)
+    st.header("📊 KPI: Aumentar en un 1% el Índice de Velocidad Relativa (IVR) por provincia")
+
+    st.write("""
+    El IVR compara la velocidad media de bajada de cada provincia con el promedio nacional del mismo trimestre, en el que
+    cada provincia pesa según sus accesos (100 = promedio). El objetivo es aumentar el IVR en un **1%** para el próximo trimestre.
+    """)
+
+    ivr_actual = kpis.consultar(tabla_kpis, anio, trimestre).dropna(subset=['ivr'])
+    ivr_actual = pronostico.agregar(ivr_actual, tabla_pronosticos, anio, trimestre, "ivr")
+
+    def construir_ivr():
+        fig_ivr = go.Figure()
+        fig_ivr.add_trace(go.Bar(x=ivr_actual['Provincia'], y=ivr_actual['ivr'], name="IVR Actual", marker_color="skyblue"))
+        fig_ivr.add_trace(go.Bar(x=ivr_actual['Provincia'], y=ivr_actual['ivr_meta'], name="IVR Planificado (1%)", marker_color="orange"))
+        fig_ivr.add_trace(barra_pronostico(ivr_actual))
+        fig_ivr.update_layout(
+            title="Incremento Planificado del 1% del IVR en el Próximo Trimestre",
+            xaxis_title="Provincia",
+            yaxis_title="IVR",
+            barmode="group",
+            xaxis_tickangle=45,
+            template="plotly",
+            legend_title_text="Categoría"
+        )
+        return fig_ivr
+
+    fig_ivr = figuras.obtener(
+        "kpi_ivr", construir_ivr, [kpis.ARCHIVO, pronostico.ARCHIVO], parametros=(anio, trimestre)
+    )
+    mostrar(fig_ivr)
+
+    st.dataframe(ivr_actual[[
+        'Provincia', 'mbps', 'ivr', 'ivr_meta', 'pronostico', 'inferior', 'superior', 'probabilidad_meta',
+        'ivr_siguiente', 'ivr_variacion', 'ivr_meta_alcanzada',
+    ]].rename(columns={
+        'mbps': 'Mbps (Media de bajada)',
+        'ivr': 'IVR',
+        'ivr_meta': 'IVR Planificado',
+        'pronostico': 'IVR Pronosticado',
+        'inferior': 'Pronóstico Mínimo',
+        'superior': 'Pronóstico Máximo',
+        'probabilidad_meta': 'Probabilidad de la Meta',
+        'ivr_siguiente': 'IVR Real Siguiente',
+        'ivr_variacion': 'Variación Real (%)',
+        'ivr_meta_alcanzada': 'Meta Alcanzada',
+    }))
+      
+    
+        # KPI 2 - Crecimiento Trimestral de Accesos por Tecnología
+    st.header("📊 KPI: Crecimiento Trimestral de Accesos por Tecnología")
+
+    st.write("""
+    Este gráfico muestra el crecimiento trimestral de accesos para cada tecnología de conexión, calculando la variación porcentual 
+    de accesos entre trimestres para tecnologías como ADSL, Cablemodem, Fibra Óptica, Wireless y Otros.
+    """)
+
+    # Ámbito del cálculo: el crecimiento se calculó dentro de cada serie, sin cruzar provincias
+    ambito = st.selectbox(
+        "Ámbito",
+        [kpis.TOTAL_NACIONAL] + sorted(set(tabla_kpis['Provincia'].astype(str)) - {kpis.TOTAL_NACIONAL}),
+    )
+    tasas_crecimiento = tabla_kpis[tabla_kpis['Provincia'] == ambito].copy()
+
+    def construir_crecimiento():
+        # Crear columna 'Periodo'
+        tasas_crecimiento['Periodo'] = tasas_crecimiento['Año'].astype(str) + " T" + tasas_crecimiento['Trimestre'].astype(str)
+
+        # Gráfico interactivo con Plotly
+        fig_crecimiento = go.Figure()
+
+        # Añadir trazas para cada tecnología
+        trazas = [
+            ('ADSL', 'ADSL', 'blue'),
+            ('Cablemodem', 'Cablemodem', 'green'),
+            ('Fibra óptica', 'Fibra Óptica', 'red'),
+            ('Wireless', 'Wireless', 'cyan'),
+            ('Otros', 'Otros', 'magenta'),
+        ]
+        for columna, nombre, color in trazas:
+            fig_crecimiento.add_trace(go.Scatter(
+                x=tasas_crecimiento['Periodo'], y=tasas_crecimiento[f'{columna}_qoq'],
+                mode='lines+markers', name=nombre, line=dict(color=color)
+            ))
+
+        # Configurar diseño del gráfico
+        fig_crecimiento.update_layout(
+            title="Crecimiento Trimestral de Accesos por Tecnología",
+            xaxis_title="Periodo",
+            yaxis_title="Crecimiento (%)",
+            xaxis=dict(tickangle=45),
+            legend_title="Tecnologías",
+            template="plotly",
+            hovermode="x unified"
+        )
+
+        return fig_crecimiento
+
+    fig_crecimiento = figuras.obtener(
+        "kpi_crecimiento", construir_crecimiento, [kpis.ARCHIVO], parametros=(ambito,)
+    )
+
+    # Mostrar gráfico en Streamlit
+    mostrar(fig_crecimiento)
+    
+        # Observaciones para KPI 2
+    st.subheader("📌 Observaciones por Tecnología")
+    st.markdown("""
+    **ADSL (azul):** Mantiene valores cercanos al 0% de crecimiento, lo que sugiere estancamiento o disminución en su adopción.
+
+    **Cablemodem (verde):** Tiene variaciones más regulares y picos moderados, lo que indica un crecimiento estable en ciertos períodos.
+
+    **Fibra óptica (rojo):** Muestra un crecimiento significativo. Los picos extremos (por encima de los 3.5 millones de %) que aparecían antes provenían de comparar filas de provincias distintas; ahora el crecimiento se calcula dentro de cada provincia o sobre el total nacional.
+
+    **Wireless (celeste):** Registra crecimientos pequeños pero constantes, con algunos picos moderados.
+
+    **Otros (morado):** Tiene variaciones más planas y cercanas a 0, lo que indica un crecimiento muy bajo.
+    """)
+
+    st.markdown("""
+    ### Tendencias Notables:
+    - **Fibra óptica:** Es la tecnología con mayor crecimiento, reflejando una transición hacia esta tecnología.
+    - **ADSL y Otros:** Están en declive o crecimiento insignificante, indicando que están siendo reemplazados por tecnologías más modernas como la fibra óptica.
+    - **Cablemodem y Wireless:** Tienen un crecimiento más estable, reflejando su adopción continua pero no tan acelerada como la fibra óptica.
+    """)
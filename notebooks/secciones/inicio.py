@@ -0,0 +1,21 @@
+"""Sección Inicio: solo texto, sin datos ni gráficos (la primera que ve cada sesión)."""
+import streamlit as st
+
+
+def render():
+    st.write("""
+    Este proyecto realiza un análisis exhaustivo del sector de telecomunicaciones en Argentina, utilizando datos del ENACOM.  
+    El análisis se divide en tres áreas clave:
+    
+    1. **Penetración del Servicio**  
+       Objetivo: Evaluar qué tan extendido está el servicio de internet en la población y en los hogares.
+    
+    2. **Calidad y Velocidad del Servicio**  
+       Objetivo: Identificar las velocidades promedio y su distribución entre provincias.
+    
+    3. **Tecnologías de Conexión**  
+       Objetivo: Analizar las tecnologías dominantes y su evolución.
+       
+    4. **KPI's**  
+       Objetivo: Presentacion de KPI's.
+    """)
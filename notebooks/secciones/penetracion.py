@@ -0,0 +1,156 @@
+"""Sección 1.1: Penetración del Servicio."""
+import plotly.express as px
+import streamlit as st
+
+import datos
+import figuras
+import tensor
+from secciones.comun import mostrar, obtener_derivado
+
+
+def render():
+    st.header("1.1 Penetración del Servicio")
+
+    st.write("""
+    Esta sección analiza qué tan extendido está el servicio de internet en la población y en los hogares de Argentina. 
+    Se utilizan los siguientes datasets:
+    - **Penetración-población**
+    - **Penetración-hogares**
+    - **Penetración-totales**
+    """)
+
+    # Carga de datos: las provincias salen del tensor mapeado en memoria (compartido entre procesos)
+    tensor_provincial = obtener_derivado(tensor.ARCHIVO, "la penetración por provincia")
+    penetracion_totales = datos.obtener("Penetracion_totales_limpio.csv")
+
+    if tensor_provincial is not None:
+        # Gráfico: Penetración de Internet en la Población por Provincia
+        st.subheader("Gráfico: Penetración de Internet en la Población por Provincia")
+        st.write("""
+        Este gráfico muestra la penetración de Internet en la población, expresada como **accesos por cada 100 habitantes**, para cada provincia de Argentina. 
+        Permite visualizar cómo varía la conectividad entre las diferentes provincias, destacando tanto a las más conectadas como a aquellas con menor cobertura.
+        """)
+
+        # La figura se arma una vez por versión del dataset
+        def construir_poblacion():
+            # Sumar por provincia del lado del servidor (Plotly apilaría una barra por trimestre)
+            penetracion_poblacion_sorted = tensor_provincial.por_provincia(
+                "penetracion:hab", columna="Accesos por cada 100 hab")
+
+            # Crear gráfico interactivo con Plotly
+            fig_poblacion = px.bar(
+                penetracion_poblacion_sorted,
+                x="Provincia",
+                y="Accesos por cada 100 hab",
+                color="Provincia",  # Colorea las barras por provincia
+                title="Accesos por cada 100 habitantes en las provincias",
+                labels={"Accesos por cada 100 hab": "Accesos por cada 100 habitantes"},
+                template="plotly",  # Estilo visual
+            )
+
+            # Mejorar diseño
+            fig_poblacion.update_layout(
+                xaxis_title="Provincia",
+                yaxis_title="Accesos por cada 100 habitantes",
+                xaxis_tickangle=90,  # Rotación de etiquetas del eje X
+                title_font_size=16
+            )
+
+            return fig_poblacion
+
+        fig_poblacion = figuras.obtener("poblacion", construir_poblacion, [tensor.ARCHIVO])
+
+        # Mostrar el gráfico en el dashboard
+        mostrar(fig_poblacion)
+
+        # Gráfico: Penetración de Internet en los Hogares por Región
+        st.subheader("Gráfico: Penetración de Internet en los Hogares por Región")
+        st.write("""
+        Este gráfico muestra la penetración de Internet en los hogares, expresada como **accesos por cada 100 hogares**, para cada provincia de Argentina. 
+        Permite comparar el nivel de conectividad entre las regiones, destacando diferencias significativas.
+        """)
+
+        def construir_hogares():
+            # Sumar por provincia del lado del servidor (Plotly apilaría una barra por trimestre)
+            penetracion_hogares_sorted = tensor_provincial.por_provincia(
+                "penetracion:hogares", columna="Accesos por cada 100 hogares")
+
+            # Crear gráfico interactivo con Plotly
+            fig_hogares = px.bar(
+                penetracion_hogares_sorted,
+                x="Provincia",
+                y="Accesos por cada 100 hogares",
+                color="Provincia",  # Colorea las barras por provincia
+                title="Accesos por cada 100 hogares en las provincias",
+                labels={"Accesos por cada 100 hogares": "Accesos por cada 100 hogares"},
+                template="plotly",  # Estilo visual
+            )
+
+            # Mejorar diseño
+            fig_hogares.update_layout(
+                xaxis_title="Provincia",
+                yaxis_title="Accesos por cada 100 hogares",
+                xaxis_tickangle=90,  # Rotación de etiquetas del eje X
+                title_font_size=16
+            )
+
+            return fig_hogares
+
+        fig_hogares = figuras.obtener("hogares", construir_hogares, [tensor.ARCHIVO])
+
+        # Mostrar el gráfico en el dashboard
+        mostrar(fig_hogares)
+
+    # Gráfico: Tendencias de Penetración Total a lo Largo del Tiempo
+    st.subheader("Gráfico: Tendencias de Penetración Total a lo Largo del Tiempo")
+    st.write("""
+    Este gráfico muestra la evolución de la penetración de Internet en hogares y población a lo largo del tiempo. 
+    Permite identificar patrones, crecimiento sostenido y variaciones anuales.
+    """)
+
+    def construir_tendencias():
+        # Crear gráfico interactivo de líneas con Plotly
+        # Series largas: LTTB deja a lo sumo figuras.MAX_PUNTOS puntos por indicador
+        columnas_penetracion = ["Accesos por cada 100 hogares", "Accesos por cada 100 hab"]
+        fig_tendencias = px.line(
+            figuras.reducir(penetracion_totales, columnas_penetracion),
+            x="Periodo",
+            y=columnas_penetracion,
+            markers=True,
+            labels={"value": "Accesos por cada 100", "variable": "Indicador"},
+            title="Tendencias de Accesos por cada 100 hogares y habitantes",
+            template="plotly"
+        )
+
+        # Mejorar diseño
+        fig_tendencias.update_layout(
+            xaxis_title="Periodo",
+            yaxis_title="Accesos por cada 100",
+            title_font_size=16,
+            legend_title_text="Indicador"
+        )
+
+        return fig_tendencias
+
+    fig_tendencias = figuras.obtener(
+        "tendencias_penetracion", construir_tendencias, ["Penetracion_totales_limpio.csv"]
+    )
+
+    # Mostrar el gráfico en el dashboard
+    mostrar(fig_tendencias)
+
+    # Insights Significativos
+    st.subheader("Insights Significativos")
+    st.markdown("""
+    - **Brechas Geográficas Persistentes**:
+      - Regiones urbanas como *Capital Federal, Tierra del Fuego y La Pampa* lideran en accesos por cada 100 habitantes y hogares.
+      - En contraste, provincias rurales como *Formosa, Chaco y San Juan* están significativamente rezagadas, reflejando desigualdades en infraestructura tecnológica y nivel de urbanización.
+    - **Crecimiento Sostenido en Penetración de Internet**:
+      - La penetración ha mejorado notablemente desde 2014, con valores más altos en 2024 tanto en accesos por cada 100 habitantes (cercano a 30) como por cada 100 hogares (cercano a 80).
+      - Esto sugiere un progreso constante en conectividad, aunque con variaciones entre regiones y hogares.
+    - **Diferencia Entre Hogares y Habitantes**:
+      - Siempre hay más accesos por hogar que por habitante, indicando que mientras los hogares se conectan más, el acceso individual todavía enfrenta desafíos.
+      - En 2024, la diferencia es marcada, reflejando que no todos los individuos dentro de los hogares acceden al servicio.
+    - **Patrones Temporales y Efectos Contextuales**:
+      - El crecimiento en conectividad muestra aceleraciones en ciertos períodos, como entre 2019 y 2021, lo cual puede estar relacionado con eventos globales (como la pandemia) que impulsaron la demanda de internet.
+    """)
@@ -0,0 +1,148 @@
+"""Sección 1.3: Tecnologías de Conexión."""
+import plotly.express as px
+import streamlit as st
+
+import cubo
+import datos
+import figuras
+from secciones.comun import mostrar, obtener_derivado
+
+
+def render():
+    st.header("1.3 Tecnologías de Conexión")
+
+    st.write("""
+    Esta sección analiza las tecnologías de conexión dominantes en Argentina y su evolución en el tiempo. 
+    Se busca identificar tendencias en el uso de tecnologías como Fibra Óptica, ADSL, Cablemódem, entre otras.
+    """)
+
+    # Incluir las hojas relevantes y los análisis realizados
+    st.write("""
+    **Hojas relevantes:**
+    - Accesos_tecnologia_localidad
+    - Totales Accesos Por Tecnología
+    - Accesos Por Tecnología
+
+    En esta área se realizaron los análisis de:
+    - Tecnologías Más Utilizadas
+    - Tecnologías dominantes
+    - Evolución del Uso de Tecnologías
+    """)
+
+    # Carga de datos
+    totales_accesos_por_tecnologia = datos.obtener("Totales_Accesos_Por_Tecnologia_limpio.csv")
+
+    # Gráfico: Evolución del Uso de Tecnologías
+    st.subheader("Gráfico: Evolución del Uso de Tecnologías")
+    st.write("""
+    Este gráfico muestra la evolución temporal del uso de diferentes tecnologías de conexión a Internet 
+    en Argentina desde el año 2014 hasta 2024, por trimestre.
+    """)
+
+    # El groupby y el melt se hacen una sola vez por versión del dataset
+    def construir_tecnologias():
+        # Seleccionar las columnas relevantes de tecnologías
+        columnas_tecnologias = ['ADSL', 'Cablemodem', 'Fibra óptica', 'Wireless', 'Otros']
+
+        # Sumar accesos por tecnología y periodo (año-trimestre)
+        tendencias = totales_accesos_por_tecnologia.groupby(['Año', 'Trimestre'])[columnas_tecnologias].sum().reset_index()
+        tendencias = figuras.reducir(tendencias, columnas_tecnologias)
+
+        # Crear una columna combinada para periodo (Año-Trimestre)
+        tendencias['Periodo'] = tendencias['Año'].astype(str) + "-T" + tendencias['Trimestre'].astype(str)
+
+        # Transformar el DataFrame para Plotly (long format)
+        tendencias_melted = tendencias.melt(id_vars='Periodo', value_vars=columnas_tecnologias, 
+                                            var_name='Tecnología', value_name='Cantidad de Accesos')
+
+        # Crear gráfico interactivo con Plotly
+        fig_tecnologias = px.line(
+            tendencias_melted,
+            x='Periodo',
+            y='Cantidad de Accesos',
+            color='Tecnología',
+            markers=True,
+            title="Tendencia Temporal de las Tecnologías de Conexión (2014-2024)",
+            labels={'Cantidad de Accesos': 'Accesos Totales', 'Periodo': 'Periodo (Año-Trimestre)'},
+            template="plotly"
+        )
+
+        # Mejorar el diseño
+        fig_tecnologias.update_layout(
+            xaxis_title="Periodo (Año-Trimestre)",
+            yaxis_title="Cantidad de Accesos",
+            legend_title="Tecnología",
+            title_font_size=16,
+            xaxis_tickangle=45
+        )
+
+        return fig_tecnologias
+
+    fig_tecnologias = figuras.obtener(
+        "tendencias_tecnologias", construir_tecnologias, ["Totales_Accesos_Por_Tecnologia_limpio.csv"]
+    )
+
+    # Mostrar el gráfico en Streamlit
+    mostrar(fig_tecnologias)
+
+    # Gráfico: Accesos por tecnología y ubicación (cubo preagregado por localidad)
+    st.subheader("Gráfico: Accesos por Tecnología y Ubicación")
+    st.write("""
+    Explorá los accesos por tecnología bajando de país a provincia, partido y localidad. 
+    Los totales salen del cubo preagregado del ETL, sin recorrer la tabla de localidades.
+    """)
+
+    cubo_tecnologia = obtener_derivado(cubo.ARCHIVO, "los accesos por tecnología y ubicación")
+    if cubo_tecnologia is not None:
+        provincia = st.selectbox("Provincia", ["Todas"] + list(cubo_tecnologia.provincias))
+        provincia = None if provincia == "Todas" else provincia
+        partido = None
+        if provincia is not None:
+            partido = st.selectbox("Partido", ["Todos"] + list(cubo_tecnologia.consultar(provincia).index))
+            partido = None if partido == "Todos" else partido
+
+        def construir_ubicacion():
+            total_ubicacion = cubo_tecnologia.total(provincia, partido).sort_values(ascending=False)
+            fig_ubicacion = px.bar(
+                x=total_ubicacion.index,
+                y=total_ubicacion.values,
+                title=f"Accesos por Tecnología: {partido or provincia or 'Total del país'}",
+                labels={'x': 'Tecnología', 'y': 'Accesos'},
+                template="plotly"
+            )
+            return fig_ubicacion
+
+        fig_ubicacion = figuras.obtener(
+            "ubicacion", construir_ubicacion, [cubo.ARCHIVO], parametros=(provincia, partido)
+        )
+        mostrar(fig_ubicacion)
+
+        # Desglose un nivel más abajo (provincias, partidos o localidades)
+        st.dataframe(cubo_tecnologia.consultar(provincia, partido))
+
+    # Insights Significativos
+    st.subheader("Insights Significativos")
+    st.write("""
+    A partir del análisis realizado, los siguientes insights se destacan como los más relevantes:
+    """)
+
+    # Detallar cada insight con markdown
+    st.markdown("""
+    - **Predominio del Cablemódem**:
+        - **Proporción**: Representa el 48% de los accesos acumulados, destacándose como la tecnología más utilizada en todo el país.
+        - **Razón de su éxito**: Esto se debe a su disponibilidad, rendimiento confiable y costos accesibles para usuarios finales.
+
+    - **Declive de tecnologías antiguas**:
+        - **ADSL**: Disminución sostenida de accesos (un 79% menos entre 2014 y 2024 Q1), reflejando una transición hacia tecnologías más modernas como la fibra óptica.
+        - **Dial-up**: Casi obsoleto, con una adopción mínima.
+
+    - **Crecimiento de Fibra Óptica**:
+        - **Explosión en adopción**: Aumentó más de 27 veces entre 2014 Q1 (150,323) y 2024 Q2 (4.1 millones).
+        - **Concentración urbana**: Su crecimiento es más notable en regiones urbanas con mayor infraestructura tecnológica.
+
+    - **Persistencia del Wireless**:
+        - Aunque minoritario, su adopción sigue aumentando, especialmente en áreas rurales o regiones de difícil acceso donde otras tecnologías no son viables.
+
+    - **Provincias líderes en modernización**:
+        - **Buenos Aires y Capital Federal**: Estas provincias tienen los mayores accesos a fibra óptica, reflejando inversiones tecnológicas y demanda en áreas urbanas.
+    """)
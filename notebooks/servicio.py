@@ -0,0 +1,364 @@
+"""Servicio HTTP/JSON de solo lectura sobre los datasets limpios.
+
+Expone los mismos números que muestra el dashboard para que otros equipos
+los consulten sin correr el notebook ni el dashboard::
+
+    python servicio.py --carpeta . --puerto 8765
+
+    GET /                                  rutas y versión de cada dataset
+    GET /provincias/penetracion            accesos por cada 100 hab y hogares
+    GET /provincias/velocidad              Mbps (Media de bajada)
+    GET /provincias/tecnologias            accesos por tecnología
+    GET /provincias/rangos                 accesos por rango de velocidad
+    GET /localidades/tecnologias           accesos por tecnología y localidad (en trozos)
+    GET /localidades/velocidades           accesos por velocidad y localidad (en trozos)
+
+Filtros: ``provincia`` (repetible o separada por comas), ``desde``/``hasta``
+(trimestres ``"2024-T2"``, inclusive) en las rutas por provincia, y el
+indicador con el nombre de su tipo (``tecnologia=ADSL,Fibra óptica``,
+``rango=+_30_Mbps``, ``penetracion=hogares``). Las rutas por localidad
+filtran por ``provincia``, ``partido``, ``localidad`` y ``tecnologia``. Un
+parámetro que la ruta no admite se responde con ``400``.
+
+Las rutas por provincia cortan el tensor provincial mapeado en memoria (ver
+``tensor``), cargado una vez por proceso con ``datos.obtener``. Cada
+respuesta lleva un ``ETag`` calculado a partir de la ruta, los filtros y la
+versión en disco de su dataset: con ``If-None-Match`` se responde ``304``
+sin recalcular, y las respuestas por provincia quedan en una caché LRU que
+se invalida sola cuando el ETL reescribe el dataset. Las tablas por
+localidad no se guardan en la caché: se envían con ``Transfer-Encoding:
+chunked`` de a ``FILAS_POR_TROZO`` filas, esperando a que el cliente las
+reciba antes de serializar el trozo siguiente.
+
+El servidor usa ``asyncio`` de la biblioteca estándar, con conexiones
+persistentes (HTTP/1.1 keep-alive); los cálculos con pandas corren en un
+hilo aparte para no frenar las respuestas que salen de la caché.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import datos
+import tensor
+
+PUERTO = 8765
+MAX_RESPUESTAS = 512
+FILAS_POR_TROZO = 5000
+PERIODO = re.compile(r"^\d{4}-T[1-4]$")
+# Ruta por provincia -> tipo de indicador del tensor (también el nombre de su filtro)
+TEMAS = {
+    "penetracion": "penetracion",
+    "velocidad": "velocidad",
+    "tecnologias": "tecnologia",
+    "rangos": "rango",
+}
+# Ruta por localidad -> (dataset limpio, {filtro admitido: columna del dataset})
+LOCALIDADES = {
+    "tecnologias": ("Accesos_tecnologia_localidad_limpio.csv", {
+        "provincia": "Provincia", "partido": "Partido", "localidad": "Localidad", "tecnologia": "Tecnologia",
+    }),
+    "velocidades": ("Acc_vel_loc_sinrangos_limpio.csv", {
+        "provincia": "Provincia", "partido": "Partido", "localidad": "Localidad",
+    }),
+}
+# Ruta -> parámetros admitidos; cualquier otro se rechaza (cambiaría el ETag sin cambiar la respuesta)
+FILTROS = {f"/provincias/{tema}": ("provincia", "desde", "hasta", tipo) for tema, tipo in TEMAS.items()} | {
+    f"/localidades/{tema}": tuple(admitidos) for tema, (_, admitidos) in LOCALIDADES.items()
+}
+# Indicador del tensor -> columna del dataset limpio
+COLUMNAS = {indicador: columna for columnas in tensor.FUENTES.values() for columna, indicador in columnas.items()}
+
+log = logging.getLogger(__name__)
+
+
+class ErrorConsulta(Exception):
+    """Consulta inválida: se responde con ``estado`` y el mensaje en JSON."""
+
+    def __init__(self, mensaje, estado=HTTPStatus.BAD_REQUEST):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _valores(parametros, nombre):
+    """Valores de un filtro, repetido (``?provincia=a&provincia=b``) o separado por comas, ordenados."""
+    valores = [v.strip() for valor in parametros.get(nombre, []) for v in valor.split(",") if v.strip()]
+    return sorted(set(valores))
+
+
+def _periodo(parametros, nombre):
+    valores = parametros.get(nombre)
+    if not valores:
+        return None
+    if not PERIODO.match(valores[-1]):
+        raise ErrorConsulta(f"{nombre} debe tener la forma AAAA-TN (p. ej. 2024-T2), no {valores[-1]!r}")
+    return valores[-1]
+
+
+def tabla_provincial(t, tema, parametros):
+    """Filas (Año, Trimestre, Provincia, indicadores...) del tensor según los filtros de ``parametros``."""
+    tipo = TEMAS[tema]
+    disponibles = [i for i in t.indicadores if i.partition(":")[0] == tipo]
+    pedidos = _valores(parametros, tipo)
+    indicadores = [i for i in disponibles if not pedidos or i.partition(":")[2] in pedidos]
+    faltantes = set(pedidos) - {i.partition(":")[2] for i in indicadores}
+    if faltantes:
+        opciones = ", ".join(i.partition(":")[2] for i in disponibles)
+        raise ErrorConsulta(f"{tipo} desconocido: {', '.join(sorted(faltantes))} (hay: {opciones})")
+
+    provincias = _valores(parametros, "provincia") or list(t.provincias)
+    desde, hasta = _periodo(parametros, "desde"), _periodo(parametros, "hasta")
+    # Las etiquetas "AAAA-TN" ordenan como los trimestres: un rango fuera de los datos se recorta
+    periodos = t.periodos[(t.periodos >= (desde or "")) & (t.periodos <= (hasta or "9999"))]
+    try:
+        valores = np.asarray(t.seleccionar(provincias, list(periodos), indicadores))
+    except KeyError as error:
+        raise ErrorConsulta(error.args[0]) from None
+
+    cantidad = len(periodos)
+    df = pd.DataFrame(valores.reshape(len(provincias) * cantidad, len(indicadores)),
+                      columns=[COLUMNAS[i] for i in indicadores])
+    df.insert(0, "Año", np.tile([int(p[:4]) for p in periodos], len(provincias)))
+    df.insert(1, "Trimestre", np.tile([int(p[-1]) for p in periodos], len(provincias)))
+    df.insert(2, "Provincia", np.repeat(provincias, cantidad))
+    # Provincia y trimestre sin ningún dato del tema
+    return df.dropna(how="all", subset=df.columns[3:]).reset_index(drop=True)
+
+
+def tabla_localidades(tema, parametros, carpeta="."):
+    """Filas del dataset por localidad de ``tema`` con los filtros de ``parametros``."""
+    archivo, admitidos = LOCALIDADES[tema]
+    filtros = []
+    for nombre, columna in admitidos.items():
+        valores = _valores(parametros, nombre)
+        if valores:
+            filtros.append((columna, "in", valores))
+    faltantes = {columna for columna, _, _ in filtros} - set(almacen.columnas(archivo, carpeta))
+    if faltantes:
+        raise ErrorConsulta(f"{archivo} no tiene las columnas para filtrar: {', '.join(sorted(faltantes))}")
+    return almacen.leer(archivo, filtros=filtros or None, carpeta=carpeta)
+
+
+def _registros(df):
+    """JSON de ``df`` como lista de objetos (NaN como ``null``)."""
+    return df.to_json(orient="records", force_ascii=False).encode()
+
+
+class Servicio:
+    """Resuelve las consultas; ``atender`` es el manejador de conexiones de ``asyncio.start_server``."""
+
+    def __init__(self, carpeta=".", max_respuestas=MAX_RESPUESTAS, filas_por_trozo=FILAS_POR_TROZO):
+        self.carpeta = str(carpeta)
+        self.max_respuestas = max_respuestas
+        self.filas_por_trozo = filas_por_trozo
+        self._cache = OrderedDict()
+        self._bloqueo = threading.Lock()
+        self.estadisticas = {"peticiones": 0, "aciertos": 0, "calculadas": 0, "no_modificadas": 0,
+                             "en_trozos": 0, "errores": 0}
+
+    # Consultas
+
+    def _version(self, archivo):
+        try:
+            return datos.version(archivo, self.carpeta)
+        except FileNotFoundError:
+            raise ErrorConsulta(f"No existe {archivo}: corré el ETL (python etl.py)",
+                                HTTPStatus.SERVICE_UNAVAILABLE) from None
+
+    def _etag(self, ruta, parametros, version):
+        clave = json.dumps([ruta, sorted(parametros.items()), version[1:]], ensure_ascii=False)
+        return '"' + hashlib.blake2b(clave.encode(), digest_size=12).hexdigest() + '"'
+
+    def _provincial(self, tema, parametros):
+        t = datos.obtener(tensor.ARCHIVO, self.carpeta)
+        df = tabla_provincial(t, tema, parametros)
+        return b'{"tema":' + json.dumps(tema).encode() + b',"filas":' + str(len(df)).encode() \
+            + b',"datos":' + _registros(df) + b"}"
+
+    def _indice(self):
+        versiones = {}
+        for archivo in [tensor.ARCHIVO] + [archivo for archivo, _ in LOCALIDADES.values()]:
+            try:
+                _, mtime, tamanio = datos.version(archivo, self.carpeta)
+                versiones[archivo] = {"modificado_ns": mtime, "bytes": tamanio}
+            except FileNotFoundError:
+                versiones[archivo] = None
+        return json.dumps({
+            "rutas": [f"/provincias/{tema}" for tema in TEMAS] + [f"/localidades/{tema}" for tema in LOCALIDADES],
+            "filtros": {ruta: list(admitidos) for ruta, admitidos in FILTROS.items()},
+            "versiones": versiones,
+            "estadisticas": self.estadisticas,
+        }, ensure_ascii=False).encode()
+
+    # HTTP
+
+    async def atender(self, lector, escritor):
+        """Atiende las peticiones de una conexión (keep-alive) hasta que el cliente la cierre."""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, objetivo, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, HTTPStatus.BAD_REQUEST, {"error": "Línea de petición inválida"})
+                    break
+                encabezados = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                if int(encabezados.get("content-length", 0) or 0):
+                    await lector.readexactly(int(encabezados["content-length"]))
+                seguir = version == "HTTP/1.1" and encabezados.get("connection", "").lower() != "close"
+                await self._resolver(escritor, metodo, objetivo, encabezados, seguir)
+                if not seguir:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _resolver(self, escritor, metodo, objetivo, encabezados, seguir):
+        self.estadisticas["peticiones"] += 1
+        partes = urlsplit(objetivo)
+        ruta = partes.path.rstrip("/") or "/"
+        parametros = {nombre: sorted(valores) for nombre, valores in parse_qs(partes.query).items()}
+        cabeza = metodo == "HEAD"
+        try:
+            if metodo not in ("GET", "HEAD"):
+                raise ErrorConsulta("Solo GET y HEAD", HTTPStatus.METHOD_NOT_ALLOWED)
+            if ruta == "/":
+                return await self._responder(escritor, HTTPStatus.OK, self._indice(), seguir=seguir, cabeza=cabeza)
+            grupo, _, tema = ruta.strip("/").partition("/")
+            if grupo == "provincias" and tema in TEMAS:
+                archivo = tensor.ARCHIVO
+            elif grupo == "localidades" and tema in LOCALIDADES:
+                archivo = LOCALIDADES[tema][0]
+            else:
+                raise ErrorConsulta(f"Ruta desconocida: {ruta}", HTTPStatus.NOT_FOUND)
+            desconocidos = set(parametros) - set(FILTROS[ruta])
+            if desconocidos:
+                raise ErrorConsulta(f"Parámetros desconocidos: {', '.join(sorted(desconocidos))} "
+                                    f"(admitidos: {', '.join(FILTROS[ruta])})")
+
+            etag = self._etag(ruta, parametros, self._version(archivo))
+            if etag in [e.strip() for e in encabezados.get("if-none-match", "").split(",")]:
+                self.estadisticas["no_modificadas"] += 1
+                return await self._responder(escritor, HTTPStatus.NOT_MODIFIED, None, etag, seguir)
+            if grupo == "localidades":
+                return await self._en_trozos(escritor, tema, parametros, etag, seguir, cabeza)
+
+            clave = (ruta, json.dumps(sorted(parametros.items()), ensure_ascii=False))
+            with self._bloqueo:
+                entrada = self._cache.get(clave)
+                if entrada is not None and entrada[0] == etag:
+                    self._cache.move_to_end(clave)
+            if entrada is not None and entrada[0] == etag:
+                self.estadisticas["aciertos"] += 1
+                cuerpo = entrada[1]
+            else:
+                self.estadisticas["calculadas"] += 1
+                cuerpo = await asyncio.get_running_loop().run_in_executor(
+                    None, partial(self._provincial, tema, parametros))
+                with self._bloqueo:
+                    self._cache[clave] = (etag, cuerpo)
+                    self._cache.move_to_end(clave)
+                    while len(self._cache) > self.max_respuestas:
+                        self._cache.popitem(last=False)
+            await self._responder(escritor, HTTPStatus.OK, cuerpo, etag, seguir, cabeza)
+        except ErrorConsulta as error:
+            self.estadisticas["errores"] += 1
+            await self._responder(escritor, error.estado, {"error": str(error)}, seguir=seguir)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception:
+            log.exception("Error al resolver %s %s", metodo, objetivo)
+            self.estadisticas["errores"] += 1
+            await self._responder(escritor, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Error interno"},
+                                  seguir=False)
+
+    async def _en_trozos(self, escritor, tema, parametros, etag, seguir, cabeza):
+        """Envía la tabla por localidad como un arreglo JSON en trozos (``Transfer-Encoding: chunked``)."""
+        self.estadisticas["en_trozos"] += 1
+        loop = asyncio.get_running_loop()
+        df = await loop.run_in_executor(None, partial(tabla_localidades, tema, parametros, self.carpeta))
+        escritor.write(self._encabezados(HTTPStatus.OK, etag, seguir, {"Transfer-Encoding": "chunked"}))
+        if cabeza:
+            return await escritor.drain()
+
+        def trozo(datos_):
+            escritor.write(f"{len(datos_):x}\r\n".encode() + datos_ + b"\r\n")
+
+        trozo(b'{"tema":' + json.dumps(tema).encode() + b',"filas":' + str(len(df)).encode() + b',"datos":[')
+        for inicio in range(0, len(df), self.filas_por_trozo):
+            registros = _registros(df.iloc[inicio:inicio + self.filas_por_trozo])[1:-1]
+            trozo((b"," if inicio else b"") + registros)
+            # Contrapresión: no se serializa el siguiente trozo hasta que el cliente lee este
+            await escritor.drain()
+        trozo(b"]}")
+        escritor.write(b"0\r\n\r\n")
+        await escritor.drain()
+
+    def _encabezados(self, estado, etag=None, seguir=True, extra=None):
+        lineas = [f"HTTP/1.1 {estado.value} {estado.phrase}", "Content-Type: application/json; charset=utf-8",
+                  f"Connection: {'keep-alive' if seguir else 'close'}"]
+        if etag:
+            lineas += [f"ETag: {etag}", "Cache-Control: no-cache"]
+        lineas += [f"{nombre}: {valor}" for nombre, valor in (extra or {}).items()]
+        return ("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1")
+
+    async def _responder(self, escritor, estado, cuerpo, etag=None, seguir=True, cabeza=False):
+        if isinstance(cuerpo, dict):
+            cuerpo = json.dumps(cuerpo, ensure_ascii=False).encode()
+        cuerpo = cuerpo or b""
+        escritor.write(self._encabezados(estado, etag, seguir, {"Content-Length": len(cuerpo)}))
+        if not cabeza and estado != HTTPStatus.NOT_MODIFIED:
+            escritor.write(cuerpo)
+        await escritor.drain()
+
+
+async def servir(carpeta=".", host="127.0.0.1", puerto=PUERTO, listo=None):
+    """Atiende hasta que se cancele; ``listo(puerto)`` se llama cuando ya escucha."""
+    servicio = Servicio(carpeta)
+    servidor = await asyncio.start_server(servicio.atender, host, puerto)
+    puerto = servidor.sockets[0].getsockname()[1]
+    if listo is not None:
+        listo(puerto)
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de solo lectura sobre los datasets limpios")
+    parser.add_argument("--carpeta", default=".", help="carpeta con los datasets limpios")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO, help="0 elige un puerto libre")
+    args = parser.parse_args(argv)
+
+    def listo(puerto):
+        print(f"Sirviendo {Path(args.carpeta).resolve()} en http://{args.host}:{puerto}/", flush=True)
+
+    try:
+        asyncio.run(servir(args.carpeta, args.host, args.puerto, listo))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
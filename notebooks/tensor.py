@@ -0,0 +1,223 @@
+"""Tensor denso provincia × trimestre × indicador, guardado para mapear en memoria.
+
+Casi todos los cortes del EDA y del dashboard tienen la misma forma: las
+provincias, los trimestres y algún indicador de las hojas por provincia
+(accesos por tecnología y por rango de velocidad, penetración por cada 100
+habitantes y hogares, velocidad media de bajada). El ETL los junta una sola
+vez en un arreglo ``float64`` de forma ``(provincias, trimestres,
+indicadores)``, con NaN donde falta el dato, y lo guarda en
+``tensor_provincias.npy`` con sus etiquetas en ``tensor_provincias.json``.
+
+``Tensor.cargar`` abre el ``.npy`` con ``np.load(mmap_mode="r")``: los datos
+no se copian al proceso sino que se leen de la caché de páginas del sistema
+operativo, así varios procesos del dashboard comparten una sola copia física.
+``seleccionar`` recorta por nombre de provincia, trimestre (``"2024-T2"``) e
+indicador (``"tecnologia:ADSL"``) devolviendo vistas sin copia (salvo listas
+de etiquetas no contiguas) y ``reducir`` suma, promedia, etc. sobre ejes
+enteros sin ``groupby``.
+
+El archivo se reemplaza de forma atómica: los procesos que ya lo tenían
+mapeado siguen leyendo la versión anterior hasta que vuelven a cargarlo.
+"""
+import json
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import almacen
+
+ARCHIVO = "tensor_provincias.npy"
+ETIQUETAS = "tensor_provincias.json"
+EJES = ("provincia", "periodo", "indicador")
+# Dataset limpio -> {columna: indicador}
+FUENTES = {
+    "Accesos_Por_Tecnologia_limpio.csv": {
+        columna: f"tecnologia:{columna}" for columna in ["ADSL", "Cablemodem", "Fibra óptica", "Wireless", "Otros",
+                                                         "Total"]
+    },
+    "accesos_por_rangos_limpio.csv": {
+        columna: f"rango:{columna}" for columna in [
+            "HASTA_512_kbps", "+_512_Kbps_-_1_Mbps", "+_1_Mbps_-_6_Mbps", "+_6_Mbps_-_10_Mbps",
+            "+_10_Mbps_-_20_Mbps", "+_20_Mbps_-_30_Mbps", "+_30_Mbps", "OTROS", "Total",
+        ]
+    },
+    "Penetracion_poblacion_limpio.csv": {"Accesos por cada 100 hab": "penetracion:hab"},
+    "Penetracion_hogares_limpio.csv": {"Accesos por cada 100 hogares": "penetracion:hogares"},
+    "Velocidad_por_provincia_limpio.csv": {"Mbps (Media de bajada)": "velocidad:mbps"},
+}
+OPERACIONES = {"suma": np.nansum, "media": np.nanmean, "minimo": np.nanmin, "maximo": np.nanmax}
+
+
+def etiqueta_periodo(periodo):
+    """``Año * 4 + Trimestre - 1`` -> ``"2024-T2"``."""
+    return f"{periodo // 4}-T{periodo % 4 + 1}"
+
+
+class Tensor:
+    """Valores ``(provincia, periodo, indicador)`` con las etiquetas de cada eje."""
+
+    def __init__(self, valores, provincias, inicio, indicadores):
+        self.valores = valores
+        self.provincias = np.asarray(provincias, dtype=str)
+        self.inicio = int(inicio)
+        self.periodos = np.array([etiqueta_periodo(self.inicio + p) for p in range(valores.shape[1])])
+        self.indicadores = np.asarray(indicadores, dtype=str)
+        if valores.shape != (len(self.provincias), len(self.periodos), len(self.indicadores)):
+            raise ValueError(f"Forma {valores.shape} incompatible con las etiquetas")
+        self._posiciones = {
+            eje: {etiqueta: i for i, etiqueta in enumerate(self.etiquetas(eje))} for eje in EJES
+        }
+
+    @classmethod
+    def construir(cls, tablas, fuentes=FUENTES):
+        """Tensor a partir de ``{dataset: DataFrame limpio}`` con una fila por (Año, Trimestre, Provincia)."""
+        indicadores = [i for columnas in fuentes.values() for i in columnas.values()]
+        # Las notas al pie y filas en blanco de las hojas no tienen período ni provincia
+        tablas = {archivo: df.dropna(subset=["Año", "Trimestre", "Provincia"]) for archivo, df in tablas.items()}
+        periodos, provincias = {}, set()
+        for archivo, df in tablas.items():
+            periodos[archivo] = df["Año"].to_numpy(dtype=int) * 4 + df["Trimestre"].to_numpy(dtype=int) - 1
+            provincias.update(df["Provincia"].astype(str).unique())
+        inicio = min(p.min() for p in periodos.values())
+        fin = max(p.max() for p in periodos.values())
+        provincias = np.array(sorted(provincias))
+
+        valores = np.full((len(provincias), fin - inicio + 1, len(indicadores)), np.nan)
+        for archivo, df in tablas.items():
+            fila = np.searchsorted(provincias, df["Provincia"].astype(str).to_numpy())
+            periodo = periodos[archivo] - inicio
+            for columna, indicador in fuentes[archivo].items():
+                valores[fila, periodo, indicadores.index(indicador)] = df[columna].to_numpy(dtype=float)
+        return cls(valores, provincias, inicio, indicadores)
+
+    def guardar(self, carpeta="."):
+        """Escribe el ``.npy`` y sus etiquetas, reemplazando los anteriores de forma atómica."""
+        carpeta = Path(carpeta)
+        etiquetas = {"provincias": self.provincias.tolist(), "inicio": self.inicio,
+                     "indicadores": self.indicadores.tolist()}
+        for nombre, escribir in (
+            # Primero las etiquetas: quien vea el .npy nuevo ya encuentra las suyas
+            (ETIQUETAS, lambda archivo: archivo.write(json.dumps(etiquetas, ensure_ascii=False).encode())),
+            (ARCHIVO, lambda archivo: np.save(archivo, np.ascontiguousarray(self.valores))),
+        ):
+            temporal = carpeta / f".{nombre}.{os.getpid()}"
+            with open(temporal, "wb") as archivo:
+                escribir(archivo)
+            os.replace(temporal, carpeta / nombre)
+        return carpeta / ARCHIVO
+
+    @classmethod
+    def cargar(cls, ruta=ARCHIVO, mapear=True):
+        """Abre el tensor de ``ruta``; con ``mapear`` los valores quedan mapeados en memoria (solo lectura)."""
+        ruta = Path(ruta)
+        etiquetas = json.loads((ruta.parent / ETIQUETAS).read_text(encoding="utf-8"))
+        valores = np.load(ruta, mmap_mode="r" if mapear else None, allow_pickle=False)
+        return cls(valores, etiquetas["provincias"], etiquetas["inicio"], etiquetas["indicadores"])
+
+    def etiquetas(self, eje):
+        return {"provincia": self.provincias, "periodo": self.periodos, "indicador": self.indicadores}[eje]
+
+    def _indice(self, eje, seleccion):
+        """Índice de numpy de ``seleccion`` en ``eje``: un entero, un corte o (listas salteadas) un arreglo."""
+        if seleccion is None:
+            return slice(None)
+        posiciones = self._posiciones[eje]
+        try:
+            if isinstance(seleccion, slice):
+                desde = None if seleccion.start is None else posiciones[seleccion.start]
+                hasta = None if seleccion.stop is None else posiciones[seleccion.stop] + 1
+                return slice(desde, hasta)
+            if isinstance(seleccion, str):
+                return posiciones[seleccion]
+            indices = np.array([posiciones[etiqueta] for etiqueta in seleccion], dtype=int)
+        except KeyError as error:
+            raise KeyError(f"{eje.capitalize()} desconocido: {error.args[0]!r}") from None
+        # Posiciones consecutivas: un corte, que sigue siendo una vista
+        if len(indices) and (np.diff(indices) == 1).all():
+            return slice(indices[0], indices[-1] + 1)
+        return indices
+
+    def seleccionar(self, provincia=None, periodo=None, indicador=None):
+        """Recorte de los valores; cada eje acepta una etiqueta, una lista o un ``slice`` de etiquetas.
+
+        Una etiqueta suelta quita su eje del resultado. Salvo las listas de
+        etiquetas no consecutivas, el resultado es una vista sin copia.
+        """
+        indices = [self._indice(eje, s) for eje, s in zip(EJES, (provincia, periodo, indicador))]
+        arreglos = [i for i in indices if isinstance(i, np.ndarray)]
+        if len(arreglos) > 1:
+            # Varias listas salteadas se combinan por producto y no elemento a elemento: de a un eje,
+            # del último al primero para que quitar un eje no corra la posición de los anteriores
+            valores = self.valores
+            for eje in reversed(range(len(EJES))):
+                valores = valores[(slice(None),) * eje + (indices[eje],)]
+            return valores
+        return self.valores[tuple(indices)]
+
+    def _ejes(self, provincia, periodo, indicador):
+        """Ejes que quedan en ``seleccionar`` con sus etiquetas."""
+        ejes = {}
+        for eje, seleccion in zip(EJES, (provincia, periodo, indicador)):
+            if not isinstance(seleccion, str):
+                ejes[eje] = self.etiquetas(eje)[self._indice(eje, seleccion)]
+        return ejes
+
+    def tabla(self, indicador, provincia=None, periodo=None):
+        """Un indicador como tabla provincias × trimestres (sin copiar los valores)."""
+        ejes = self._ejes(provincia, periodo, None)
+        return pd.DataFrame(
+            self.seleccionar(provincia, periodo, indicador),
+            index=pd.Index(ejes["provincia"], name="Provincia"),
+            columns=pd.Index(ejes["periodo"], name="Periodo"),
+            copy=False,
+        )
+
+    def por_provincia(self, indicador, operacion="suma", columna=None, periodo=None):
+        """``indicador`` reducido sobre los trimestres, una fila por provincia de mayor a menor.
+
+        Columnas ``Provincia`` y ``columna`` (por defecto el nombre del
+        indicador): las barras por provincia ya sumadas, sin ``groupby``.
+        """
+        valores = self.reducir(operacion, "periodo", periodo=periodo, indicador=indicador)
+        return (valores.sort_values(ascending=False, kind="stable").rename_axis("Provincia")
+                .reset_index(name=columna or indicador))
+
+    def reducir(self, operacion, eje, provincia=None, periodo=None, indicador=None):
+        """``operacion`` (``"suma"``, ``"media"``, ``"minimo"``, ``"maximo"``) sobre ``eje`` (o una tupla de ejes).
+
+        Ignora los faltantes. Devuelve un número, una ``Series`` o un
+        ``DataFrame`` etiquetados con los ejes que quedan.
+        """
+        ejes = self._ejes(provincia, periodo, indicador)
+        reducidos = (eje,) if isinstance(eje, str) else tuple(eje)
+        faltantes = [e for e in reducidos if e not in ejes]
+        if faltantes:
+            raise ValueError(f"No se puede reducir sobre {faltantes}: no están en la selección")
+        posiciones = tuple(list(ejes).index(e) for e in reducidos)
+        with warnings.catch_warnings():
+            # Las celdas sin ningún dato quedan NaN (o 0 en la suma), sin avisos
+            warnings.simplefilter("ignore", RuntimeWarning)
+            resultado = np.asarray(OPERACIONES[operacion](self.seleccionar(provincia, periodo, indicador),
+                                                          axis=posiciones))
+        restantes = [e for e in ejes if e not in reducidos]
+        if not restantes:
+            return float(resultado)
+        if len(restantes) == 1:
+            return pd.Series(resultado, index=pd.Index(ejes[restantes[0]], name=restantes[0]))
+        return pd.DataFrame(resultado, index=pd.Index(ejes[restantes[0]], name=restantes[0]),
+                            columns=pd.Index(ejes[restantes[1]], name=restantes[1]))
+
+
+def materializar(carpeta=".", destino=None, fuentes=FUENTES):
+    """Construye el tensor desde los datasets limpios de ``fuentes`` y lo guarda en ``destino``."""
+    destino = Path(destino or carpeta)
+    tablas = {
+        archivo: almacen.leer(archivo, columnas=["Año", "Trimestre", "Provincia"] + list(columnas), carpeta=carpeta)
+        for archivo, columnas in fuentes.items()
+    }
+    tensor = Tensor.construir(tablas, fuentes)
+    tensor.guardar(destino)
+    return tensor
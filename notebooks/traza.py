@@ -0,0 +1,299 @@
+"""Instrumentación por tramos del ETL y del dashboard.
+
+Se activa con la variable de entorno ``TRAZA`` (la ruta del archivo de
+traza; con ``TRAZA=1`` se usa ``traza.json``)::
+
+    TRAZA=traza.json python etl.py Internet.xlsx
+    TRAZA=traza.json streamlit run dashboard.py
+    python traza.py traza.json          # tabla resumen de una traza
+
+Cada tramo (``tramo``, ``envolver``) registra su duración, las filas que
+produjo y la variación de memoria residente del proceso. Las etapas del ETL
+(ver ``etapas``) y las secciones del dashboard (ver ``figuras``) abren su
+tramo solas; adentro hay tramos para los puntos calientes: lectura del libro,
+conversiones numéricas, ``groupby``, escritura de CSV/Parquet, carga de
+datasets, armado de figuras y ``st.plotly_chart``.
+
+Los tramos se exportan de dos formas:
+
+- al archivo de traza, en el formato de eventos de Chrome (arreglo JSON al
+  que se le agregan eventos al final, sin reescribirlo; el ``]`` final es
+  opcional en ese formato), que se abre en ``chrome://tracing`` o Perfetto;
+- a ``<traza>_resumen.csv``: por nombre de tramo, llamadas, tiempo total y
+  media, p95 y máximo de las últimas ``VENTANA`` llamadas.
+
+Desactivada, ``tramo`` devuelve siempre el mismo contexto vacío y
+``envolver`` devuelve la función sin tocar, así el costo es una llamada.
+Los tramos que corren en otros procesos del pool vuelven con el resultado de
+su etapa (``extraer`` / ``agregar``).
+"""
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+VARIABLE = "TRAZA"
+RUTA_POR_DEFECTO = "traza.json"
+# Llamadas por tramo que entran en el resumen
+VENTANA = 1000
+# Segundos mínimos entre exportaciones de un proceso que no termina (el dashboard)
+INTERVALO = 5.0
+COLUMNAS_RESUMEN = ["tramo", "categoria", "llamadas", "total_ms", "media_ms", "p95_ms", "max_ms", "filas",
+                    "memoria_mb"]
+
+_ruta = None
+_ultima_exportacion = 0.0
+_eventos = []
+_estadisticas = {}
+_bloqueo = threading.Lock()
+# (pid, descriptor de /proc/self/statm) abierto una vez por proceso
+_estado = None
+_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def activar(ruta=RUTA_POR_DEFECTO):
+    """Activa la instrumentación en este proceso, exportando a ``ruta``."""
+    global _ruta
+    _ruta = Path(ruta)
+
+
+def desactivar():
+    global _ruta
+    _ruta = None
+    with _bloqueo:
+        _eventos.clear()
+        _estadisticas.clear()
+
+
+def activa():
+    return _ruta is not None
+
+
+def ruta():
+    return _ruta
+
+
+def _memoria():
+    """Memoria residente actual del proceso en bytes (``None`` si no se puede leer)."""
+    global _estado
+    # /proc/self se resuelve al abrir: un proceso del pool (fork) abre el suyo
+    if _estado is None or _estado[0] != os.getpid():
+        try:
+            _estado = (os.getpid(), os.open("/proc/self/statm", os.O_RDONLY))
+        except OSError:
+            _estado = (os.getpid(), None)
+    if _estado[1] is None:
+        return None
+    return int(os.pread(_estado[1], 128, 0).split()[1]) * _PAGINA
+
+
+def filas(objeto):
+    """Filas de un resultado (tabla, arreglo, ``(ruta, filas)`` o ``trozos.Trozos``); ``None`` si no tiene."""
+    if isinstance(objeto, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(objeto)
+    if isinstance(objeto, tuple) and len(objeto) == 2 and isinstance(objeto[1], (int, np.integer)):
+        return int(objeto[1])
+    if isinstance(getattr(objeto, "filas", None), list):
+        return sum(objeto.filas)
+    return None
+
+
+class Tramo:
+    """Un tramo abierto; ``anotar`` agrega datos al evento (p. ej. ``filas``)."""
+
+    __slots__ = ("nombre", "categoria", "datos", "_inicio", "_memoria")
+
+    def __init__(self, nombre, categoria, datos):
+        self.nombre = nombre
+        self.categoria = categoria
+        self.datos = datos
+
+    def anotar(self, **datos):
+        self.datos.update(datos)
+
+    def __enter__(self):
+        self._memoria = _memoria()
+        self._inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, error, _traza):
+        fin = time.perf_counter_ns()
+        memoria = _memoria()
+        datos = {k: v for k, v in self.datos.items() if v is not None}
+        if memoria is not None and self._memoria is not None:
+            datos["memoria_kb"] = (memoria - self._memoria) // 1024
+        if tipo is not None:
+            datos["error"] = tipo.__name__
+        # perf_counter es el reloj monótono del sistema: los tiempos de distintos procesos son comparables
+        agregar([{
+            "name": self.nombre, "cat": self.categoria, "ph": "X",
+            "ts": self._inicio / 1000, "dur": (fin - self._inicio) / 1000,
+            "pid": os.getpid(), "tid": threading.get_native_id(), "args": datos,
+        }])
+        return False
+
+
+class _SinTramo:
+    """Lo que devuelve ``tramo`` con la traza desactivada: ``anotar`` no hace nada."""
+
+    __slots__ = ()
+
+    def anotar(self, **datos):
+        pass
+
+
+_nulo = nullcontext(_SinTramo())
+
+
+def tramo(nombre, categoria="", **datos):
+    """Contexto que mide un tramo; desactivada, un contexto vacío compartido."""
+    if _ruta is None:
+        return _nulo
+    return Tramo(nombre, categoria, datos)
+
+
+def envolver(funcion, nombre=None, categoria=""):
+    """``funcion`` medida en un tramo por llamada (con las filas que devuelve); desactivada, la misma función."""
+    if _ruta is None:
+        return funcion
+    nombre = nombre or getattr(funcion, "__qualname__", repr(funcion))
+
+    def medida(*args, **kwargs):
+        with Tramo(nombre, categoria, {}) as abierto:
+            resultado = funcion(*args, **kwargs)
+            abierto.anotar(filas=filas(resultado))
+        return resultado
+
+    return medida
+
+
+def _estadistica():
+    return {"llamadas": 0, "total": 0.0, "duraciones": deque(maxlen=VENTANA), "filas": 0,
+            "memoria": deque(maxlen=VENTANA)}
+
+
+def _acumular(estadisticas, evento):
+    clave = (evento["name"], evento.get("cat", ""))
+    if clave not in estadisticas:
+        estadisticas[clave] = _estadistica()
+    estadistica = estadisticas[clave]
+    datos = evento.get("args", {})
+    estadistica["llamadas"] += 1
+    estadistica["total"] += evento["dur"]
+    estadistica["duraciones"].append(evento["dur"])
+    estadistica["filas"] += datos.get("filas", 0)
+    if "memoria_kb" in datos:
+        estadistica["memoria"].append(datos["memoria_kb"])
+
+
+def agregar(eventos):
+    """Suma eventos (de este proceso o traídos de otro) a los pendientes de exportar y al resumen."""
+    with _bloqueo:
+        for evento in eventos:
+            _eventos.append(evento)
+            _acumular(_estadisticas, evento)
+
+
+def extraer():
+    """Saca los eventos pendientes de este proceso (para mandarlos al principal desde el pool)."""
+    with _bloqueo:
+        eventos, _eventos[:] = list(_eventos), []
+        return eventos
+
+
+def _tabla(estadisticas):
+    filas_ = []
+    for (nombre, categoria), e in estadisticas.items():
+        if not e["llamadas"]:
+            continue
+        duraciones = np.asarray(e["duraciones"]) / 1000
+        memoria = np.asarray(e["memoria"]) / 1024
+        filas_.append((nombre, categoria, e["llamadas"], e["total"] / 1000, e["total"] / 1000 / e["llamadas"],
+                       np.percentile(duraciones, 95), duraciones.max(), e["filas"],
+                       memoria.mean() if len(memoria) else np.nan))
+    tabla = pd.DataFrame(filas_, columns=COLUMNAS_RESUMEN)
+    return tabla.sort_values("total_ms", ascending=False, ignore_index=True)
+
+
+def resumen():
+    """Tabla por tramo de este proceso: llamadas, ms totales y media, p95 y máximo de las últimas llamadas."""
+    with _bloqueo:
+        return _tabla(_estadisticas)
+
+
+def ruta_resumen(traza):
+    traza = Path(traza)
+    return traza.with_name(f"{traza.stem}_resumen.csv")
+
+
+def exportar(cada=0.0):
+    """Agrega los eventos pendientes al archivo de traza y reescribe el resumen; devuelve la ruta.
+
+    Con ``cada`` no exporta si la última exportación fue hace menos de esos
+    segundos (lo pendiente sale en la próxima o al terminar el proceso).
+    """
+    global _ultima_exportacion
+    if _ruta is None or time.monotonic() - _ultima_exportacion < cada:
+        return None
+    with _bloqueo:
+        _ultima_exportacion = time.monotonic()
+        eventos, _eventos[:] = list(_eventos), []
+        nuevo = not _ruta.exists() or _ruta.stat().st_size == 0
+        with open(_ruta, "a", encoding="utf-8") as archivo:
+            if nuevo:
+                archivo.write("[\n")
+            archivo.writelines(json.dumps(evento, ensure_ascii=False) + ",\n" for evento in eventos)
+        tabla = _tabla(_estadisticas)
+    tabla.to_csv(ruta_resumen(_ruta), index=False)
+    return _ruta
+
+
+def leer(ruta_traza):
+    """Eventos de un archivo de traza (con o sin el ``]`` final)."""
+    texto = Path(ruta_traza).read_text(encoding="utf-8").rstrip().rstrip(",")
+    if not texto.endswith("]"):
+        texto += "]"
+    return json.loads(texto)
+
+
+def resumir(eventos):
+    """Tabla resumen de una lista de eventos (p. ej. de ``leer``)."""
+    estadisticas = {}
+    for evento in eventos:
+        if evento.get("ph") == "X":
+            _acumular(estadisticas, evento)
+    return _tabla(estadisticas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumen de una traza del ETL o del dashboard")
+    parser.add_argument("traza", nargs="?", default=RUTA_POR_DEFECTO, help="archivo de traza (formato Chrome)")
+    parser.add_argument("--categoria", help="solo los tramos de esta categoría (etapa, seccion, ...)")
+    parser.add_argument("--por-tipo", action="store_true",
+                        help='sumar los tramos "tipo:sujeto" por tipo (todas las hojas de "leer" juntas)')
+    args = parser.parse_args(argv)
+
+    eventos = leer(args.traza)
+    if args.por_tipo:
+        eventos = [dict(evento, name=evento["name"].partition(":")[0]) for evento in eventos]
+    tabla = resumir(eventos)
+    if args.categoria:
+        tabla = tabla[tabla["categoria"] == args.categoria]
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(tabla.round(2).to_string(index=False))
+
+
+if os.environ.get(VARIABLE):
+    activar(RUTA_POR_DEFECTO if os.environ[VARIABLE] == "1" else os.environ[VARIABLE])
+atexit.register(exportar)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Modo por trozos (fuera de memoria) para las hojas a nivel localidad.
+
+``Acc_vel_loc_sinrangos`` y ``Accesos_tecnologia_localidad`` son las hojas
+que fijan el pico de memoria del ETL: en el modo normal se parsean enteras y
+se limpian con máscaras sobre toda la tabla. En este modo se recorren de a
+``filas_por_trozo`` filas con el lector de solo lectura de openpyxl, y cada
+etapa del grafo del ETL (ver ``etapas``) trabaja un trozo por vez, con los
+trozos intermedios guardados en disco:
+
+- ``leer`` convierte las celdas como ``pd.read_excel`` y anota el tipo que
+  pandas infiere en cada trozo; el tipo de cada columna es el que pandas
+  habría inferido sobre la hoja entera (enteros y reales → real, cualquier
+  mezcla con texto → ``object``).
+- ``limpiar`` parsea cada trozo con esos tipos y le aplica la misma limpieza
+  de ``etl`` (son reglas fila a fila), juntando los nombres distintos de cada
+  columna en orden de aparición. Las reglas de calidad de la hoja se
+  evalúan sobre cada trozo mientras está en memoria (las de estas hojas no
+  cruzan filas) y ``revisar`` une los reportes.
+- ``codificar`` lleva esos nombres al vocabulario de una vez, así los códigos
+  son los mismos que en el modo en memoria.
+- ``escribir`` lleva cada trozo a los tipos que la limpieza dio sobre toda la
+  tabla (``fillna("Desconocido")`` deja ``object`` solo los trozos con nulos)
+  y lo agrega al CSV y al Parquet.
+
+El cubo de tecnologías se arma sumando agregados parciales por trozo (ver
+``cubo.materializar``). El resultado es idéntico al del modo en memoria y el
+pico de memoria depende del tamaño del trozo, no del largo de la hoja.
+"""
+import pickle
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+import almacen
+import calidad
+import etl
+import traza
+import vocabulario
+
+HOJAS = ("Acc_vel_loc_sinrangos", "Accesos_tecnologia_localidad")
+
+
+@dataclass
+class Trozos:
+    """Una tabla guardada en disco de a trozos (un pickle por trozo)."""
+
+    carpeta: str
+    columnas: list
+    archivos: list = field(default_factory=list)
+    filas: list = field(default_factory=list)
+    tipos: dict = field(default_factory=dict)
+    unicos: dict = field(default_factory=dict)
+    reportes: list = field(default_factory=list)
+
+    def agregar(self, objeto, filas):
+        ruta = Path(self.carpeta) / f"{len(self.archivos):05d}.pkl"
+        with open(ruta, "wb") as archivo:
+            pickle.dump(objeto, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self.archivos.append(str(ruta))
+        self.filas.append(filas)
+
+    def __iter__(self):
+        for ruta in self.archivos:
+            with open(ruta, "rb") as archivo:
+                yield pickle.load(archivo)
+
+    def borrar(self):
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+
+def _celda(celda):
+    """Valor de una celda convertido como lo hace ``pd.read_excel`` con openpyxl."""
+    if celda.value is None:
+        return ""
+    if celda.data_type == TYPE_ERROR:
+        return np.nan
+    if celda.data_type == TYPE_NUMERIC:
+        entero = int(celda.value)
+        return entero if entero == celda.value else float(celda.value)
+    return celda.value
+
+
+def _parsear(encabezado, filas, tipos=None, inicio=0):
+    df = TextParser([encabezado] + filas, header=0, dtype=tipos, skip_blank_lines=False).read()
+    df.index = pd.RangeIndex(inicio, inicio + len(df))
+    return df
+
+
+def _unificar(a, b):
+    """Tipo que pandas infiere para una columna que en dos trozos dio ``a`` y ``b``."""
+    if a == b:
+        return a
+    if a.kind in "iuf" and b.kind in "iuf":
+        return np.dtype("float64")
+    return np.dtype(object)
+
+
+def _filas(hoja):
+    """Filas de la hoja sin las celdas vacías finales, descartando filas vacías al final."""
+    vacias = 0
+    for fila in hoja.rows:
+        valores = [_celda(celda) for celda in fila]
+        while valores and valores[-1] == "":
+            valores.pop()
+        if not valores:
+            vacias += 1
+            continue
+        # Las filas vacías intermedias se conservan, como en pd.read_excel
+        yield from ([] for _ in range(vacias))
+        vacias = 0
+        yield valores
+
+
+def leer(libro, nombre, carpeta, filas_por_trozo=etl.FILAS_POR_TROZO):
+    """Guarda las filas crudas de la hoja ``nombre`` en trozos dentro de ``carpeta``."""
+    excel = etl.abrir_libro(libro)
+    hoja = excel.book[nombre]
+    if excel.book.read_only:
+        hoja.reset_dimensions()
+    filas = _filas(hoja)
+    encabezado = next(filas, [])
+    ancho = len(encabezado)
+    Path(carpeta).mkdir(parents=True, exist_ok=True)
+    trozos = Trozos(str(carpeta), _parsear(encabezado, []).columns.tolist())
+
+    def guardar(bloque):
+        tipos = _parsear(encabezado, bloque).dtypes
+        for columna, tipo in tipos.items():
+            previo = trozos.tipos.get(columna)
+            trozos.tipos[columna] = tipo if previo is None else _unificar(previo, tipo)
+        trozos.agregar(bloque, len(bloque))
+
+    bloque = []
+    for fila in filas:
+        if len(fila) > ancho:
+            raise ValueError(f"La hoja {nombre!r} tiene filas más anchas que el encabezado; usar el modo en memoria")
+        bloque.append(fila + [""] * (ancho - len(fila)))
+        if len(bloque) == filas_por_trozo:
+            guardar(bloque)
+            bloque = []
+    if bloque or not trozos.archivos:
+        guardar(bloque)
+    return trozos
+
+
+def limpiar(hoja, crudos):
+    """Aplica ``hoja.limpiar`` a cada trozo con los tipos de la hoja entera."""
+    limpios = Trozos(f"{crudos.carpeta}-limpio", crudos.columnas)
+    Path(limpios.carpeta).mkdir(parents=True, exist_ok=True)
+    dimensiones = {}
+    inicio = 0
+    for filas, bloque in zip(crudos.filas, crudos):
+        with traza.tramo(f"trozo:{hoja.nombre.strip()}", "limpiar", filas=filas):
+            df = hoja.limpiar(_parsear(crudos.columnas, bloque, crudos.tipos, inicio))
+        inicio += filas
+        for columna, tipo in df.dtypes.items():
+            previo = limpios.tipos.get(columna)
+            limpios.tipos[columna] = tipo if previo is None else _unificar(previo, tipo)
+        for columna in vocabulario.DIMENSIONES:
+            if columna in df.columns:
+                nombres = dimensiones.setdefault(columna, {})
+                nombres.update(dict.fromkeys(df[columna].dropna().unique()))
+        limpios.columnas = df.columns.tolist()
+        limpios.reportes.append(calidad.evaluar(hoja, df))
+        limpios.agregar(df, len(df))
+    crudos.borrar()
+    limpios.unicos = {columna: list(nombres) for columna, nombres in dimensiones.items()}
+    return limpios
+
+
+def validar(hoja, limpios):
+    """Los controles de ``etl.validar`` sobre el primer trozo con filas (o el primero)."""
+    elegido = next((i for i, filas in enumerate(limpios.filas) if filas), 0)
+    with open(limpios.archivos[elegido], "rb") as archivo:
+        etl.validar(hoja, pickle.load(archivo))
+    return limpios
+
+
+def revisar(limpios):
+    """Las reglas de calidad de toda la hoja, a partir de los reportes de cada trozo."""
+    return calidad.verificar(calidad.unir(limpios.reportes))
+
+
+def codificar(vocab, limpios):
+    """Agrega al vocabulario los nombres nuevos de toda la tabla, en un solo paso.
+
+    Devuelve los trozos y una copia del vocabulario ya completo para
+    ``escribir`` (que puede correr en otro proceso).
+    """
+    for columna, nombres in limpios.unicos.items():
+        vocab.codificar(vocabulario.DIMENSIONES[columna], nombres)
+    return limpios, vocabulario.Vocabulario({d: list(e) for d, e in vocab.etiquetas.items()})
+
+
+def escribir(hoja, destino, formatos, entrada):
+    """Escribe los trozos codificados en el CSV y el Parquet; devuelve ``(ruta, filas)``."""
+    limpios, vocab = entrada
+    ruta = Path(destino) / hoja.archivo
+    parquet = almacen.Escritor(almacen.ruta_parquet(hoja.archivo, destino)) if "parquet" in formatos else None
+    try:
+        for i, df in enumerate(limpios):
+            df = vocab.aplicar(df.astype(limpios.tipos))
+            if "csv" in formatos:
+                df.to_csv(ruta, index=False, mode="w" if i == 0 else "a", header=i == 0)
+            if parquet is not None:
+                parquet.escribir(df)
+    finally:
+        if parquet is not None:
+            parquet.cerrar()
+    limpios.borrar()
+    return ruta, sum(limpios.filas)
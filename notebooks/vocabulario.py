@@ -0,0 +1,173 @@
+"""Vocabulario canónico de provincias, partidos, localidades y tecnologías.
+
+Cada nombre crudo se reduce a una clave (sin espacios ni acentos, en
+minúsculas) y se asigna una sola vez a un código entero estable dentro de su
+dimensión: "FIBRA OPTICA" y " Fibra óptica" comparten código y etiqueta.
+El ETL guarda el diccionario en ``vocabulario.json`` y convierte las columnas
+de nombres de todas las tablas limpias en categóricas con las mismas
+categorías, así los joins y ``groupby`` entre datasets trabajan sobre
+códigos enteros y nunca mezclan variantes de un mismo nombre.
+
+Los códigos no cambian entre corridas: las etiquetas nuevas se agregan al
+final del diccionario. ``REFERENCIAS`` fija las dimensiones cerradas (las
+24 provincias): cada nombre canónico con las variantes que usa ENACOM. La
+etiqueta de una provincia es siempre la canónica, sin importar qué variante
+aparezca primero ("BUENOS AIRES" y "CABA" se guardan como "Buenos Aires" y
+"Capital Federal"), y un nombre fuera de la referencia no entra al
+vocabulario: ``codificar`` lo rechaza. ``calidad`` usa la misma referencia.
+"""
+import functools
+import json
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ARCHIVO = "vocabulario.json"
+# Columna de las tablas limpias -> dimensión del vocabulario
+DIMENSIONES = {
+    "Provincia": "provincia",
+    "provincia": "provincia",
+    "Partido": "partido",
+    "Localidad": "localidad",
+    "Tecnologia": "tecnologia",
+}
+# Nombre canónico -> variantes que usa ENACOM, por dimensión cerrada
+REFERENCIAS = {
+    "provincia": {
+        "Buenos Aires": (),
+        "Capital Federal": ("CABA", "Ciudad Autónoma de Buenos Aires"),
+        "Catamarca": (), "Chaco": (), "Chubut": (), "Córdoba": (), "Corrientes": (), "Entre Ríos": (),
+        "Formosa": (), "Jujuy": (), "La Pampa": (), "La Rioja": (), "Mendoza": (), "Misiones": (),
+        "Neuquén": (), "Río Negro": (), "Salta": (), "San Juan": (), "San Luis": (), "Santa Cruz": (),
+        "Santa Fe": (), "Santiago del Estero": (), "Tierra del Fuego": (), "Tucumán": (),
+    },
+}
+
+
+def _clave(nombre):
+    sin_acentos = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode()
+    return "".join(sin_acentos.split()).casefold()
+
+
+def claves(nombres):
+    """Clave canónica de cada nombre (se calcula una vez por valor distinto)."""
+    codigos, unicos = pd.factorize(pd.Index(nombres).astype(str))
+    return pd.Index([_clave(nombre) for nombre in unicos])[codigos]
+
+
+@functools.lru_cache(maxsize=None)
+def canonicas(dimension):
+    """``{clave de cada nombre válido: etiqueta canónica}`` de ``dimension`` (vacío si es abierta)."""
+    return {
+        _clave(nombre): canonica
+        for canonica, variantes in REFERENCIAS.get(dimension, {}).items()
+        for nombre in (canonica, *variantes)
+    }
+
+
+def referencia(dimension):
+    """Claves de los nombres válidos de ``dimension``, variantes incluidas."""
+    return set(canonicas(dimension))
+
+
+def canonizar(dimension, nombres):
+    """``nombres`` con la etiqueta canónica de ``dimension``; los que no están en la referencia quedan igual."""
+    nombres = pd.Series(nombres)
+    validas = canonicas(dimension)
+    return nombres.map({n: validas.get(_clave(str(n)), n) for n in nombres.dropna().unique()})
+
+
+@dataclass
+class Vocabulario:
+    """Etiquetas canónicas por dimensión; el código es la posición en la lista."""
+
+    etiquetas: dict = field(default_factory=dict)
+    _codigos: dict = field(default_factory=dict, init=False, repr=False)
+    _tipos: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        for dimension, etiquetas in self.etiquetas.items():
+            validas = canonicas(dimension)
+            for codigo, etiqueta in enumerate(etiquetas):
+                # Un vocabulario guardado antes de las referencias puede tener otra variante como etiqueta
+                canonica = validas.get(_clave(etiqueta))
+                if canonica is not None and canonica not in etiquetas:
+                    etiquetas[codigo] = canonica
+                self._registrar(dimension, codigo)
+
+    def _registrar(self, dimension, codigo):
+        # En las dimensiones cerradas todas las variantes de la etiqueta apuntan al mismo código
+        codigos = self._codigos.setdefault(dimension, {})
+        clave = _clave(self.etiquetas[dimension][codigo])
+        validas = canonicas(dimension)
+        for variante in [c for c, canonica in validas.items() if canonica == validas.get(clave)] or [clave]:
+            codigos.setdefault(variante, codigo)
+
+    @classmethod
+    def cargar(cls, carpeta="."):
+        ruta = Path(carpeta) / ARCHIVO
+        if not ruta.exists():
+            return cls()
+        return cls(json.loads(ruta.read_text(encoding="utf-8")))
+
+    def guardar(self, carpeta="."):
+        ruta = Path(carpeta) / ARCHIVO
+        ruta.write_text(json.dumps(self.etiquetas, indent=1, ensure_ascii=False), encoding="utf-8")
+        return ruta
+
+    def tipo(self, dimension):
+        """``CategoricalDtype`` compartido de la dimensión (categoría i = código i)."""
+        if dimension not in self._tipos:
+            self._tipos[dimension] = pd.CategoricalDtype(self.etiquetas.get(dimension, []))
+        return self._tipos[dimension]
+
+    def codificar(self, dimension, valores):
+        """Códigos de ``valores`` (-1 para nulos), agregando los nombres nuevos.
+
+        En una dimensión cerrada los nombres nuevos entran con su etiqueta
+        canónica; si alguno no está en la referencia se levanta ``ValueError``
+        sin agregar ninguno.
+        """
+        valores = pd.Series(valores)
+        presentes, unicos = pd.factorize(valores)
+        etiquetas = self.etiquetas.setdefault(dimension, [])
+        codigos = self._codigos.setdefault(dimension, {})
+        validas = canonicas(dimension)
+
+        nuevos, fuera = {}, []
+        for nombre in unicos:
+            nombre = " ".join(str(nombre).split())
+            clave = _clave(nombre)
+            if validas and clave not in validas:
+                fuera.append(nombre)
+            elif clave not in codigos:
+                nombre = validas.get(clave, nombre)
+                nuevos.setdefault(_clave(nombre), nombre)
+        if fuera:
+            raise ValueError(f"Nombres fuera de la referencia de {dimension}: {', '.join(sorted(fuera))}")
+        # Los nombres nuevos de una misma tabla entran en orden alfabético
+        for nombre in sorted(nuevos.values()):
+            etiquetas.append(nombre)
+            self._registrar(dimension, len(etiquetas) - 1)
+        if nuevos:
+            self._tipos.pop(dimension, None)
+
+        por_valor = np.array([codigos[_clave(str(nombre))] for nombre in unicos], dtype=np.int32)
+        return np.where(presentes >= 0, por_valor[presentes] if len(unicos) else -1, -1)
+
+    def aplicar(self, df):
+        """Convierte las columnas de nombres de ``df`` en categóricas compartidas."""
+        df = df.copy()
+        for columna, dimension in DIMENSIONES.items():
+            if columna in df.columns:
+                codigos = self.codificar(dimension, df[columna])
+                df[columna] = pd.Categorical.from_codes(codigos, dtype=self.tipo(dimension))
+        return df
+
+    def decodificar(self, dimension, codigos):
+        """Etiquetas canónicas de ``codigos`` (``None`` para -1)."""
+        etiquetas = np.asarray(self.etiquetas.get(dimension, []) + [None], dtype=object)
+        return etiquetas[np.asarray(codigos)]